@@ -0,0 +1,71 @@
+# API 응답 크기/직렬화 시간 벤치마크
+# 사용법: python bench_api_response.py [반복횟수]
+#  - .env 의 DB_URI 로 연결 (데이터가 들어있는 DB 필요, 로컬 SQLite 도 가능)
+import gzip
+import sys
+import time
+
+from pybo import create_app
+from pybo.api_response import brotli, orjson, stdlib_dumps
+
+ENDPOINTS = [
+    "/data/districts",
+    "/data/dashboard-data",
+    "/data/dashboard-data?district=강남구",
+    "/data/predict-data?year=2025&district=강남구",
+    "/data/predict-series",
+    "/data/predict-series?district=강남구",
+    "/data/predict-bundle",
+]
+
+
+def _time_per_call(fn, obj, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(obj)
+    return (time.perf_counter() - start) / repeat * 1e6  # us
+
+
+def _rows_equivalent(obj):
+    # 컬럼형 series 를 예전 행(dict) 형식으로 되돌린 크기 비교용
+    series = obj.get("series") if isinstance(obj, dict) else None
+    if not series:
+        return None
+    keys = list(series)
+    rows = [dict(zip(keys, vals)) for vals in zip(*(series[k] for k in keys))]
+    legacy = {k: v for k, v in obj.items() if k != "series"}
+    legacy["items"] = rows
+    return legacy
+
+
+def main(repeat: int = 200):
+    app = create_app()
+    client = app.test_client()
+
+    print(f"orjson={'on' if orjson else 'off'}  brotli={'on' if brotli else 'off'}  repeat={repeat}")
+    header = f"{'endpoint':45} {'raw':>7} {'gzip':>7} {'br':>7} {'rows':>7} {'json us':>9} {'orjson us':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for url in ENDPOINTS:
+        res = client.get(url, headers={"Accept-Encoding": "identity"})
+        if res.status_code != 200:
+            print(f"{url:45} status={res.status_code}")
+            continue
+
+        obj = res.get_json()
+        raw = stdlib_dumps(obj)
+        gz = len(gzip.compress(raw, compresslevel=6))
+        br = len(brotli.compress(raw, quality=6)) if brotli else "-"
+
+        legacy = _rows_equivalent(obj)
+        rows = len(stdlib_dumps(legacy)) if legacy else "-"
+
+        t_std = _time_per_call(stdlib_dumps, obj, repeat)
+        t_fast = _time_per_call(orjson.dumps, obj, repeat) if orjson else float("nan")
+
+        print(f"{url:45} {len(raw):>7} {gz:>7} {br:>7} {rows:>7} {t_std:>9.1f} {t_fast:>9.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
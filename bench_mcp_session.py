@@ -0,0 +1,61 @@
+# MCP 도구 호출 지연 벤치마크: 호출마다 연결+initialize vs 세션 풀 재사용
+# 사용법: python bench_mcp_session.py [반복횟수] [동시 호출 수]
+#  - MCP_URL 의 도구 서버가 떠 있어야 함 (기본 http://127.0.0.1:8000/mcp)
+#  - 도구 자체 시간이 섞이지 않게 check_stats(가벼운 DB 조회)로 측정
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pybo.agent.tool_transport import MCPToolTransport
+
+TOOL = "check_stats"
+ARGS = {"district": "강남구", "start_year": 2023, "end_year": 2030}
+
+
+def _summary(name: str, samples: list[float], wall: float) -> str:
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+    return (
+        f"{name:10} n={len(samples):4} avg={statistics.mean(samples) * 1000:7.1f}ms "
+        f"p50={statistics.median(samples) * 1000:7.1f}ms p95={p95 * 1000:7.1f}ms "
+        f"throughput={len(samples) / wall:6.1f}/s"
+    )
+
+
+def _run(transport: MCPToolTransport, repeat: int, concurrency: int) -> tuple[list[float], float]:
+    def one(_):
+        start = time.perf_counter()
+        text = transport.call(TOOL, ARGS)
+        if text.startswith(("MCP 도구 호출", "도구 호출 오류")):
+            raise RuntimeError(text)
+        return time.perf_counter() - start
+
+    transport.call(TOOL, ARGS)  # 워밍업 (풀은 첫 세션을 여기서 엶)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        samples = list(ex.map(one, range(repeat)))
+    return samples, time.perf_counter() - start
+
+
+def main(repeat: int = 100, concurrency: int = 1):
+    url = os.getenv("MCP_URL", "http://127.0.0.1:8000/mcp")
+    oneshot = MCPToolTransport(url)
+    oneshot.pool = None
+    pooled = MCPToolTransport(url)
+    if pooled.pool is None:
+        print("MCP_POOL_ENABLED=0 → 풀 측정 생략")
+
+    print(f"url={url} tool={TOOL} repeat={repeat} concurrency={concurrency}")
+    print(_summary("per-call", *_run(oneshot, repeat, concurrency)))
+    if pooled.pool is not None:
+        print(_summary("pooled", *_run(pooled, repeat, concurrency)))
+        print(f"pool: {pooled.pool.stats()}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1,
+    )
@@ -0,0 +1,80 @@
+# 도구 호출 방식별 지연 비교: MCP(세션 풀) vs 같은 프로세스(local)
+# 사용법: python bench_tool_transport.py [반복횟수]
+#  - mcp: MCP_URL 의 도구 서버가 떠 있어야 함 (기본 http://127.0.0.1:8000/mcp)
+#  - local: 이 프로세스에서 RagService 를 로드하므로 임베딩 모델/벡터 DB 가 있어야 함
+#  - QA 경로: run_qa 의 node_rag 와 같은 방식(공용 이벤트 루프에서 await)으로 rag_search 호출
+#    RUNPOD_API_URL 이 있으면 run_qa 전체(rag_search + 답변 생성)도 측정
+import os
+import statistics
+import sys
+import time
+
+from pybo import async_bridge, create_app
+from pybo.agent import qa_graph
+from pybo.agent.tool_transport import LocalToolTransport, MCPToolTransport
+
+QUESTIONS = [
+    "지역아동센터 인건비 기준 알려줘",
+    "지역아동센터 운영비 지원 기준은?",
+    "아동복지법 시설 기준 조문",
+    "생활복지사 배치기준",
+]
+STATS_ARGS = {"district": "강남구", "start_year": 2023, "end_year": 2030}
+ERROR_PREFIXES = ("MCP 도구 호출", "도구 호출 오류")
+
+
+def _summary(name: str, samples: list[float]) -> str:
+    if not samples:
+        return f"{name:28} 실패"
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+    return (
+        f"{name:28} n={len(samples):4} avg={statistics.mean(samples) * 1000:8.1f}ms "
+        f"p50={statistics.median(samples) * 1000:8.1f}ms p95={p95 * 1000:8.1f}ms"
+    )
+
+
+def _measure(fn, repeat: int) -> list[float]:
+    first = fn(0)  # 워밍업 겸 확인
+    if isinstance(first, str) and first.startswith(ERROR_PREFIXES):
+        print(f"  ! {first[:120]}")
+        return []
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(repeat: int = 50):
+    app = create_app()
+    url = os.getenv("MCP_URL", "http://127.0.0.1:8000/mcp")
+    transports = [MCPToolTransport(url), LocalToolTransport()]
+    print(f"url={url} repeat={repeat}")
+
+    with app.app_context():
+        for transport in transports:
+            print(_summary(f"{transport.name} check_stats", _measure(
+                lambda i: transport.call("check_stats", STATS_ARGS), repeat)))
+
+    # QA 경로: 요청 밖(공용 이벤트 루프)에서 rag_search
+    for transport in transports:
+        print(_summary(f"{transport.name} qa rag_search", _measure(
+            lambda i: async_bridge.submit(
+                transport.acall("rag_search", {"question": QUESTIONS[i % len(QUESTIONS)]})
+            ), repeat)))
+
+    if os.getenv("RUNPOD_API_URL"):
+        original = qa_graph._tool_client.transport
+        try:
+            for transport in transports:
+                qa_graph._tool_client.transport = transport
+                print(_summary(f"{transport.name} run_qa", _measure(
+                    lambda i: qa_graph.run_qa(QUESTIONS[i % len(QUESTIONS)] + f" ({i})"), max(1, repeat // 5))))
+        finally:
+            qa_graph._tool_client.transport = original
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,17 @@
+# 분석용 읽기 전용 로컬 미러(SQLite 스냅샷) 생성
+# 사용법: python build_analytics_mirror.py [경로]   (경로 생략 시 .env 의 ANALYTICS_MIRROR_PATH)
+import sys
+
+from pybo import create_app
+from pybo.analytics_mirror import build_snapshot
+
+app = create_app()
+
+with app.app_context():
+    path = sys.argv[1] if len(sys.argv) > 1 else app.config.get("ANALYTICS_MIRROR_PATH")
+    if not path:
+        print("ANALYTICS_MIRROR_PATH 가 설정되지 않아 스냅샷을 만들지 않습니다.")
+        sys.exit(1)
+
+    version = build_snapshot(path)
+    print(f"분석용 미러 스냅샷 생성 완료: {path} (version={version})")
@@ -18,6 +18,60 @@ print(f" DB 연결 설정 완료: {SQLALCHEMY_DATABASE_URI}")
 
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+# DB 커넥션 풀 (프로세스 종류별 프로필: 웹 서버 / MCP 도구 서버)
+DB_POOL_PROFILES = {
+    "web": {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),  # 풀이 가득 찼을 때 대기 시간(초)
+    },
+    "mcp": {
+        "pool_size": int(os.getenv("DB_MCP_POOL_SIZE", "2")),
+        "max_overflow": int(os.getenv("DB_MCP_MAX_OVERFLOW", "3")),
+        "pool_timeout": float(os.getenv("DB_MCP_POOL_TIMEOUT", "10")),
+    },
+}
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 초, 방화벽/DB idle 끊김 대비
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+DB_STMT_CACHE_SIZE = int(os.getenv("DB_STMT_CACHE_SIZE", "40"))  # cx_Oracle 문장 캐시 (기본 20)
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))  # SQLAlchemy 컴파일 캐시
+DB_POOL_METRICS_ENABLED = os.getenv("DB_POOL_METRICS_ENABLED", os.getenv("FLASK_DEBUG", "0")) == "1"
+
+# 분석용 읽기 전용 로컬 미러 (SQLite 스냅샷, 비워두면 사용 안 함)
+# ETL 후 `python build_analytics_mirror.py` 로 갱신, 읽는 쪽은 .version 파일을 보고 자동으로 다시 연결
+ANALYTICS_MIRROR_PATH = os.getenv("ANALYTICS_MIRROR_PATH", "")
+ANALYTICS_MIRROR_CHECK_INTERVAL = float(os.getenv("ANALYTICS_MIRROR_CHECK_INTERVAL", "1.0"))  # 버전 확인 주기(초)
+
+# 응답 압축 (gzip, brotli 설치 시 br 우선)
+COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "1") != "0"
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))  # 이 크기(bytes) 미만은 압축 안 함
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+
+# 요청별 SQL 계측 (기본값: FLASK_DEBUG=1 일 때만 켜짐)
+SQL_STATS_ENABLED = os.getenv("SQL_STATS_ENABLED", os.getenv("FLASK_DEBUG", "0")) == "1"
+SQL_STATS_HEADER = os.getenv("SQL_STATS_HEADER", "1") == "1"  # X-SQL-Stats 응답 헤더
+SQL_STATS_SLOWEST_N = int(os.getenv("SQL_STATS_SLOWEST_N", "5"))
+SQL_STATS_HISTORY = int(os.getenv("SQL_STATS_HISTORY", "200"))  # /debug/sql-stats 에 보관할 최근 요청 수
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))  # 같은 모양 쿼리가 이 횟수 초과면 경고
+
+# GenAI 비동기 작업 큐 (보고서/정책 등을 워커 스레드에서 실행, 결과는 genai_job 테이블에 저장)
+GENAI_JOB_WORKERS = int(os.getenv("GENAI_JOB_WORKERS", "2"))  # 프로세스당 RunPod 동시 호출 상한
+GENAI_JOB_QUEUE_MAX = int(os.getenv("GENAI_JOB_QUEUE_MAX", "100"))  # 대기 작업이 이보다 많으면 503
+GENAI_JOB_STALE_AFTER = int(os.getenv("GENAI_JOB_STALE_AFTER", "900"))  # 재시작 시 이 시간(초) 넘게 running 이면 다시 실행
+
+# 배치로 미리 생성한 보고서/정책 사용 여부 (python pregenerate_genai.py 로 생성)
+GENAI_PREGEN_ENABLED = os.getenv("GENAI_PREGEN_ENABLED", "1") == "1"
+
+# 도구(rag_search / check_stats 등) 호출 방식: mcp = MCP 도구 서버(MCP_URL), local = 웹 프로세스 안에서 바로 실행
+TOOL_TRANSPORT = os.getenv("TOOL_TRANSPORT", "mcp").strip().lower()
+
+# 감사 로그(GenAIChatLog / PredictionLog) 비동기 배치 저장
+LOG_WRITER_ENABLED = os.getenv("LOG_WRITER_ENABLED", "1") == "1"
+LOG_WRITER_QUEUE_MAX = int(os.getenv("LOG_WRITER_QUEUE_MAX", "10000"))  # 가득 차면 새 로그는 버림
+LOG_WRITER_BATCH_SIZE = int(os.getenv("LOG_WRITER_BATCH_SIZE", "200"))  # 이만큼 모이면 바로 저장
+LOG_WRITER_FLUSH_INTERVAL = float(os.getenv("LOG_WRITER_FLUSH_INTERVAL", "1.0"))  # 덜 모여도 이 시간(초)마다 저장
+LOG_WRITER_PUT_TIMEOUT = float(os.getenv("LOG_WRITER_PUT_TIMEOUT", "0.05"))  # 큐가 가득 찼을 때 요청이 기다리는 최대 시간(초)
+
 # 시크릿 키 가져오기
 SECRET_KEY = os.getenv("FLASK_SECRET_KEY")
 if not SECRET_KEY:
@@ -0,0 +1,42 @@
+# pytest 공용 설정
+# - fake_llm_server 를 같은 프로세스의 스레드로 띄움 (비어 있는 포트 자동 선택, 테스트마다 설정/통계 초기화)
+# - 실제 MCP 서버 / RunPod 가 있어야 하는 수동 실행 스크립트는 수집하지 않음
+import os
+import sys
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, BASE_DIR)
+
+# pybo 의 config 는 import 시점에 DB_URI 를 요구함 (이 테스트들은 DB 를 쓰지 않음)
+os.environ.setdefault("DB_URI", "sqlite://")
+
+import fake_llm_server  # noqa: E402
+
+collect_ignore = ["test_agent_agentic.py", "test_mcp_call.py", "test_mcp_in_container.py"]
+
+
+@pytest.fixture(scope="session")
+def fake_llm_base_url():
+    server = make_server("127.0.0.1", 0, fake_llm_server.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def fake_llm(fake_llm_base_url):
+    """fake_llm_server 의 app (테스트 안에서 app.config 로 동작을 바꿈, 끝나면 원래대로). URL 은 fake_llm_base_url"""
+    app = fake_llm_server.app
+    saved = dict(app.config)
+    app.config.update(LATENCY=0.0, TOKEN_DELAY=0.0, ERROR_RATE=0.0, REACT=False, MODEL_VERSION="final")
+    with fake_llm_server._stats_lock:
+        for key in fake_llm_server._stats:
+            fake_llm_server._stats[key] = 0
+    yield app
+    app.config.clear()
+    app.config.update(saved)
@@ -0,0 +1,219 @@
+# 로컬 개발/부하 테스트용 가짜 LLM 서버 (RunPod /generate, /switch_model 흉내)
+# 사용법:
+#   python fake_llm_server.py --port 9000 --latency 0.5 --token-delay 0.02
+#   python fake_llm_server.py --latency-dist lognormal --latency 1.5 --jitter 0.5 --tokens-per-sec 40 --error-rate 0.05
+#   RUNPOD_API_URL=http://127.0.0.1:9000/generate flask run
+# - "stream": true 요청이면 text/event-stream 으로 토큰을 하나씩 보냄 (data: {"token": ...} / data: [DONE])
+# - 지시문이 ReAct 형식(Action / Final Answer)을 요구하면 첫 턴은 Action, Observation 이 붙은 다음 턴은 Final Answer
+# - 응답 시간 = 첫 토큰 지연(분포에서 샘플) + 토큰 수 / 초당 토큰 수
+# - /generate_batch: {"requests": [...]} → {"results": [{"text": ...}, ...]} (마이크로 배칭 테스트용, --no-batch 로 끔)
+# - 장애 흉내: --stream-truncate-after N (N 토큰 뒤 [DONE] 없이 끊음), --batch-fault error|short (배치만 실패 / 개수 부족)
+import argparse
+import json
+import math
+import random
+import threading
+import time
+
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+app = Flask(__name__)
+app.config.update(
+    LATENCY=0.5,            # 첫 토큰까지 평균 지연(초)
+    LATENCY_DIST="fixed",   # fixed / uniform / lognormal
+    JITTER=0.0,             # uniform: ±jitter, lognormal: 표준편차(초)
+    TOKEN_DELAY=0.02,       # 토큰 간 지연(초)
+    ERROR_RATE=0.0,         # 이 비율만큼 ERROR_STATUS 로 실패
+    ERROR_STATUS=503,
+    REACT=True,
+    NO_BATCH=False,         # True 면 /generate_batch 가 NO_BATCH_STATUS (배치 미지원 백엔드 흉내)
+    NO_BATCH_STATUS=404,    # 404 / 405 / 501
+    BATCH_FAULT=None,       # "error": 배치만 500, "short": 결과 하나 덜 보냄
+    STREAM_TRUNCATE_AFTER=None,  # 정수면 그만큼 토큰을 보낸 뒤 [DONE] 없이 스트림 종료
+    MODEL_VERSION="final",
+)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "requests": 0, "streamed": 0, "errors": 0, "batches": 0, "batched_items": 0,
+    "in_flight": 0, "max_in_flight": 0,
+}
+
+
+def _sample_latency() -> float:
+    mean = app.config["LATENCY"]
+    jitter = app.config["JITTER"]
+    dist = app.config["LATENCY_DIST"]
+
+    if dist == "uniform":
+        return max(0.0, random.uniform(mean - jitter, mean + jitter))
+    if dist == "lognormal" and mean > 0 and jitter > 0:
+        # 평균/표준편차가 mean/jitter 가 되도록 lognormal 파라미터 변환 (긴 꼬리 지연)
+        sigma2 = math.log(1 + (jitter / mean) ** 2)
+        return random.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+    return mean
+
+
+def _is_react(payload: dict) -> bool:
+    instruction = payload.get("instruction") or ""
+    return app.config["REACT"] and "Action" in instruction and "Final Answer" in instruction
+
+
+def _fake_answer(payload: dict) -> str:
+    input_text = (payload.get("input") or "").replace("\n", " ")
+    model_version = payload.get("model_version", app.config["MODEL_VERSION"])
+
+    if _is_react(payload):
+        if "Observation:" not in (payload.get("input") or ""):
+            question = input_text.replace("사용자 질문:", "").replace("Thought:", "").strip()[:60]
+            return (
+                "Thought: 관련 자료를 먼저 찾아봐야 한다.\n"
+                "Action: rag_search\n"
+                f"Action Input: {json.dumps({'question': question}, ensure_ascii=False)}"
+            )
+        return f"Thought: 자료를 확인했다.\nFinal Answer: [{model_version}] 참조 자료를 바탕으로 한 테스트 답변입니다."
+
+    return (
+        f"[{model_version}] "
+        f"요청 내용을 바탕으로 작성한 테스트 응답입니다. 입력 요약: {input_text[:80]}"
+    )
+
+
+def _tokens(text: str):
+    words = text.split(" ")
+    for i, w in enumerate(words):
+        yield w if i == 0 else " " + w
+
+
+class _InFlight:
+    def __enter__(self):
+        with _stats_lock:
+            _stats["in_flight"] += 1
+            _stats["max_in_flight"] = max(_stats["max_in_flight"], _stats["in_flight"])
+
+    def __exit__(self, *exc):
+        with _stats_lock:
+            _stats["in_flight"] -= 1
+
+
+@app.route("/generate", methods=["POST"])
+def generate():
+    payload = request.get_json() or {}
+    with _stats_lock:
+        _stats["requests"] += 1
+
+    if random.random() < app.config["ERROR_RATE"]:
+        with _stats_lock:
+            _stats["errors"] += 1
+        time.sleep(_sample_latency() / 4)
+        return jsonify({"error": "fake upstream error"}), app.config["ERROR_STATUS"]
+
+    text = _fake_answer(payload)
+    tokens = list(_tokens(text))
+    latency = _sample_latency()
+    token_delay = app.config["TOKEN_DELAY"]
+
+    if not payload.get("stream"):
+        with _InFlight():
+            time.sleep(latency + token_delay * len(tokens))
+        return jsonify({"text": text})
+
+    with _stats_lock:
+        _stats["streamed"] += 1
+
+    def events():
+        with _InFlight():
+            time.sleep(latency)
+            truncate_after = app.config["STREAM_TRUNCATE_AFTER"]
+            for i, token in enumerate(tokens):
+                if truncate_after is not None and i >= truncate_after:
+                    return  # 업스트림이 중간에 끊긴 상황
+                yield f"data: {json.dumps({'token': token}, ensure_ascii=False)}\n\n"
+                time.sleep(token_delay)
+            yield "data: [DONE]\n\n"
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream")
+
+
+@app.route("/generate_batch", methods=["POST"])
+def generate_batch():
+    """배치 생성: 한 번의 지연 + 가장 긴 응답 길이만큼 시간이 걸림 (GPU 배치 추론 흉내)"""
+    if app.config["NO_BATCH"]:
+        return jsonify({"error": "not supported"}), app.config["NO_BATCH_STATUS"]
+
+    batch = (request.get_json() or {}).get("requests") or []
+    with _stats_lock:
+        _stats["requests"] += 1
+        _stats["batches"] += 1
+        _stats["batched_items"] += len(batch)
+
+    if random.random() < app.config["ERROR_RATE"]:
+        with _stats_lock:
+            _stats["errors"] += 1
+        return jsonify({"error": "fake upstream error"}), app.config["ERROR_STATUS"]
+
+    if app.config["BATCH_FAULT"] == "error":
+        return jsonify({"error": "fake batch error"}), 500
+
+    texts = [_fake_answer(p) for p in batch]
+    if app.config["BATCH_FAULT"] == "short":
+        texts = texts[:-1]
+    longest = max((len(list(_tokens(t))) for t in texts), default=0)
+    with _InFlight():
+        time.sleep(_sample_latency() + app.config["TOKEN_DELAY"] * longest)
+    return jsonify({"results": [{"text": t} for t in texts]})
+
+
+@app.route("/switch_model", methods=["POST"])
+def switch_model():
+    payload = request.get_json() or {}
+    app.config["MODEL_VERSION"] = payload.get("model_version", "final")
+    return jsonify({"status": "ok", "model_version": app.config["MODEL_VERSION"]})
+
+
+@app.route("/stats", methods=["GET"])
+def stats():
+    with _stats_lock:
+        return jsonify(dict(_stats))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.5, help="첫 토큰까지 평균 지연(초)")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="fixed")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform: ±범위, lognormal: 표준편차(초)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="토큰 간 지연(초)")
+    parser.add_argument("--tokens-per-sec", type=float, help="지정 시 --token-delay 대신 사용")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0~1, 실패 응답 비율")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-react", action="store_true", help="ReAct 형식 응답 끄기")
+    parser.add_argument("--no-batch", action="store_true", help="/generate_batch 비활성화 (--no-batch-status)")
+    parser.add_argument("--no-batch-status", type=int, choices=[404, 405, 501], default=404)
+    parser.add_argument("--batch-fault", choices=["error", "short"], help="배치만 500 / 결과 개수 부족")
+    parser.add_argument("--stream-truncate-after", type=int, help="N 토큰 뒤 [DONE] 없이 스트림 종료")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    app.config.update(
+        LATENCY=args.latency,
+        LATENCY_DIST=args.latency_dist,
+        JITTER=args.jitter,
+        TOKEN_DELAY=(1.0 / args.tokens_per_sec) if args.tokens_per_sec else args.token_delay,
+        ERROR_RATE=args.error_rate,
+        ERROR_STATUS=args.error_status,
+        REACT=not args.no_react,
+        NO_BATCH=args.no_batch,
+        NO_BATCH_STATUS=args.no_batch_status,
+        BATCH_FAULT=args.batch_fault,
+        STREAM_TRUNCATE_AFTER=args.stream_truncate_after,
+    )
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
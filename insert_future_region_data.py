@@ -40,4 +40,9 @@ for _, row in df.iterrows():
 
 db.session.commit()
 
-print(f"{insert_count}건 미래 예측 데이터 삽입")
\ No newline at end of file
+print(f"{insert_count}건 미래 예측 데이터 삽입")
+
+# 분석용 로컬 미러 갱신 (설정된 경우)
+if app.config.get("ANALYTICS_MIRROR_PATH"):
+    from pybo.analytics_mirror import build_snapshot
+    print(f"분석용 미러 갱신: version={build_snapshot()}")
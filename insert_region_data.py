@@ -33,3 +33,8 @@ with app.app_context():
 
     db.session.commit()
     print("RegionData 데이터 삽입 완료!")
+
+    # 분석용 로컬 미러 갱신 (설정된 경우)
+    if app.config.get("ANALYTICS_MIRROR_PATH"):
+        from pybo.analytics_mirror import build_snapshot
+        print(f"분석용 미러 갱신: version={build_snapshot()}")
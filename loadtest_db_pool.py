@@ -0,0 +1,114 @@
+# 커넥션 풀 부하 테스트: 대시보드 API 를 동시 N 개로 호출하고 지연시간/풀 지표 출력
+# 사용법:
+#   python loadtest_db_pool.py --sqlite data/loadtest.db          # 로컬 SQLite 대체 DB (없으면 CSV로 채움)
+#   python loadtest_db_pool.py --concurrency 50 --requests 500    # .env 의 DB_URI 사용
+#   DB_POOL_SIZE=2 DB_MAX_OVERFLOW=0 python loadtest_db_pool.py --sqlite data/loadtest.db
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+
+def _seed_sqlite(db, RegionData, RegionForecast):
+    if RegionData.query.first() is not None:
+        return
+
+    with open(os.path.join(DATA_DIR, "master_2015_2022.csv"), encoding="utf-8-sig") as f:
+        for r in csv.DictReader(f):
+            db.session.add(RegionData(
+                district=r["district"],
+                year=int(r["year"]),
+                grdp=int(float(r["grdp"])),
+                basic_beneficiaries=int(r["basic_beneficiaries"]),
+                multicultural_hh=int(r["multicultural_hh"]),
+                population=int(r["population"]),
+                divorce=int(r["divorce"]),
+                child_facility=int(r["child_facility"]),
+                child_user=int(r["child_user"]),
+                single_parent=int(r["single_parent"]),
+                birth_cnt=int(r["birth_cnt"]),
+                academy_cnt=float(r["academy_cnt"]),
+            ))
+
+    with open(os.path.join(DATA_DIR, "predicted_child_user_2023_2030.csv"), encoding="utf-8-sig") as f:
+        for r in csv.DictReader(f):
+            district = next(k[len("district_"):] for k, v in r.items() if k.startswith("district_") and v == "True")
+            db.session.add(RegionForecast(
+                district=district,
+                year=int(r["year"]),
+                predicted_child_user=float(r["child_user"]),
+                single_parent=float(r["single_parent"]),
+                basic_beneficiaries=float(r["basic_beneficiaries"]),
+                multicultural_hh=float(r["multicultural_hh"]),
+                academy_cnt=float(r["academy_cnt"]),
+                grdp=float(r["grdp"]),
+                model_version="final",
+            ))
+    db.session.commit()
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    k = max(0, min(len(values) - 1, int(round(p / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--sqlite", help="로컬 SQLite 파일 경로 (지정 시 DB_URI 대신 사용)")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        os.environ["DB_URI"] = "sqlite:///" + os.path.abspath(args.sqlite)
+
+    sys.path.insert(0, BASE_DIR)
+    from pybo import create_app, db
+    from pybo.db_pool import get_pool_stats
+    from pybo.models import RegionData, RegionForecast
+
+    app = create_app()
+    if args.sqlite:
+        with app.app_context():
+            db.create_all()
+            _seed_sqlite(db, RegionData, RegionForecast)
+
+    with app.app_context():
+        districts = ["전체"] + [r[0] for r in db.session.query(RegionData.district).distinct()]
+
+    def one_request(i):
+        client = app.test_client()
+        district = districts[i % len(districts)]
+        start = time.perf_counter()
+        res = client.get(
+            "/data/dashboard-data",
+            query_string={"district": district, "start_year": 2015, "end_year": 2022},
+        )
+        return time.perf_counter() - start, res.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one_request, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [r[0] * 1000 for r in results]
+    errors = sum(1 for r in results if r[1] != 200)
+
+    print(f"requests={args.requests} concurrency={args.concurrency} errors={errors}")
+    print(f"throughput={args.requests / elapsed:.1f} req/s  total={elapsed:.2f}s")
+    print(
+        f"latency ms: p50={_percentile(latencies, 50):.1f} p95={_percentile(latencies, 95):.1f} "
+        f"p99={_percentile(latencies, 99):.1f} max={max(latencies):.1f} mean={statistics.mean(latencies):.1f}"
+    )
+    print("pool:", get_pool_stats(app))
+
+
+if __name__ == "__main__":
+    main()
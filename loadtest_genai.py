@@ -0,0 +1,206 @@
+# GenAI API 부하 테스트: /genai-api/qa, /report, /policy, /summarize 를 동시 N 개로 호출하고 지연시간/처리량 출력
+# 사용법:
+#   python fake_llm_server.py --port 9000 --latency 1.0 --latency-dist lognormal --jitter 0.5 &
+#   RUNPOD_API_URL=http://127.0.0.1:9000/generate python loadtest_genai.py --concurrency 16 --requests 200
+#   python loadtest_genai.py --base-url http://127.0.0.1:5000 --endpoints qa,summarize      # 실행 중인 서버 대상
+#   python loadtest_genai.py --replay requests.jsonl --stream                               # 입력 재생 + 스트리밍(TTFT)
+# - --replay 파일의 각 줄: {"endpoint": "qa", "body": {...}} 또는 {"title": ..., "body": "..."} (요청 목록 형식)
+# - --base-url 생략 시 앱을 프로세스 안에서 띄워 test_client 로 호출 (.env 의 DB_URI / RUNPOD_API_URL 사용)
+import argparse
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+ENDPOINTS = ("qa", "report", "policy", "summarize")
+
+DEFAULT_QUESTIONS = [
+    "지역아동센터 이용 대상은 누구인가요?",
+    "아동복지 지원금 신청 기준을 알려주세요.",
+    "안녕하세요",
+    "한부모 가정 지원 사업에는 어떤 것이 있나요?",
+]
+DEFAULT_DISTRICTS = ["전체", "강남구", "노원구", "관악구", "송파구"]
+DEFAULT_TEXT = (
+    "서울시는 2023년부터 2030년까지 지역아동센터 이용 아동 수가 자치구별로 다르게 변화할 것으로 예측했다. "
+    "출생아 수 감소에도 불구하고 한부모 가정과 기초생활수급 가구 비중이 높은 지역은 수요가 유지되거나 늘어날 전망이다. "
+    "이에 따라 시설 확충과 인력 배치를 지역별 수요에 맞춰 조정할 필요가 있다."
+)
+
+
+def _default_body(endpoint: str, i: int) -> dict:
+    district = DEFAULT_DISTRICTS[i % len(DEFAULT_DISTRICTS)]
+    if endpoint == "qa":
+        return {"question": DEFAULT_QUESTIONS[i % len(DEFAULT_QUESTIONS)]}
+    if endpoint == "report":
+        return {"district": district, "start_year": 2023, "end_year": 2030}
+    if endpoint == "policy":
+        return {"prompt": "맞춤형 정책 제안", "district": district}
+    return {"text": DEFAULT_TEXT}
+
+
+def _replay_body(endpoint: str, record: dict, i: int) -> dict:
+    """요청 목록 형식(title/body) 한 줄 → 엔드포인트 입력"""
+    title = (record.get("title") or "").strip()
+    body = record.get("body")
+    text = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+    if endpoint == "qa":
+        return {"question": title or text[:200]}
+    if endpoint == "summarize":
+        return {"text": text or title}
+    if endpoint == "policy":
+        return {"prompt": title or text[:200], "district": DEFAULT_DISTRICTS[i % len(DEFAULT_DISTRICTS)]}
+    return _default_body(endpoint, i)
+
+
+def build_workload(endpoints: list[str], total: int, replay: str | None) -> list[tuple[str, dict]]:
+    cycle = itertools.cycle(endpoints)
+    if not replay:
+        return [(ep, _default_body(ep, i)) for i, ep in zip(range(total), cycle)]
+
+    with open(replay, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records:
+        raise SystemExit(f"재생할 입력이 없습니다: {replay}")
+
+    workload = []
+    for i in range(total):
+        record = records[i % len(records)]
+        if record.get("endpoint"):
+            endpoint = record["endpoint"]
+            body = record.get("body") or record.get("payload") or {}
+        else:
+            endpoint = next(cycle)
+            body = _replay_body(endpoint, record, i)
+        workload.append((endpoint, body))
+    return workload
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    k = max(0, min(len(values) - 1, int(round(p / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+class _HttpCaller:
+    def __init__(self, base_url: str):
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=256)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def json(self, path, body):
+        res = self.session.post(self.base_url + path, json=body, timeout=600)
+        data = res.json() if res.headers.get("Content-Type", "").startswith("application/json") else {}
+        return res.status_code, data
+
+    def stream(self, path, body):
+        """(status, 첫 token 까지 걸린 시간, 오류 여부)"""
+        start = time.perf_counter()
+        ttft, error = None, False
+        with self.session.post(self.base_url + path, json=body, timeout=600, stream=True) as res:
+            for line in res.iter_lines(decode_unicode=True):
+                if line.startswith("event: token") and ttft is None:
+                    ttft = time.perf_counter() - start
+                elif line.startswith("event: error"):
+                    error = True
+            return res.status_code, ttft, error
+
+
+class _AppCaller:
+    def __init__(self):
+        sys.path.insert(0, BASE_DIR)
+        from pybo import create_app
+
+        self.app = create_app()
+
+    def json(self, path, body):
+        res = self.app.test_client().post(path, json=body)
+        return res.status_code, res.get_json(silent=True) or {}
+
+    def stream(self, path, body):
+        start = time.perf_counter()
+        ttft, error = None, False
+        res = self.app.test_client().post(path, json=body, buffered=False)
+        try:
+            for chunk in res.response:
+                text = chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+                if "event: token" in text and ttft is None:
+                    ttft = time.perf_counter() - start
+                if "event: error" in text:
+                    error = True
+        finally:
+            res.close()
+        return res.status_code, ttft, error
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="쉼표 구분, 순서대로 번갈아 호출")
+    parser.add_argument("--base-url", help="실행 중인 서버 주소 (생략 시 프로세스 내 앱)")
+    parser.add_argument("--replay", help="JSONL 입력 파일")
+    parser.add_argument("--stream", action="store_true", help="/stream 엔드포인트 사용 (TTFT 측정)")
+    args = parser.parse_args()
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"알 수 없는 엔드포인트: {', '.join(sorted(unknown))}")
+
+    workload = build_workload(endpoints, args.requests, args.replay)
+    caller = _HttpCaller(args.base_url) if args.base_url else _AppCaller()
+
+    def one_request(item):
+        endpoint, body = item
+        path = f"/genai-api/{endpoint}" + ("/stream" if args.stream else "")
+        start = time.perf_counter()
+        try:
+            if args.stream:
+                status, ttft, error = caller.stream(path, body)
+                ok = status == 200 and not error
+            else:
+                status, data = caller.json(path, body)
+                ttft, ok = None, status == 200 and data.get("success", False)
+        except Exception as e:
+            print(f"[loadtest] {endpoint} error: {e}")
+            ttft, ok = None, False
+        return endpoint, time.perf_counter() - start, ttft, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one_request, workload))
+    elapsed = time.perf_counter() - start
+
+    by_endpoint = defaultdict(list)
+    for r in results:
+        by_endpoint[r[0]].append(r)
+    by_endpoint["(all)"] = results
+
+    print(f"requests={len(results)} concurrency={args.concurrency} stream={args.stream} total={elapsed:.2f}s")
+    print(f"{'endpoint':<10} {'n':>5} {'err':>4} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'mean':>8} {'ttft50':>8}")
+    for name, rows in by_endpoint.items():
+        latencies = [r[1] * 1000 for r in rows]
+        ttfts = [r[2] * 1000 for r in rows if r[2] is not None]
+        errors = sum(1 for r in rows if not r[3])
+        print(
+            f"{name:<10} {len(rows):>5} {errors:>4} {len(rows) / elapsed:>7.2f} "
+            f"{_percentile(latencies, 50):>8.0f} {_percentile(latencies, 95):>8.0f} {_percentile(latencies, 99):>8.0f} "
+            f"{max(latencies):>8.0f} {statistics.mean(latencies):>8.0f} "
+            f"{(_percentile(ttfts, 50) if ttfts else float('nan')):>8.0f}"
+        )
+    print("(ms)")
+
+
+if __name__ == "__main__":
+    main()
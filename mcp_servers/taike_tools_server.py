@@ -6,19 +6,13 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
-import time
-import requests
-import json
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from mcp.server.fastmcp import FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
 
 # 2. 이제 pybo 모듈 import 가능
-from pybo.service.rag_service import RagService
-from pybo import db
-from pybo.models import RegionForecast
-from sqlalchemy import func
+from pybo import create_mcp_app
+from pybo.agent import tools
+from pybo.agent.tools import DEFAULT_MAX_NEW_TOKENS, DEFAULT_TEMP
 
 mcp = FastMCP(
     "tAIke-tools",
@@ -31,70 +25,35 @@ mcp = FastMCP(
     ),
 )
 
-RUNPOD_URL = os.getenv("RUNPOD_API_URL")
-RUNPOD_API_KEY = os.getenv("RUNPOD_API_KEY")
+# 도구 구현은 pybo.agent.tools 에 있음 (웹 프로세스 안에서 바로 실행하는 TOOL_TRANSPORT=local 과 공유)
+tools.get_rag_service()  # 임베딩 모델/벡터 DB 는 서버 시작 시 로드
 
-session = requests.Session()
-retry = Retry(
-    total=3,  # 리트라이 횟수 증가
-    backoff_factor=0.6,
-    status_forcelist=(429, 500, 502, 503, 504, 524),  # 524 추가
-    allowed_methods=frozenset(["POST"]),
-    raise_on_status=False,
-)
-adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
-session.mount("http://", adapter)
-session.mount("https://", adapter)
-
-DEFAULT_TEMP = 0.3
-DEFAULT_MAX_NEW_TOKENS = 256
-
-rag = RagService()
+# MCP 프로세스 전용 최소 앱/엔진 (웹 서버와 별도의 작은 커넥션 풀 프로필, 블루프린트/웹 서비스 없음)
+app = create_mcp_app()
 
 
 @mcp.tool()
 def rag_search(question: str) -> str:
-    return rag.get_relevant_context(question)
+    return tools.rag_search(question)
 
 
 @mcp.tool()
 def check_stats(district: str = "전체", start_year: int = 2023, end_year: int = 2030) -> str:
-    try:
-        if district == "전체":
-            summary = (
-                db.session.query(
-                    RegionForecast.year,
-                    func.sum(RegionForecast.predicted_child_user).label("total")
-                )
-                .filter(RegionForecast.year >= start_year, RegionForecast.year <= end_year)
-                .group_by(RegionForecast.year)
-                .order_by(RegionForecast.year.asc())
-                .all()
-            )
-            if not summary:
-                return f"{start_year}~{end_year} 기간의 전체 데이터가 없습니다."
-            return "\n".join([f"{s.year}년 서울시 전체 합계: {s.total}명" for s in summary])
-
-        rows = (
-            RegionForecast.query
-            .filter(
-                RegionForecast.district == district,
-                RegionForecast.year >= start_year,
-                RegionForecast.year <= end_year
-            )
-            .order_by(RegionForecast.year.asc())
-            .all()
-        )
-        if not rows:
-            return f"{district}의 {start_year}~{end_year} 기간 데이터가 없습니다."
-
-        result = [f"{district} 예측 데이터:"]
-        result.extend([f"- {r.year}년: {r.predicted_child_user}명" for r in rows])
-        return "\n".join(result)
-
-    except Exception as e:
-        return f"DB 조회 중 오류 발생: {str(e)}"
+    with app.app_context():
+        return tools.check_stats(district, start_year, end_year)
+
 
+@mcp.tool()
+def rag_search_batch(questions: list[str]) -> str:
+    """여러 질문을 한 번에 검색 (임베딩 한 번, 최대 50개). {"results": [{"question", "ok", "context"}, ...], "truncated": n}"""
+    return tools.rag_search_batch(questions)
+
+
+@mcp.tool()
+def check_stats_batch(districts: list[str], start_year: int = 2023, end_year: int = 2030) -> str:
+    """여러 자치구 통계를 한 번에 조회 (SQL 한 번, 최대 50개). {"results": [{"district", "ok", "text"}, ...], "truncated": n}"""
+    with app.app_context():
+        return tools.check_stats_batch(districts, start_year, end_year)
 
 
 @mcp.tool()
@@ -107,40 +66,9 @@ def llama_generate(
     timeout_connect: float = 10.0,
     timeout_read: float = 180.0,
 ) -> str:
-    if not RUNPOD_URL:
-        return "RUNPOD_API_URL이 설정되지 않았습니다."
-
-    payload = {
-        "instruction": instruction,
-        "input": input_text,
-        "model_version": model_version,
-        "max_new_tokens": max_new_tokens,
-        "temperature": temperature,
-        "stop": ["Observation:", "Observation", "###"],  # 중단 토큰 추가
-    }
-
-    headers = {"Content-Type": "application/json"}
-    if RUNPOD_API_KEY and "proxy.runpod.net" not in RUNPOD_URL:
-        headers["Authorization"] = f"Bearer {RUNPOD_API_KEY}"
-
-    try:
-        res = session.post(
-            RUNPOD_URL,
-            json=payload,
-            headers=headers,
-            timeout=(timeout_connect, timeout_read),
-        )
-        if not (200 <= res.status_code < 300):
-            return f"AI 서버 오류(status={res.status_code})로 답변 생성에 실패했습니다. 잠시 후 재시도 해주세요."
-
-        return (res.json().get("text", "") or "").strip()
-
-    except requests.exceptions.Timeout:
-        return "AI 서버 응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요."
-    except requests.exceptions.RequestException as e:
-        return f"AI 서버 통신 중 오류가 발생했습니다: {str(e)}"
-    except Exception:
-        return "AI 서버 처리 중 알 수 없는 오류가 발생했습니다."
+    return tools.llama_generate(
+        instruction, input_text, model_version, temperature, max_new_tokens, timeout_connect, timeout_read,
+    )
 
 
 if __name__ == "__main__":
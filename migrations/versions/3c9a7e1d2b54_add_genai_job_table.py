@@ -0,0 +1,39 @@
+"""add genai_job table
+
+Revision ID: 3c9a7e1d2b54
+Revises: fee148399c62
+Create Date: 2026-10-19 10:12:03.512847
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a7e1d2b54'
+down_revision = 'fee148399c62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('genai_job',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('task_type', sa.String(length=30), nullable=False),
+    sa.Column('params', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_genai_job_status'), 'genai_job', ['status'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_genai_job_status'), table_name='genai_job')
+    op.drop_table('genai_job')
@@ -0,0 +1,37 @@
+"""add genai_pregenerated table
+
+Revision ID: 7d41b0c9e8a2
+Revises: 3c9a7e1d2b54
+Create Date: 2026-10-19 14:02:41.207391
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d41b0c9e8a2'
+down_revision = '3c9a7e1d2b54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('genai_pregenerated',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_type', sa.String(length=30), nullable=False),
+    sa.Column('district', sa.String(length=50), nullable=False),
+    sa.Column('start_year', sa.Integer(), nullable=False),
+    sa.Column('end_year', sa.Integer(), nullable=False),
+    sa.Column('model_version', sa.String(length=20), nullable=False),
+    sa.Column('data_version', sa.String(length=40), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('elapsed', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('task_type', 'district', 'start_year', 'end_year', 'model_version', 'data_version', name='uq_genai_pregenerated_key')
+    )
+
+
+def downgrade():
+    op.drop_table('genai_pregenerated')
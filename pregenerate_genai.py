@@ -0,0 +1,54 @@
+# 보고서/정책 사전 생성 배치 (자치구 x 연도 구간 x 모델 버전)
+# 사용법:
+#   python pregenerate_genai.py                                   # 기본 조합, 동시 2건
+#   python pregenerate_genai.py --workers 4 --model-versions final,base --year-ranges 2023-2030,2023-2025
+#   python pregenerate_genai.py --only report --districts 강남구,전체
+# - MCP 도구 서버(check_stats)와 RunPod 가 떠 있어야 함
+# - 중간에 멈춰도 다시 실행하면 저장된 조합은 건너뛰고 이어서 생성
+import argparse
+
+from pybo import create_app
+from pybo.service.data_service import DataService
+from pybo.service.genai_service import POLICY_YEAR_RANGE, get_genai_service
+from pybo.service.pregenerated import enumerate_combinations, run_batch
+
+
+def _year_ranges(value: str) -> list[tuple[int, int]]:
+    ranges = []
+    for part in value.split(","):
+        start, end = part.strip().split("-")
+        ranges.append((int(start), int(end)))
+    return ranges
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=2, help="RunPod 동시 호출 수")
+    parser.add_argument("--model-versions", default="final,base")
+    parser.add_argument("--year-ranges", default="2023-2030,2023-2025,2026-2030")
+    parser.add_argument("--districts", help="쉼표 구분 (생략 시 전체 자치구 + 전체)")
+    parser.add_argument("--only", choices=["report", "policy"])
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        data_service = DataService()
+        data_version = data_service.get_forecast_data_version()
+        if args.districts:
+            districts = [d.strip() for d in args.districts.split(",") if d.strip()]
+        else:
+            districts = ["전체"] + data_service.get_districts()["districts"]
+
+    combos = enumerate_combinations(
+        districts,
+        _year_ranges(args.year_ranges),
+        [v.strip() for v in args.model_versions.split(",") if v.strip()],
+        POLICY_YEAR_RANGE,
+        task_types=(args.only,) if args.only else ("report", "policy"),
+    )
+    result = run_batch(app, get_genai_service(), combos, data_version, workers=args.workers)
+    print(f"사전 생성 완료: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,17 +7,64 @@ import config
 db = SQLAlchemy()
 migrate = Migrate()
 
-def create_app():
+def _init_db(app, pool_profile: str) -> None:
+    # DB (커넥션 풀은 프로세스 종류별 프로필로 구성)
+    from . import db_pool
+    db_pool.configure(app, pool_profile)
+    db.init_app(app)
+    db_pool.init_app(app, db)
+
+
+def create_mcp_app():
+    """MCP 도구 서버용 최소 앱: 설정 + DB(mcp 풀 프로필) + 통계 읽기 미러만
+    (블루프린트 / GenAI 서비스 / 작업 큐 / 로그 저장 스레드 / 도구 전송 없음)"""
+    app = Flask(__name__)
+    app.config.from_object(config)
+    _init_db(app, "mcp")
+
+    from . import models
+
+    # check_stats(_batch) 도 미러를 우선 읽음 (ANALYTICS_MIRROR_PATH 설정 시)
+    from . import analytics_mirror
+    analytics_mirror.init_app(app)
+    return app
+
+
+def create_app(pool_profile: str = "web"):
     app = Flask(__name__)
     app.config.from_object(config)
 
     # DB + Migrate
-    db.init_app(app)
+    _init_db(app, pool_profile)
     migrate.init_app(app, db)
 
+    # 빠른 JSON 직렬화 + 응답 압축
+    from . import api_response
+    api_response.init_app(app)
+
+    # 요청별 SQL 계측 (SQL_STATS_ENABLED 일 때만)
+    from . import sql_stats
+    sql_stats.init_app(app)
+
     # 모델 로딩
     from . import models
 
+    # 분석용 읽기 전용 로컬 미러 (ANALYTICS_MIRROR_PATH 설정 시)
+    from . import analytics_mirror
+    analytics_mirror.init_app(app)
+
+    # GenAI 비동기 작업 큐 (워커는 첫 작업 제출 시 시작)
+    from .service import genai_jobs
+    genai_jobs.init_app(app)
+
+    # 감사 로그 비동기 배치 저장 (저장 스레드는 첫 로그 때 시작)
+    from .service import log_writer
+    log_writer.init_app(app)
+
+    # 도구를 웹 프로세스 안에서 실행하는 경우(TOOL_TRANSPORT=local) 앱 등록 + RagService 미리 로드
+    from .agent import tool_transport
+    tool_transport.init_app(app)
+
     # Blueprint 등록
     from .views import (
         main_views,
@@ -27,6 +74,7 @@ def create_app():
         data_views,
         predict_views,
         genai_views,
+        debug_views,
     )
 
     app.register_blueprint(main_views.bp)
@@ -36,4 +84,5 @@ def create_app():
     app.register_blueprint(data_views.bp)
     app.register_blueprint(predict_views.bp)
     app.register_blueprint(genai_views.bp)
+    app.register_blueprint(debug_views.bp)
     return app
\ No newline at end of file
@@ -0,0 +1,237 @@
+# MCP 클라이언트 세션 풀
+# - 호출마다 연결 + initialize(핸드셰이크)를 하지 않고, 초기화가 끝난 세션을 계속 재사용
+# - 세션은 공용 이벤트 루프(async_bridge)에서만 열고 닫음 (anyio 컨텍스트는 연 태스크에서 닫아야 함)
+# - 선택: 처리 중 호출이 가장 적은 세션. 모두 바쁘고 size 보다 적으면 새로 엶
+# - 호출 중 전송 오류(연결 끊김)가 나면 그 세션을 버림 (같은 세션의 다른 호출이 끝난 뒤 닫음)
+#   조회 도구(IDEMPOTENT_TOOLS)만 새 세션으로 한 번 재시도. 도구/프로토콜 오류(JSON-RPC 오류 응답 등)는 세션 문제가 아니므로 그대로 올림
+# - health_interval 마다 쉬고 있는 세션에 ping → 실패하면 버림 (다음 호출 때 새로 엶)
+import asyncio
+import itertools
+import os
+import threading
+import time
+from typing import Optional
+
+import anyio
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+try:  # mcp 1.x
+    from mcp.types import CONNECTION_CLOSED
+except ImportError:  # mcp 2.x
+    from mcp_types import CONNECTION_CLOSED
+
+from pybo.async_bridge import get_bridge
+
+# 다시 보내도 결과/부작용이 같은 조회 도구 (전송 오류 시 재시도 대상)
+IDEMPOTENT_TOOLS = frozenset({"rag_search", "check_stats", "rag_search_batch", "check_stats_batch"})
+
+_TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, httpx.TransportError, ConnectionError,
+)
+
+
+def _is_transport_error(e: BaseException) -> bool:
+    """세션(연결)이 죽은 오류인지. MCP 오류 응답 중에는 '연결 닫힘' 코드만 해당"""
+    if isinstance(e, _TRANSPORT_ERRORS):
+        return True
+    return getattr(getattr(e, "error", None), "code", None) == CONNECTION_CLOSED
+
+
+class _PooledSession:
+    def __init__(self, sid: int):
+        self.sid = sid
+        self.session: Optional[ClientSession] = None
+        self.ready = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.error: Optional[BaseException] = None
+        self.inflight = 0
+        self.calls = 0
+        self.broken = False
+        self.last_used = time.time()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MCPSessionPool:
+    def __init__(
+        self,
+        url: str,
+        size: int = 4,
+        init_timeout: float = 10.0,
+        health_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+    ):
+        self.url = url
+        self.size = max(1, size)
+        self.init_timeout = init_timeout
+        self.health_interval = health_interval
+        self.ping_timeout = ping_timeout
+
+        self._ids = itertools.count(1)
+        self._sessions: list[_PooledSession] = []
+        self._open_lock: Optional[asyncio.Lock] = None
+
+        self._bridge = get_bridge()
+        self._health_started = False
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"calls": 0, "opened": 0, "closed": 0, "reconnects": 0, "health_failures": 0, "open_errors": 0}
+        self._open_total = 0.0
+
+    async def acall_tool(self, tool_name: str, arguments: dict, timeout: float = 30.0):
+        """도구 호출. 어느 이벤트 루프에서 불러도 세션 작업은 공용 루프에서 실행. 결과는 mcp CallToolResult"""
+        self._ensure_health_check()
+        return await self._bridge.arun(self._call_tool(tool_name, arguments, timeout))
+
+    def _ensure_health_check(self) -> None:
+        if self._health_started:
+            return
+        with self._start_lock:
+            if not self._health_started:
+                self._bridge.spawn(self._health_loop())
+                self._health_started = True
+
+    # ===== 세션 관리 (공용 루프 안에서만 실행) =====
+
+    async def _call_tool(self, tool_name: str, arguments: dict, timeout: float):
+        with self._stats_lock:
+            self._stats["calls"] += 1
+
+        for attempt in range(2):
+            pooled = await self._acquire()
+            try:
+                return await asyncio.wait_for(pooled.session.call_tool(tool_name, arguments=arguments), timeout)
+            except asyncio.TimeoutError:
+                raise  # 도구가 느린 것 (세션 문제로 보지 않음)
+            except Exception as e:
+                if not _is_transport_error(e):
+                    raise  # 도구/프로토콜 오류 → 세션은 멀쩡함
+                # 연결이 끊긴 세션 → 버리고, 조회 도구면 새 세션으로 한 번 더
+                self._discard(pooled)
+                if attempt == 1 or tool_name not in IDEMPOTENT_TOOLS:
+                    raise
+                with self._stats_lock:
+                    self._stats["reconnects"] += 1
+            finally:
+                pooled.inflight -= 1
+                pooled.last_used = time.time()
+                if pooled.broken and pooled.inflight == 0:
+                    pooled.closing.set()
+
+    async def _acquire(self) -> _PooledSession:
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+
+        alive = [s for s in self._sessions if not s.broken]
+        idle = [s for s in alive if s.inflight == 0]
+        if idle or len(alive) >= self.size:
+            pooled = min(idle or alive, key=lambda s: s.inflight)
+        else:
+            async with self._open_lock:
+                alive = [s for s in self._sessions if not s.broken]
+                if len(alive) < self.size:
+                    pooled = await self._open()
+                else:
+                    pooled = min(alive, key=lambda s: s.inflight)
+
+        pooled.inflight += 1
+        pooled.calls += 1
+        return pooled
+
+    async def _open(self) -> _PooledSession:
+        pooled = _PooledSession(next(self._ids))
+        start = time.perf_counter()
+        pooled.task = asyncio.create_task(self._hold(pooled))
+        try:
+            await asyncio.wait_for(pooled.ready.wait(), self.init_timeout)
+        except asyncio.TimeoutError:
+            pooled.closing.set()
+            pooled.task.cancel()
+            with self._stats_lock:
+                self._stats["open_errors"] += 1
+            raise
+        if pooled.error is not None:
+            with self._stats_lock:
+                self._stats["open_errors"] += 1
+            raise pooled.error
+
+        self._sessions.append(pooled)
+        with self._stats_lock:
+            self._stats["opened"] += 1
+            self._open_total += time.perf_counter() - start
+        return pooled
+
+    async def _hold(self, pooled: _PooledSession) -> None:
+        """세션 하나를 열어 둔 채로 closing 까지 대기 (연 태스크에서 닫기)"""
+        try:
+            async with streamable_http_client(self.url) as (read, write, *_):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    pooled.session = session
+                    pooled.ready.set()
+                    await pooled.closing.wait()
+        except BaseException as e:  # 연결 실패 / 루프 종료 / 서버가 끊음
+            pooled.error = e if isinstance(e, Exception) else ConnectionError(str(e))
+        finally:
+            pooled.broken = True
+            pooled.ready.set()
+            if pooled in self._sessions:
+                self._sessions.remove(pooled)
+                with self._stats_lock:
+                    self._stats["closed"] += 1
+
+    def _discard(self, pooled: _PooledSession) -> None:
+        """새 호출에서 빼고, 진행 중인 호출이 모두 끝나면 닫음 (같은 세션에 다중화된 다른 호출을 끊지 않음)"""
+        pooled.broken = True
+        if pooled.inflight == 0:
+            pooled.closing.set()
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for pooled in [s for s in self._sessions if not s.broken and s.inflight == 0]:
+                try:
+                    await asyncio.wait_for(pooled.session.send_ping(), self.ping_timeout)
+                except Exception as e:
+                    print(f"[MCP Pool] session {pooled.sid} ping 실패 → 재연결 대상: {e}")
+                    with self._stats_lock:
+                        self._stats["health_failures"] += 1
+                    self._discard(pooled)
+
+    def stats(self) -> dict:
+        sessions = list(self._sessions)
+        with self._stats_lock:
+            s = dict(self._stats)
+            return {
+                "url": self.url,
+                "size": self.size,
+                "open_sessions": sum(1 for p in sessions if not p.broken),
+                "busy_sessions": sum(1 for p in sessions if not p.broken and p.inflight > 0),
+                **s,
+                "avg_open_ms": round(self._open_total / s["opened"] * 1000, 1) if s["opened"] else None,
+            }
+
+
+_pools: dict[str, MCPSessionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_session_pool(url: str) -> MCPSessionPool:
+    """MCP 서버 URL 별 공용 풀 (QA 그래프 / 에이전트의 ToolClient 가 같이 사용)"""
+    with _pools_lock:
+        pool = _pools.get(url)
+        if pool is None:
+            pool = _pools[url] = MCPSessionPool(
+                url,
+                size=int(os.getenv("MCP_POOL_SIZE", "4")),
+                init_timeout=float(os.getenv("MCP_POOL_INIT_TIMEOUT", "10")),
+                health_interval=float(os.getenv("MCP_POOL_HEALTH_INTERVAL", "30")),
+            )
+        return pool
+
+
+def all_pools() -> list[MCPSessionPool]:
+    with _pools_lock:
+        return list(_pools.values())
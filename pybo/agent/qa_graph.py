@@ -1,13 +1,18 @@
-import asyncio
-import nest_asyncio
-
-# 전역에서 한 번만 설정
-nest_asyncio.apply()
-
+import os
+import time
 from typing import TypedDict
 
 from langgraph.graph import StateGraph, END
+from pybo import async_bridge
 from pybo.agent.tool_client import ToolClient
+from pybo.llm_client import MSG_TIMEOUT
+from pybo.prompt_budget import PromptPiece, count_prompt_tokens, fit_pieces, prompt_stats
+
+# rag_search 결과의 청크 구분자 (RagService.get_relevant_context 와 같아야 함)
+RAG_CHUNK_SEPARATOR = "\n\n---\n\n"
+
+# QA 한 번(rag_search + LLM) 전체 제한 시간. 넘으면 그래프 실행을 취소하고 지연 안내
+QA_TIMEOUT = float(os.getenv("QA_TIMEOUT", "240"))
 
 _tool_client = ToolClient()
 
@@ -33,24 +38,35 @@ async def node_rag(state: QAState) -> QAState:
     return state
 
 
-async def node_answer(state: QAState) -> QAState:
-    q = state["question"]
+def build_answer_prompt(q: str, pdf_context: str) -> tuple[str, str]:
+    """QA 답변용 (instruction, input_text). 스트리밍 QA 와 공유.
+    RAG 청크는 검색 순위대로 우선순위를 매겨 QA 토큰 예산을 넘으면 뒤 순위부터 자르거나 뺌"""
     from pybo.agent.prompts import QA_GREETING_PROMPT, QA_NODE_PROMPT
 
     if _is_greeting(q):
-        instruction = QA_GREETING_PROMPT
-        input_text = f"사용자 질문: {q}"
-    else:
-        instruction = QA_NODE_PROMPT
-        input_text = f"참조 자료:\n{state['pdf_context']}\n\n질문: {q}"
+        return QA_GREETING_PROMPT, f"사용자 질문: {q}"
+
+    chunks = [c for c in (pdf_context or "").split(RAG_CHUNK_SEPARATOR) if c.strip()]
+    question, *kept = fit_pieces("qa", QA_NODE_PROMPT, [
+        PromptPiece("question", f"질문: {q}", required=True),
+        *[PromptPiece(f"rag{i + 1}", c, priority=i + 1) for i, c in enumerate(chunks)],
+    ], overhead="참조 자료:\n\n\n" + RAG_CHUNK_SEPARATOR * max(0, len(chunks) - 1))
+    context = RAG_CHUNK_SEPARATOR.join(c for c in kept if c)
+    return QA_NODE_PROMPT, f"참조 자료:\n{context}\n\n{question}"
 
-    state["answer"] = _tool_client.call_llm(
+
+async def node_answer(state: QAState) -> QAState:
+    instruction, input_text = build_answer_prompt(state["question"], state["pdf_context"])
+
+    start = time.time()
+    state["answer"] = await _tool_client.acall_llm(
         instruction=instruction,
         input_text=input_text,
         model_version=state.get("model_version", "final"),
         temperature=0.3,
         max_new_tokens=256,
     )
+    prompt_stats.record("qa", count_prompt_tokens(instruction, input_text), time.time() - start)
     return state
 
 
@@ -67,20 +83,19 @@ def build_graph():
 _graph = build_graph()
 
 
+def inflight_stats() -> dict:
+    """QA 그래프용 ToolClient 의 동시 호출 합치기 / 전송 지표"""
+    return _tool_client.inflight_stats()
+
+
 def run_qa(question: str, model_version: str = "final") -> str:
     state: QAState = {"question": question, "pdf_context": "", "answer": "", "model_version": model_version}
     try:
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        if loop.is_running():
-            # nest_asyncio 덕분에 실행 중인 루프에서도 run_until_complete 가능
-            return loop.run_until_complete(_graph.ainvoke(state))["answer"]
-        else:
-            return asyncio.run(_graph.ainvoke(state))["answer"]
+        # 공용 이벤트 루프에서 실행 → MCP 세션 풀 / httpx AsyncClient 를 요청끼리 공유
+        return async_bridge.submit(_graph.ainvoke(state), timeout=QA_TIMEOUT)["answer"]
+    except TimeoutError:
+        print(f"[QA Graph Error] 시간 초과 ({QA_TIMEOUT}s)")
+        return MSG_TIMEOUT
     except Exception as e:
         print(f"[QA Graph Error] {e}")
         return f"QA 처리 중 오류가 발생했습니다: {str(e)}"
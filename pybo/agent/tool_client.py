@@ -1,82 +1,136 @@
 import os
-import asyncio
-import nest_asyncio
+import json
+import time
+from typing import Optional, Tuple
 
-# 전역에서 한 번만 설정하여 오버헤드 감소
-nest_asyncio.apply()
+from pybo.agent.tool_transport import create_transport
+from pybo.circuit_breaker import get_breaker
+from pybo.llm_client import MSG_TIMEOUT, LLMClient, get_llm_client
+from pybo.single_flight import SingleFlight, SingleFlightTimeout
 
-from mcp import ClientSession
-from mcp.client.streamable_http import streamable_http_client
-
-
-import requests
+# MCP 서버 자체의 장애로 보는 결과 (도구가 돌려준 "데이터 없음" 등은 제외)
+TRANSPORT_ERROR_PREFIXES = ("MCP 도구 호출", "도구 호출 오류")
 
 class ToolClient:
-    """MCP 서버와 통신하며 도구를 호출하거나 직접 LLM을 호출하는 전담 클라이언트"""
+    """도구(MCP 서버 또는 같은 프로세스)를 호출하거나 직접 LLM을 호출하는 전담 클라이언트"""
 
     def __init__(self, mcp_url: str = None):
         self.mcp_url = mcp_url or os.getenv("MCP_URL", "http://127.0.0.1:8000/mcp")
-        self.runpod_url = os.getenv("RUNPOD_API_URL")
-        self.runpod_api_key = os.getenv("RUNPOD_API_KEY")
+        self.llm = get_llm_client()
+
+        # 동시에 들어온 같은 도구/LLM 호출은 하나만 실행하고 결과 공유
+        self.tool_inflight = SingleFlight("mcp_tool")
+        self.llm_inflight = SingleFlight("tool_client_llm")
+
+        # 같은 MCP 서버를 쓰는 클라이언트끼리 브레이커 공유
+        self.breaker = get_breaker(
+            f"mcp:{self.mcp_url}",
+            failure_threshold=int(os.getenv("MCP_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("MCP_BREAKER_RESET", "15")),
+            slow_call_seconds=float(os.getenv("MCP_BREAKER_SLOW_SECONDS", "20")) or None,
+        )
+
+        # 도구 호출 방식: MCP 서버(기본) 또는 같은 프로세스에서 바로 실행 (TOOL_TRANSPORT)
+        self.transport = create_transport(self.mcp_url)
 
     def call_llm(self, instruction: str, input_text: str, **kwargs) -> str:
-        """MCP를 거치지 않고 직접 런포드 LLM을 호출 (안정성 확보)"""
-        if not self.runpod_url:
-            return "AI 서버 URL이 설정되지 않았습니다."
-        
-        payload = {
-            "instruction": instruction,
-            "input": input_text,
-            "model_version": kwargs.get("model_version", "final"),
-            "max_new_tokens": kwargs.get("max_new_tokens", 256),
-            "temperature": kwargs.get("temperature", 0.3),
-            "stop": ["Observation:", "Observation", "###"],
-        }
-        
-        headers = {"Content-Type": "application/json"}
-        if self.runpod_api_key and "proxy.runpod.net" not in self.runpod_url:
-            headers["Authorization"] = f"Bearer {self.runpod_api_key}"
+        """MCP를 거치지 않고 직접 런포드 LLM을 호출 (프로세스 공용 커넥션 풀 사용)"""
+        payload = self._llm_payload(instruction, input_text, **kwargs)
+        key = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        try:
+            return self.llm_inflight.do(key, lambda: self.llm.generate(payload)[0], timeout=190.0)
+        except SingleFlightTimeout:
+            return MSG_TIMEOUT
+
+    async def acall_llm(self, instruction: str, input_text: str, **kwargs) -> str:
+        """call_llm 의 asyncio 버전 (그래프 노드용)"""
+        payload = self._llm_payload(instruction, input_text, **kwargs)
+        key = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+
+        async def fetch() -> str:
+            return (await self.llm.agenerate(payload))[0]
 
         try:
-            # 30초 대신 충분한 타임아웃 부여 (180초)
-            response = requests.post(self.runpod_url, json=payload, headers=headers, timeout=180.0)
-            if response.status_code == 200:
-                return response.json().get("text", "").strip()
-            return f"AI 서버 오류 (Status: {response.status_code})"
-        except Exception as e:
-            return f"AI 서버 통신 오류: {str(e)}"
+            return await self.llm_inflight.ado(key, fetch, timeout=190.0)
+        except SingleFlightTimeout:
+            return MSG_TIMEOUT
+
+    @staticmethod
+    def _llm_payload(instruction: str, input_text: str, **kwargs) -> dict:
+        return LLMClient.build_payload(
+            instruction,
+            input_text,
+            model_version=kwargs.get("model_version", "final"),
+            max_new_tokens=kwargs.get("max_new_tokens", 256),
+            temperature=kwargs.get("temperature", 0.3),
+        )
 
     async def call_tool_async(self, tool_name: str, arguments: dict) -> str:
+        """call_tool 의 asyncio 버전 (그래프 노드용). 브레이커 / 같은 호출 합치기도 동일하게 적용"""
+
+        async def fetch() -> str:
+            blocked = self._breaker_blocked(tool_name)
+            if blocked is not None:
+                return blocked
+            start = time.time()
+            # transport.acall 은 실패도 안내 문구로 돌려줌 (취소만 예외로 올라옴 → 장애로 기록하지 않음)
+            result = await self.transport.acall(tool_name, arguments)
+            self._breaker_record(result, start)
+            return result
+
         try:
-            async with streamable_http_client(self.mcp_url) as (read, write, _):
-                async with ClientSession(read, write) as session:
-                    # 서버 초기화 및 호출에 타임아웃 적용
-                    await asyncio.wait_for(session.initialize(), timeout=10.0)
-                    result = await asyncio.wait_for(
-                        session.call_tool(tool_name, arguments=arguments),
-                        timeout=30.0
-                    )
-                    return result.content[0].text if result.content else "결과 없음"
-        except asyncio.TimeoutError:
+            return await self.tool_inflight.ado(self._tool_key(tool_name, arguments), fetch, timeout=45.0)
+        except SingleFlightTimeout:
             return f"MCP 도구 호출 시간 초과 ({tool_name})"
-        except BaseException as e:
-            # TaskGroup errors are often BaseException or derived from its structure
-            return f"MCP 도구 호출 오류 ({tool_name}): {str(e)}"
 
     def call_tool(self, tool_name: str, arguments: dict) -> str:
+        key = self._tool_key(tool_name, arguments)
         try:
-            # nest_asyncio.apply()는 이미 전역에서 호출됨
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
-            if loop.is_running():
-                # 이미 실행 중인 루프에서는 nest_asyncio 덕분에 run_until_complete 가능
-                return loop.run_until_complete(self.call_tool_async(tool_name, arguments))
-            else:
-                return asyncio.run(self.call_tool_async(tool_name, arguments))
-        except Exception as e:
-            print(f"[Tool Client Error] {tool_name}: {str(e)}")
-            return f"도구 호출 오류 ({tool_name}): {str(e)}"
+            return self.tool_inflight.do(key, lambda: self._call_tool(tool_name, arguments), timeout=45.0)
+        except SingleFlightTimeout:
+            return f"MCP 도구 호출 시간 초과 ({tool_name})"
+
+    def call_tool_batch(self, tool_name: str, arguments: dict) -> Tuple[Optional[list], Optional[str]]:
+        """*_batch 도구 호출 → (항목별 결과 목록, 실패 시 안내 문구)"""
+        text = self.call_tool(tool_name, arguments)
+        try:
+            return json.loads(text)["results"], None
+        except (ValueError, KeyError, TypeError):
+            return None, text
+
+    def inflight_stats(self) -> dict:
+        return {
+            "tool": self.tool_inflight.stats(),
+            "llm": self.llm_inflight.stats(),
+            "transport": self.transport.stats(),
+        }
+
+    def _call_tool(self, tool_name: str, arguments: dict) -> str:
+        blocked = self._breaker_blocked(tool_name)
+        if blocked is not None:
+            return blocked
+
+        start = time.time()
+        result = None
+        try:
+            result = self._run_tool(tool_name, arguments)
+            return result
+        finally:
+            self._breaker_record(result, start)
+
+    @staticmethod
+    def _tool_key(tool_name: str, arguments: dict) -> str:
+        return tool_name + ":" + json.dumps(arguments, ensure_ascii=False, sort_keys=True, default=str)
+
+    def _breaker_blocked(self, tool_name: str) -> Optional[str]:
+        # MCP 서버 장애 중이면 연결/타임아웃을 기다리지 않고 바로 실패
+        if self.breaker.allow():
+            return None
+        return f"MCP 도구 호출 중단 ({tool_name}): 도구 서버 장애로 잠시 후 다시 시도해주세요."
+
+    def _breaker_record(self, result: Optional[str], start: float) -> None:
+        ok = result is not None and not result.startswith(TRANSPORT_ERROR_PREFIXES)
+        self.breaker.record(ok, time.time() - start)
+
+    def _run_tool(self, tool_name: str, arguments: dict) -> str:
+        return self.transport.call(tool_name, arguments)
@@ -0,0 +1,126 @@
+# ToolClient 의 도구 호출 방식 (TOOL_TRANSPORT)
+# - mcp (기본값): MCP 도구 서버로 호출. 웹 앱과 도구 서버를 따로 배포할 때
+# - local: 같은 프로세스에서 pybo.agent.tools 함수를 바로 호출. 웹 앱과 도구가 같은 컨테이너일 때
+#   (JSON-RPC / HTTP / 세션 없음, RagService 와 DB 엔진은 웹 프로세스 것을 같이 씀)
+# 어느 쪽이든 결과는 문자열, 실패하면 "MCP 도구 호출 …" / "도구 호출 오류 …" 로 시작하는 안내 문구
+import asyncio
+import os
+import threading
+
+from flask import has_app_context
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+from pybo import async_bridge
+from pybo.agent.mcp_pool import get_session_pool
+
+
+def _result_text(result) -> str:
+    return result.content[0].text if result.content else "결과 없음"
+
+
+class MCPToolTransport:
+    name = "mcp"
+
+    def __init__(self, url: str):
+        self.url = url
+        # 초기화된 MCP 세션 재사용 (끄면 호출마다 연결 + initialize)
+        self.pool = get_session_pool(url) if os.getenv("MCP_POOL_ENABLED", "1") == "1" else None
+
+    def call(self, tool_name: str, arguments: dict) -> str:
+        # 공용 이벤트 루프에서 실행 (요청 스레드마다 루프를 만들지 않음)
+        try:
+            return async_bridge.submit(self.acall(tool_name, arguments), timeout=45.0)
+        except TimeoutError:
+            return f"MCP 도구 호출 시간 초과 ({tool_name})"
+        except Exception as e:
+            print(f"[Tool Client Error] {tool_name}: {str(e)}")
+            return f"도구 호출 오류 ({tool_name}): {str(e)}"
+
+    async def acall(self, tool_name: str, arguments: dict) -> str:
+        if self.pool is not None:
+            try:
+                return _result_text(await self.pool.acall_tool(tool_name, arguments, timeout=30.0))
+            except asyncio.TimeoutError:
+                return f"MCP 도구 호출 시간 초과 ({tool_name})"
+            except Exception as e:  # 취소(CancelledError)는 그대로 올려 보냄
+                return f"MCP 도구 호출 오류 ({tool_name}): {str(e)}"
+        return await self._call_oneshot(tool_name, arguments)
+
+    async def _call_oneshot(self, tool_name: str, arguments: dict) -> str:
+        """세션 풀 없이 호출마다 연결 + initialize"""
+        try:
+            async with streamable_http_client(self.url) as (read, write, *_):
+                async with ClientSession(read, write) as session:
+                    # 서버 초기화 및 호출에 타임아웃 적용
+                    await asyncio.wait_for(session.initialize(), timeout=10.0)
+                    result = await asyncio.wait_for(
+                        session.call_tool(tool_name, arguments=arguments),
+                        timeout=30.0
+                    )
+                    return _result_text(result)
+        except asyncio.TimeoutError:
+            return f"MCP 도구 호출 시간 초과 ({tool_name})"
+        except Exception as e:
+            # anyio TaskGroup 오류는 ExceptionGroup 으로 옴 (Exception 하위). 취소(CancelledError)는 그대로 올려 보냄
+            return f"MCP 도구 호출 오류 ({tool_name}): {str(e)}"
+
+    def stats(self) -> dict:
+        return {"transport": self.name, "url": self.url, **({"mcp_pool": self.pool.stats()} if self.pool else {})}
+
+
+class LocalToolTransport:
+    name = "local"
+
+    def call(self, tool_name: str, arguments: dict) -> str:
+        """호출한 스레드에서 바로 실행 (요청 중이면 그 앱 컨텍스트, 아니면 init_app 에 등록된 앱)"""
+        from pybo.agent.tools import TOOLS
+
+        fn = TOOLS.get(tool_name)
+        if fn is None:
+            return f"도구 호출 오류 ({tool_name}): 등록되지 않은 도구입니다."
+        try:
+            if has_app_context() or _app is None:
+                return fn(**arguments)
+            with _app.app_context():
+                return fn(**arguments)
+        except Exception as e:
+            print(f"[Tool Client Error] {tool_name}: {str(e)}")
+            return f"도구 호출 오류 ({tool_name}): {str(e)}"
+
+    async def acall(self, tool_name: str, arguments: dict) -> str:
+        # 도구는 동기(DB/임베딩) → 이벤트 루프를 막지 않게 스레드에서
+        return await asyncio.to_thread(self.call, tool_name, arguments)
+
+    def stats(self) -> dict:
+        return {"transport": self.name}
+
+
+_app = None
+
+
+def create_transport(mcp_url: str):
+    transport = os.getenv("TOOL_TRANSPORT", "mcp").strip().lower()
+    if transport == "local":
+        return LocalToolTransport()
+    if transport != "mcp":
+        print(f"[Tool Client] 알 수 없는 TOOL_TRANSPORT={transport} → mcp 사용")
+    return MCPToolTransport(mcp_url)
+
+
+def init_app(app) -> None:
+    """local 전송에서 요청 밖(QA 그래프 / 작업 워커) 호출이 쓸 앱 등록 + RagService 미리 로드"""
+    global _app
+    if app.config.get("TOOL_TRANSPORT", "mcp") != "local":
+        return
+    _app = app
+
+    def warm_up() -> None:
+        try:
+            from pybo.agent.tools import get_rag_service
+
+            get_rag_service()
+        except Exception as e:
+            print(f"[Tool Client] RagService 로드 실패 (rag_search 호출 시 다시 시도): {e}")
+
+    threading.Thread(target=warm_up, name="rag-warmup", daemon=True).start()
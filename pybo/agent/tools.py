@@ -0,0 +1,95 @@
+# 도구 구현 (MCP 도구 서버와 웹 프로세스 안 실행(TOOL_TRANSPORT=local)이 같은 함수를 씀)
+# - RagService(임베딩 모델 + 벡터 DB)는 프로세스당 하나만 로드
+# - check_stats(_batch) 는 앱 컨텍스트 안에서 호출 (읽기 세션 = 로컬 미러 또는 기본 DB)
+# - *_batch 도구: 여러 항목을 한 번에 (SQL 한 번 / 임베딩 한 번) → {"results": [항목별 결과, ...], "truncated": n} JSON 문자열
+#   (MAX_BATCH_ITEMS 를 넘는 항목은 버리지 않고 ok=false 결과로 돌려줌)
+import json
+import threading
+
+from pybo.llm_client import LLMClient, get_llm_client
+from pybo.service.data_service import DataService
+
+DEFAULT_TEMP = 0.3
+DEFAULT_MAX_NEW_TOKENS = 256
+MAX_BATCH_ITEMS = 50
+
+_rag = None
+_rag_lock = threading.Lock()
+
+
+def get_rag_service():
+    global _rag
+    if _rag is None:
+        with _rag_lock:
+            if _rag is None:
+                from pybo.service.rag_service import RagService  # 임베딩 모델 로딩이 무거워서 처음 쓸 때 import
+
+                _rag = RagService()
+    return _rag
+
+
+def rag_search(question: str) -> str:
+    return get_rag_service().get_relevant_context(question)
+
+
+def check_stats(district: str = "전체", start_year: int = 2023, end_year: int = 2030) -> str:
+    try:
+        return DataService().get_report_stats([district], start_year, end_year)[district]
+    except Exception as e:
+        return f"DB 조회 중 오류 발생: {str(e)}"
+
+
+def _over_limit_message(kind: str) -> str:
+    return f"{kind} 중 오류 발생: 한 번에 최대 {MAX_BATCH_ITEMS}개까지 처리합니다 (초과 항목은 처리하지 않음)"
+
+
+def check_stats_batch(districts: list[str], start_year: int = 2023, end_year: int = 2030) -> str:
+    """{"results": [{"district", "ok", "text"}, ...], "truncated": 처리하지 않은 항목 수}
+    (요청 순서, text 는 check_stats 와 같은 형식. MAX_BATCH_ITEMS 를 넘는 항목은 ok=false 로 돌려줌)"""
+    districts = list(dict.fromkeys(districts or []))
+    accepted, dropped = districts[:MAX_BATCH_ITEMS], districts[MAX_BATCH_ITEMS:]
+    try:
+        stats = DataService().get_report_stats(accepted, start_year, end_year)
+        results = [{"district": d, "ok": True, "text": stats[d]} for d in accepted]
+    except Exception as e:
+        results = [{"district": d, "ok": False, "text": f"DB 조회 중 오류 발생: {str(e)}"} for d in accepted]
+    results += [{"district": d, "ok": False, "text": _over_limit_message("DB 조회")} for d in dropped]
+    return json.dumps({"results": results, "truncated": len(dropped)}, ensure_ascii=False)
+
+
+def rag_search_batch(questions: list[str]) -> str:
+    """{"results": [{"question", "ok", "context"}, ...], "truncated": 처리하지 않은 항목 수}
+    (요청 순서, context 는 rag_search 와 같은 형식. MAX_BATCH_ITEMS 를 넘는 항목은 ok=false 로 돌려줌)"""
+    questions = list(questions or [])
+    accepted, dropped = questions[:MAX_BATCH_ITEMS], questions[MAX_BATCH_ITEMS:]
+    try:
+        contexts = get_rag_service().get_relevant_contexts(accepted)
+        results = [{"question": q, "ok": True, "context": c} for q, c in zip(accepted, contexts)]
+    except Exception as e:
+        results = [{"question": q, "ok": False, "context": f"문서 검색 중 오류 발생: {str(e)}"} for q in accepted]
+    results += [{"question": q, "ok": False, "context": _over_limit_message("문서 검색")} for q in dropped]
+    return json.dumps({"results": results, "truncated": len(dropped)}, ensure_ascii=False)
+
+
+def llama_generate(
+    instruction: str,
+    input_text: str,
+    model_version: str = "final",
+    temperature: float = DEFAULT_TEMP,
+    max_new_tokens: int = DEFAULT_MAX_NEW_TOKENS,
+    timeout_connect: float = 10.0,
+    timeout_read: float = 180.0,
+) -> str:
+    # RunPod 호출은 웹 서버와 같은 공용 클라이언트 사용 (커넥션 풀/재시도/지표)
+    payload = LLMClient.build_payload(instruction, input_text, model_version, max_new_tokens, temperature)
+    text, _ = get_llm_client().generate(payload, timeout=(timeout_connect, timeout_read))
+    return text
+
+
+TOOLS = {
+    "rag_search": rag_search,
+    "check_stats": check_stats,
+    "rag_search_batch": rag_search_batch,
+    "check_stats_batch": check_stats_batch,
+    "llama_generate": llama_generate,
+}
@@ -0,0 +1,161 @@
+# 지역 통계 읽기 전용 로컬 미러 (SQLite 스냅샷)
+# - ETL 직후 build_snapshot() 으로 Oracle 의 region_data / region_forecast 를 로컬 파일에 복사
+# - 읽기(RegionRepository, MCP check_stats)는 read_session() 으로 미러를 우선 사용, 없으면 기본 DB
+# - 쓰기는 계속 기본 DB(Oracle)로만 감
+import os
+import threading
+import time
+import uuid
+
+from flask import current_app, has_app_context
+from sqlalchemy import Column, MetaData, String, Table, create_engine, select
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from pybo import db
+from pybo.models import RegionData, RegionForecast
+
+# 미러에만 있는 테이블 (스냅샷 메타)
+mirror_metadata = MetaData()
+
+snapshot_meta = Table(
+    "snapshot_meta",
+    mirror_metadata,
+    Column("key", String(50), primary_key=True),
+    Column("value", String(200)),
+)
+
+
+def _version_path(path: str) -> str:
+    return path + ".version"
+
+
+def build_snapshot(path: str | None = None) -> str:
+    """기본 DB → 로컬 SQLite 스냅샷 생성 (앱 컨텍스트 안에서 호출). 새 버전 문자열 반환"""
+    path = os.path.abspath(path or current_app.config["ANALYTICS_MIRROR_PATH"])
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    version = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    source_tables = [RegionData.__table__, RegionForecast.__table__]
+    engine = create_engine(f"sqlite:///{tmp_path}")
+    try:
+        db.metadata.create_all(engine, tables=source_tables)
+        mirror_metadata.create_all(engine)
+
+        counts = {}
+        with engine.begin() as conn:
+            for table in source_tables:
+                rows = [dict(r) for r in db.session.execute(select(table)).mappings()]
+                if rows:
+                    conn.execute(table.insert(), rows)
+                counts[table.name] = len(rows)
+
+            conn.execute(snapshot_meta.insert(), [
+                {"key": "version", "value": version},
+                {"key": "created_at", "value": time.strftime("%Y-%m-%d %H:%M:%S")},
+                *[{"key": f"rows.{name}", "value": str(n)} for name, n in counts.items()],
+            ])
+    finally:
+        engine.dispose()
+
+    # 원자적 교체 후 버전 파일 갱신 → 읽는 쪽은 버전이 바뀐 것을 보고 다시 연결
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+    with open(_version_path(path) + ".tmp", "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(_version_path(path) + ".tmp", _version_path(path))
+    return version
+
+
+class AnalyticsMirror:
+    """스냅샷 파일을 읽기 전용으로 열고, 버전 파일이 바뀌면 다시 여는 리더"""
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = os.path.abspath(path)
+        self.check_interval = check_interval
+        self.version: str | None = None
+        self._engine = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.Session = scoped_session(sessionmaker())
+
+    def _read_version(self) -> str | None:
+        try:
+            with open(_version_path(self.path), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._engine is not None and now - self._last_check < self.check_interval:
+            return
+
+        with self._lock:
+            if self._engine is not None and now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+
+            version = self._read_version()
+            if version == self.version and self._engine is not None:
+                return
+            if version is None or not os.path.exists(self.path):
+                self._close()
+                return
+
+            engine = create_engine(
+                f"sqlite:///file:{self.path}?mode=ro&uri=true",
+                connect_args={"check_same_thread": False},
+            )
+            old = self._engine
+            self._engine = engine
+            self.version = version
+            # 새로 만들어지는 세션부터 새 스냅샷을 봄 (세션은 session() 에서 엔진을 지정해 만듦)
+            if old is not None:
+                old.dispose()
+
+    def _close(self) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+        self._engine = None
+        self.version = None
+
+    def session(self):
+        """스냅샷이 있으면 세션, 없으면 None"""
+        self._refresh()
+        engine = self._engine
+        if engine is None:
+            return None
+        if self.Session.registry.has():
+            session = self.Session()
+            if session.bind is engine:
+                return session
+            # 이 스레드에 이전 스냅샷 세션이 남아 있음 → 버리고 새 엔진으로
+            self.Session.remove()
+        return self.Session(bind=engine)
+
+    def remove(self) -> None:
+        self.Session.remove()
+
+
+def read_session():
+    """분석용 읽기 세션: 미러가 켜져 있고 스냅샷이 있으면 미러, 아니면 기본 db.session"""
+    if has_app_context():
+        mirror = current_app.extensions.get("analytics_mirror")
+        if mirror is not None:
+            session = mirror.session()
+            if session is not None:
+                return session
+    return db.session
+
+
+def init_app(app) -> None:
+    path = app.config.get("ANALYTICS_MIRROR_PATH")
+    if not path:
+        return
+
+    mirror = AnalyticsMirror(path, check_interval=app.config.get("ANALYTICS_MIRROR_CHECK_INTERVAL", 1.0))
+    app.extensions["analytics_mirror"] = mirror
+
+    @app.teardown_appcontext
+    def _remove_mirror_session(exc):
+        mirror.remove()
@@ -0,0 +1,116 @@
+# 앱 전체 응답 계층: 빠른 JSON 직렬화(orjson) + 응답 압축(gzip/brotli)
+import gzip
+import json
+
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:  # 선택 의존성: 없으면 표준 json 으로 동작
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # 선택 의존성: 없으면 gzip 만 사용
+    import brotli
+except ImportError:
+    brotli = None
+
+# 압축 대상 mimetype (HTML/텍스트는 요청 값이 반영될 수 있어 BREACH 위험 → 압축하지 않음)
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "text/css",
+    "application/javascript",
+    "text/javascript",
+}
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson 이 설치돼 있으면 orjson 으로, 아니면 Flask 기본 인코더로 직렬화"""
+
+    def _orjson_option(self) -> int:
+        # datetime/date 는 orjson 기본(ISO 8601) 대신 Flask 와 같은 http_date 형식으로 (self.default)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode("utf-8")
+        except TypeError:
+            # 64bit 초과 정수 등 orjson 이 못 다루는 값은 기본 인코더로
+            return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._orjson_option())
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def _pick_encoding() -> str | None:
+    accept = request.accept_encodings
+    if brotli is not None and accept["br"]:
+        return "br"
+    if accept["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_body(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=min(level, 9))
+
+
+def compress_response(response):
+    min_size = current_app.config.get("COMPRESS_MIN_SIZE", 1024)
+    level = current_app.config.get("COMPRESS_LEVEL", 6)
+
+    if (
+        not current_app.config.get("COMPRESS_ENABLED", True)
+        or response.direct_passthrough
+        or response.is_streamed
+        or not (200 <= response.status_code < 300)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    encoding = _pick_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(compress_body(data, encoding, level))
+    response.headers["Content-Encoding"] = encoding
+
+    # 압축된 표현은 바이트가 달라지므로 ETag 를 약한 비교용으로 바꿈
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
+
+
+# 벤치마크용: 표준 json 직렬화 (jsonify 기본 동작과 같은 옵션)
+def stdlib_dumps(obj) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=True, sort_keys=True, default=DefaultJSONProvider.default
+    ).encode("utf-8")
@@ -0,0 +1,101 @@
+# 동기 코드(Flask 요청 스레드 / 작업 워커)에서 코루틴을 실행하는 공용 이벤트 루프
+# - 백그라운드 스레드 하나에서 루프 하나를 계속 돌림 → 호출마다 루프를 만들고 정리하는 비용 없음
+# - 루프에 묶이는 자원(MCP 세션 풀, httpx AsyncClient)을 모든 요청 스레드가 같이 씀
+# - 루프 스레드 안에서 submit() 을 부르면 자기 자신을 기다리며 멈추므로 RuntimeError (코루틴에서는 arun 사용)
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Awaitable, Optional
+
+
+class AsyncBridge:
+    def __init__(self, name: str = "async-bridge"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "errors": 0, "timeouts": 0}
+        self._inflight = 0
+        self._elapsed_total = 0.0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run, args=(loop,), name=self.name, daemon=True)
+                self._thread.start()
+                self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """코루틴을 공용 루프에서 실행하고 결과를 기다림. timeout 이 지나면 코루틴을 취소하고 TimeoutError"""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("이벤트 루프 스레드 안에서는 submit() 대신 await 를 사용해야 합니다.")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        start = time.perf_counter()
+        with self._stats_lock:
+            self._stats["submitted"] += 1
+            self._inflight += 1
+        outcome = "completed"
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()
+            outcome = "timeouts"
+            raise TimeoutError(f"비동기 작업 시간 초과 ({timeout}s)")
+        except BaseException:
+            outcome = "errors"
+            raise
+        finally:
+            with self._stats_lock:
+                self._stats[outcome] += 1
+                self._inflight -= 1
+                self._elapsed_total += time.perf_counter() - start
+
+    async def arun(self, coro: Awaitable) -> Any:
+        """다른 이벤트 루프의 코루틴에서 공용 루프 작업을 기다림 (이미 공용 루프면 그대로 await)"""
+        if asyncio.get_running_loop() is self.loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def spawn(self, coro: Awaitable) -> Future:
+        """기다리지 않는 백그라운드 작업 (헬스 체크 등)"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            s = dict(self._stats)
+            done = s["completed"] + s["errors"] + s["timeouts"]
+            return {
+                "running": self._loop is not None,
+                "inflight": self._inflight,
+                **s,
+                "avg_ms": round(self._elapsed_total / done * 1000, 2) if done else None,
+            }
+
+
+_bridge = AsyncBridge()
+
+
+def get_bridge() -> AsyncBridge:
+    return _bridge
+
+
+def submit(coro: Awaitable, timeout: Optional[float] = None) -> Any:
+    return _bridge.submit(coro, timeout)
@@ -0,0 +1,162 @@
+# 서킷 브레이커 (LLM / MCP 호출 보호)
+# - closed: 평소 상태. 연속 실패가 failure_threshold 회 이상이거나,
+#   최근 window 개 호출 중 slow_call_seconds 보다 느린 호출 비율이 slow_call_rate 이상이면 open
+# - open: reset_timeout 초 동안 호출하지 않고 바로 실패 (대기 스레드가 쌓이지 않게)
+# - half_open: reset_timeout 이 지나면 시험 호출 half_open_max 개만 통과 → 성공하면 closed, 실패/느리면 다시 open
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """브레이커가 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        slow_call_seconds: Optional[float] = None,
+        slow_call_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        half_open_max: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_call_seconds = slow_call_seconds  # None 이면 지연 기준 없음
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.half_open_max = half_open_max
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._consecutive_failures = 0
+        self._recent: deque = deque(maxlen=window)  # (성공 여부, 느린 호출 여부)
+
+        self.opened = 0        # open 으로 바뀐 횟수
+        self.rejected = 0      # 열려 있어서 바로 실패시킨 호출
+        self.last_reason: Optional[str] = None
+
+    # ===== 상태 =====
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.time())
+
+    def is_open(self) -> bool:
+        """호출해도 바로 거절될 상태인지 (시험 호출 자리를 차지하지 않음)"""
+        with self._lock:
+            state = self._current_state(time.time())
+            return state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_max)
+
+    def allow(self) -> bool:
+        """호출 전에 확인. True 면 끝난 뒤 반드시 record() 호출"""
+        with self._lock:
+            state = self._current_state(time.time())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, ok: bool, elapsed: float) -> None:
+        slow = self.slow_call_seconds is not None and elapsed >= self.slow_call_seconds
+        with self._lock:
+            state = self._current_state(time.time())
+            if state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if ok and not slow:
+                    self._close()
+                else:
+                    self._open("half-open 시험 호출 실패" if not ok else f"half-open 시험 호출 지연 {elapsed:.1f}s")
+                return
+
+            self._recent.append((ok, slow))
+            self._consecutive_failures = 0 if ok else self._consecutive_failures + 1
+            if state != CLOSED:
+                return
+            if self._consecutive_failures >= self.failure_threshold:
+                self._open(f"연속 실패 {self._consecutive_failures}회")
+            elif self.slow_call_seconds is not None and len(self._recent) >= self.min_calls:
+                slow_rate = sum(1 for _, s in self._recent if s) / len(self._recent)
+                if slow_rate >= self.slow_call_rate:
+                    self._open(f"느린 호출 비율 {slow_rate:.0%} (>= {self.slow_call_seconds:.0f}s)")
+
+    def cancel(self) -> None:
+        """allow() 후 결과 없이 취소된 호출 (시험 호출 자리만 반납)"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def _open(self, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = time.time()
+        self._probes = 0
+        self.opened += 1
+        self.last_reason = reason
+        print(f"[Circuit {self.name}] open: {reason} ({self.reset_timeout:.0f}초 후 재시도)")
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._recent.clear()
+        print(f"[Circuit {self.name}] closed")
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            state = self._current_state(now)
+            recent = list(self._recent)
+            return {
+                "name": self.name,
+                "state": state,
+                "retry_in_s": round(max(0.0, self._opened_at + self.reset_timeout - now), 1) if state == OPEN else 0.0,
+                "consecutive_failures": self._consecutive_failures,
+                "recent_calls": len(recent),
+                "recent_failure_rate": round(sum(1 for ok, _ in recent if not ok) / len(recent), 3) if recent else None,
+                "recent_slow_rate": round(sum(1 for _, s in recent if s) / len(recent), 3) if recent else None,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "last_reason": self.last_reason,
+                "failure_threshold": self.failure_threshold,
+                "slow_call_seconds": self.slow_call_seconds,
+                "reset_timeout": self.reset_timeout,
+            }
+
+
+_registry: dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """이름별 공용 브레이커 (같은 업스트림을 쓰는 클라이언트끼리 상태 공유). kwargs 는 처음 만들 때만 사용"""
+    with _registry_lock:
+        breaker = _registry.get(name)
+        if breaker is None:
+            breaker = _registry[name] = CircuitBreaker(name, **kwargs)
+        return breaker
+
+
+def all_breakers() -> list[CircuitBreaker]:
+    with _registry_lock:
+        return list(_registry.values())
@@ -0,0 +1,153 @@
+# DB 커넥션 풀 설정(프로세스별 프로필) + 풀 지표 수집
+import os
+import threading
+import time
+import weakref
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    """체크아웃 대기 시간/오버플로/타임아웃을 세는 QueuePool"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics_lock = threading.Lock()
+        self._depth = threading.local()
+        self.reset_metrics()
+
+    def reset_metrics(self) -> None:
+        with self._metrics_lock:
+            self.checkouts = 0
+            self.wait_time_total = 0.0
+            self.wait_time_max = 0.0
+            self.overflow_checkouts = 0
+            self.timeouts = 0
+
+    def _do_get(self):
+        # QueuePool._do_get 은 내부에서 자기 자신을 재귀 호출하므로 가장 바깥 호출만 계측
+        if getattr(self._depth, "value", 0):
+            return super()._do_get()
+
+        start = time.perf_counter()
+        self._depth.value = 1
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            with self._metrics_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            self._depth.value = 0
+        waited = time.perf_counter() - start
+
+        with self._metrics_lock:
+            self.checkouts += 1
+            self.wait_time_total += waited
+            self.wait_time_max = max(self.wait_time_max, waited)
+            if self.overflow() > 0:
+                self.overflow_checkouts += 1
+        return conn
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.drivername.startswith("sqlite") and url.database in (None, "", ":memory:")
+
+
+def configure(app, pool_profile: str = "web") -> None:
+    """db.init_app() 전에 호출: 프로필(web/mcp)에 맞는 SQLALCHEMY_ENGINE_OPTIONS 구성"""
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+
+    options.setdefault("query_cache_size", app.config.get("DB_QUERY_CACHE_SIZE", 500))
+
+    # 인메모리 SQLite 는 Flask-SQLAlchemy 가 StaticPool 을 쓰므로 풀 옵션 생략
+    if not _is_memory_sqlite(url):
+        profile = app.config.get("DB_POOL_PROFILES", {}).get(pool_profile, {})
+        options.setdefault("poolclass", TimedQueuePool)
+        options.setdefault("pool_size", profile.get("pool_size", 5))
+        options.setdefault("max_overflow", profile.get("max_overflow", 10))
+        options.setdefault("pool_timeout", profile.get("pool_timeout", 30))
+        options.setdefault("pool_recycle", app.config.get("DB_POOL_RECYCLE", 1800))
+        options.setdefault("pool_pre_ping", app.config.get("DB_POOL_PRE_PING", True))
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    app.config["DB_POOL_PROFILE"] = pool_profile
+
+
+def init_app(app, db) -> None:
+    """db.init_app() 후에 호출: Oracle 문장 캐시 설정 + fork 시 풀 분리"""
+    with app.app_context():
+        engine = db.engine
+
+    stmt_cache_size = app.config.get("DB_STMT_CACHE_SIZE")
+    if stmt_cache_size and engine.dialect.name == "oracle":
+        @event.listens_for(engine, "connect")
+        def _set_stmt_cache(dbapi_connection, connection_record):
+            dbapi_connection.stmtcachesize = stmt_cache_size
+
+    # 프로세스(gunicorn worker 등)가 fork 되면 부모의 커넥션을 공유하지 않도록 풀을 새로 만듦
+    _dispose_after_fork(engine)
+
+    app.extensions["db_pool_engine"] = engine
+
+
+_fork_engines: "weakref.WeakSet" = weakref.WeakSet()
+_fork_hook_registered = False
+_fork_lock = threading.Lock()
+
+
+def _dispose_after_fork(engine) -> None:
+    """fork 훅은 프로세스당 한 번만 등록하고, 엔진은 약한 참조로 모아 둠 (create_app 을 여러 번 불러도 훅이 쌓이지 않음)"""
+    global _fork_hook_registered
+    if not hasattr(os, "register_at_fork"):
+        return
+    with _fork_lock:
+        _fork_engines.add(engine)
+        if not _fork_hook_registered:
+            os.register_at_fork(after_in_child=_dispose_engines_in_child)
+            _fork_hook_registered = True
+
+
+def _dispose_engines_in_child() -> None:
+    for engine in list(_fork_engines):
+        engine.dispose(close=False)
+
+
+def get_pool_stats(app) -> dict:
+    engine = app.extensions.get("db_pool_engine")
+    if engine is None:
+        return {"enabled": False}
+
+    pool = engine.pool
+    stats = {
+        "enabled": True,
+        "profile": app.config.get("DB_POOL_PROFILE"),
+        "pool_class": type(pool).__name__,
+        "status": pool.status(),
+    }
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+        })
+
+    if isinstance(pool, TimedQueuePool):
+        with pool._metrics_lock:
+            checkouts = pool.checkouts
+            stats.update({
+                "checkouts": checkouts,
+                "overflow_checkouts": pool.overflow_checkouts,
+                "timeouts": pool.timeouts,
+                "wait_ms_total": round(pool.wait_time_total * 1000, 3),
+                "wait_ms_avg": round(pool.wait_time_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_ms_max": round(pool.wait_time_max * 1000, 3),
+            })
+    return stats
@@ -0,0 +1,157 @@
+# LLM 백엔드(파드) 여러 개 관리: 부하 분산 + 상태 추적 + 헤징 지연 계산
+# - 선택: 정상 백엔드 중 처리 중 요청(outstanding)이 가장 적은 곳 (동률이면 최근 지연이 짧은 곳)
+# - 연속 실패가 eject_after 회 이상이면 eject_seconds 동안 제외, 이후 요청 하나로 다시 확인(half-open)
+# - 헤징 지연 = 최근 성공 응답 지연의 p95 (표본이 적으면 기본값)
+import random
+import threading
+import time
+from collections import deque
+from typing import Iterable, Optional
+
+
+def _percentile(values, p: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+class Backend:
+    def __init__(self, url: str, window: int = 200):
+        self.url = url
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.latencies: deque = deque(maxlen=window)
+
+    def healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def to_dict(self, now: float) -> dict:
+        p50 = _percentile(self.latencies, 50)
+        p95 = _percentile(self.latencies, 95)
+        return {
+            "url": self.url,
+            "healthy": self.healthy(now),
+            "ejected_for_s": round(max(0.0, self.ejected_until - now), 1),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "consecutive_failures": self.consecutive_failures,
+            "ejections": self.ejections,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "latency_ms_p50": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_ms_p95": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class BackendPool:
+    def __init__(
+        self,
+        urls: Iterable[str],
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        hedge_enabled: bool = False,
+        hedge_delay: float = 3.0,
+        hedge_min_delay: float = 0.5,
+        hedge_min_samples: int = 20,
+    ):
+        self.backends = [Backend(u) for u in urls if u]
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.hedge_enabled = hedge_enabled
+        self.default_hedge_delay = hedge_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=500)  # 전체 백엔드의 최근 성공 지연 (헤징 기준)
+
+    def __len__(self) -> int:
+        return len(self.backends)
+
+    def pick(self, exclude: Iterable[Backend] = ()) -> Optional[Backend]:
+        """요청을 보낼 백엔드 선택 + outstanding 증가 (끝나면 release 필수)"""
+        exclude = set(exclude)
+        now = time.time()
+        with self._lock:
+            candidates = [b for b in self.backends if b not in exclude and b.healthy(now)]
+            if not candidates:
+                if exclude:
+                    return None  # 헤징/재시도용 두 번째 백엔드가 없음
+                # 전부 제외 상태면 가장 먼저 복귀할 백엔드로 (완전 중단보다는 시도)
+                candidates = sorted(self.backends, key=lambda b: b.ejected_until)[:1]
+            if not candidates:
+                return None
+
+            def score(b: Backend):
+                p50 = _percentile(b.latencies, 50)
+                return (b.outstanding, p50 if p50 is not None else 0.0, random.random())
+
+            backend = min(candidates, key=score)
+            backend.outstanding += 1
+            backend.requests += 1
+            return backend
+
+    def release(self, backend: Backend, ok: bool, elapsed: float, retryable_failure: bool = True) -> None:
+        with self._lock:
+            backend.outstanding -= 1
+            if ok:
+                backend.consecutive_failures = 0
+                backend.latencies.append(elapsed)
+                self._recent.append(elapsed)
+                return
+
+            backend.errors += 1
+            if not retryable_failure:
+                return  # 4xx 등 요청 자체의 문제는 백엔드 상태와 무관
+            backend.consecutive_failures += 1
+            now = time.time()
+            if backend.consecutive_failures >= self.eject_after and backend.healthy(now):
+                backend.ejected_until = now + self.eject_seconds
+                backend.ejections += 1
+                backend.consecutive_failures = self.eject_after - 1  # 복귀 후 한 번 더 실패하면 바로 다시 제외
+                print(f"[LLM Backends] {backend.url} 제외 ({self.eject_seconds:.0f}초)")
+
+    def cancel(self, backend: Backend) -> None:
+        """헤징에서 진 요청 취소 → 성공/실패로 치지 않음"""
+        with self._lock:
+            backend.outstanding -= 1
+
+    def healthy_count(self) -> int:
+        now = time.time()
+        with self._lock:
+            return sum(1 for b in self.backends if b.healthy(now))
+
+    def should_hedge(self) -> bool:
+        return self.hedge_enabled and self.healthy_count() > 1
+
+    def hedge_delay(self) -> float:
+        with self._lock:
+            return self._hedge_delay_unlocked()
+
+    def _hedge_delay_unlocked(self) -> float:
+        if len(self._recent) < self.hedge_min_samples:
+            return self.default_hedge_delay
+        return max(self.hedge_min_delay, _percentile(self._recent, 95))
+
+    def record_hedge(self, sent_to: Backend, winner: Optional[Backend]) -> None:
+        with self._lock:
+            sent_to.hedges_sent += 1
+            if winner is sent_to:
+                sent_to.hedges_won += 1
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {
+                "hedge_enabled": self.hedge_enabled,
+                "hedge_delay_ms": round(self._hedge_delay_unlocked() * 1000, 1),
+                "backends": [b.to_dict(now) for b in self.backends],
+            }
@@ -0,0 +1,174 @@
+# LLM 요청 마이크로 배칭
+# - window_ms 안에 들어온 요청을 max_batch 개까지 모아 배치 엔드포인트로 한 번에 보내고, 결과를 각 호출자에게 돌려줌
+# - 배치 엔드포인트 형식: POST {"requests": [payload, ...]} → {"results": [{"text": ...} 또는 {"error": ...}, ...]}
+# - 배치 엔드포인트가 없으면(404/405/501) 이후로는 요청별 호출로 대체
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+import requests
+
+UNSUPPORTED_STATUS = (404, 405, 501)
+
+
+class _Item:
+    __slots__ = ("payload", "timeout", "future", "enqueued_at")
+
+    def __init__(self, payload: dict, timeout: Tuple[float, float]):
+        self.payload = payload
+        self.timeout = timeout
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        client,
+        batch_url: str,
+        single_call: Callable[[dict, Tuple[float, float]], Tuple[str, bool]],
+        window_ms: float = 20.0,
+        max_batch: int = 8,
+        max_inflight_batches: int = 4,
+    ):
+        self.client = client
+        self.batch_url = batch_url
+        self.single_call = single_call  # 배치를 못 쓸 때 요청별 호출
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.supported = True
+
+        self._queue: "queue.Queue[_Item]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight_batches, thread_name_prefix="llm-batch")
+        self._thread = threading.Thread(target=self._collect_loop, name="llm-batcher", daemon=True)
+        self._thread.start()
+
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "batches": 0, "batched_items": 0, "single_calls": 0, "batch_errors": 0}
+        self._wait_total = 0.0
+
+    def submit(self, payload: dict, timeout: Tuple[float, float]) -> Future:
+        """Future[(텍스트, 정상 여부)] 반환"""
+        item = _Item(payload, timeout)
+        with self._lock:
+            self._stats["submitted"] += 1
+        self._queue.put(item)
+        return item.future
+
+    def generate(self, payload: dict, timeout: Tuple[float, float]) -> Tuple[str, bool]:
+        return self.submit(payload, timeout).result()
+
+    # ===== 수집/전송 =====
+
+    def _collect_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            items = [first]
+            deadline = time.perf_counter() + self.window
+            while len(items) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            now = time.perf_counter()
+            with self._lock:
+                self._wait_total += sum(now - it.enqueued_at for it in items)
+
+            # 모델 버전이 다른 요청은 같은 배치로 보내지 않음
+            groups: dict[str, list[_Item]] = {}
+            for it in items:
+                groups.setdefault(it.payload.get("model_version", "final"), []).append(it)
+            for group in groups.values():
+                self._executor.submit(self._dispatch, group)
+
+    def _dispatch(self, items: list[_Item]) -> None:
+        if len(items) == 1 or not self.supported:
+            self._run_each(items)
+            return
+
+        start = time.time()
+        try:
+            results = self._post_batch(items)
+        except Exception as e:
+            print(f"[LLM Batch] batch request error: {e}")
+            with self._lock:
+                self._stats["batch_errors"] += 1
+            results = None
+
+        if results is None:
+            # 배치 엔드포인트 미지원 / 실패 → 요청별 호출
+            self._run_each(items)
+            return
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["batched_items"] += len(items)
+        elapsed = time.time() - start
+        for it, result in zip(items, results):
+            self.client._record("ok" if result[1] else "errors", elapsed)
+            if not it.future.done():
+                it.future.set_result(result)
+
+    def _run_each(self, items: list[_Item]) -> None:
+        # 첫 요청은 현재 스레드에서, 나머지는 병렬로
+        for it in items[1:]:
+            self._executor.submit(self._run_single, it)
+        self._run_single(items[0])
+
+    def _run_single(self, item: _Item) -> None:
+        with self._lock:
+            self._stats["single_calls"] += 1
+        try:
+            item.future.set_result(self.single_call(item.payload, item.timeout))
+        except Exception as e:
+            item.future.set_exception(e)
+
+    def _post_batch(self, items: list[_Item]) -> Optional[list[Tuple[str, bool]]]:
+        connect = max(it.timeout[0] for it in items)
+        read = max(it.timeout[1] for it in items)
+
+        response = self.client.session.post(
+            self.batch_url,
+            json={"requests": [it.payload for it in items]},
+            headers=self.client.headers(self.batch_url),
+            timeout=(connect, read),
+        )
+        if response.status_code in UNSUPPORTED_STATUS:
+            print(f"[LLM Batch] 배치 엔드포인트 없음(status={response.status_code}) → 요청별 호출로 전환")
+            self.supported = False
+            return None
+        if not (200 <= response.status_code < 300):
+            raise requests.HTTPError(f"status={response.status_code}")
+
+        results = response.json().get("results") or []
+        if len(results) != len(items):
+            raise ValueError(f"배치 응답 개수 불일치 ({len(results)} != {len(items)})")
+
+        out = []
+        for r in results:
+            if r.get("error"):
+                out.append(("AI 서버 처리 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.", False))
+            else:
+                out.append(((r.get("text", "") or "").strip(), True))
+        return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+            submitted = s["submitted"]
+            return {
+                "batch_url": self.batch_url,
+                "supported": self.supported,
+                "window_ms": self.window * 1000,
+                "max_batch": self.max_batch,
+                **s,
+                "avg_batch_size": round(s["batched_items"] / s["batches"], 2) if s["batches"] else None,
+                "avg_queue_wait_ms": round(self._wait_total / submitted * 1000, 2) if submitted else None,
+                "queue_depth": self._queue.qsize(),
+            }
@@ -0,0 +1,549 @@
+# RunPod LLM 공용 클라이언트 (웹 서버 / 에이전트 / MCP 서버가 함께 사용)
+# - 프로세스당 하나의 keep-alive 커넥션 풀 + 재시도(backoff) 정책 + 타임아웃 + 페이로드 구성 + 지표
+# - 동기(requests) / 비동기(httpx) 두 가지 호출 방식
+# - 백엔드 여러 개면 처리 중 요청이 가장 적은 곳으로 보내고, 실패가 이어지는 백엔드는 잠시 제외
+# - 서킷 브레이커: 연속 실패 / 지연 SLO 위반이면 잠시 호출하지 않고 바로 실패 (half-open 시험 호출로 복구)
+# - 헤징(선택): 첫 백엔드가 최근 p95 지연 안에 응답하지 않으면 다른 백엔드에도 같은 요청을 보내고 먼저 온 응답 사용
+import asyncio
+import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from pybo.circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+from pybo.llm_backends import Backend, BackendPool
+
+STOP_TOKENS = ["Observation:", "Observation", "###"]
+RETRY_STATUS = (429, 500, 502, 503, 504, 524)  # 524(Proxy Timeout) 포함
+
+MSG_NO_URL = "RUNPOD_API_URL이 설정되지 않았습니다."
+MSG_TIMEOUT = "AI 서버 응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요."
+MSG_REQUEST_ERROR = "AI 서버 통신 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
+MSG_UNKNOWN_ERROR = "AI 서버 처리 중 알 수 없는 오류가 발생했습니다."
+MSG_CIRCUIT_OPEN = "AI 서버 장애로 요청을 잠시 중단했습니다. 잠시 후 다시 시도해주세요."
+
+
+def _status_message(status_code: int) -> str:
+    return f"AI 서버 오류(status={status_code})로 답변 생성에 실패했습니다. 잠시 후 다시 시도해주세요."
+
+
+class LLMClient:
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        stream_url: Optional[str] = None,
+        pool_maxsize: int = 20,
+        retries: int = 3,
+        backoff_factor: float = 0.6,
+        timeout: Tuple[float, float] = (10.0, 180.0),
+        batch_url: Optional[str] = None,
+        batch_window_ms: float = 20.0,
+        batch_max_size: int = 8,
+        urls: Optional[Iterable[str]] = None,
+        hedge_enabled: bool = False,
+        hedge_delay: float = 3.0,
+        hedge_min_delay: float = 0.5,
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        urls = [u for u in (urls or []) if u] or ([url] if url else [])
+        url = urls[0] if urls else None
+        self.url = url
+        self.api_key = api_key
+        # 토큰 스트리밍 엔드포인트 (기본은 같은 URL 에 "stream": true)
+        self.stream_url = stream_url or url
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+        # 백엔드 풀 (부하 분산 / 제외 / 헤징 기준 지연)
+        self.backends = BackendPool(
+            urls,
+            eject_after=eject_after,
+            eject_seconds=eject_seconds,
+            hedge_enabled=hedge_enabled,
+            hedge_delay=hedge_delay,
+            hedge_min_delay=hedge_min_delay,
+        )
+        # 헤징용 스레드 (동기 호출은 중간에 끊을 수 없어 진 쪽은 끝날 때까지 여기서 돌고 결과는 버림)
+        self._hedge_executor = ThreadPoolExecutor(max_workers=pool_maxsize * 2, thread_name_prefix="llm-hedge")
+        # 빈 워커 수 (없으면 헤징하지 않음 → 큐에서 기다리다 지연 기준을 넘겨 헤징이 나가는 일 방지)
+        self._hedge_slots = threading.BoundedSemaphore(pool_maxsize * 2)
+
+        self.breaker = breaker or get_breaker("llm")
+
+        # 이벤트 루프마다 AsyncClient 하나 (httpx 클라이언트는 만든 루프에서만 사용 가능)
+        self._async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+        # 마이크로 배칭 (batch_url 지정 시에만)
+        self.batcher = None
+        if batch_url and url:
+            from pybo.llm_batcher import MicroBatcher
+
+            self.batcher = MicroBatcher(
+                self, batch_url, self._generate_single,
+                window_ms=batch_window_ms, max_batch=batch_max_size,
+            )
+
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "requests": 0, "ok": 0, "errors": 0, "timeouts": 0,
+            "async_requests": 0, "async_retries": 0, "async_clients": 0,
+            "failovers": 0, "hedged": 0, "hedge_wins": 0, "hedge_skipped": 0,
+            "latency_total": 0.0, "latency_max": 0.0,
+        }
+
+    # ===== 요청 구성 =====
+
+    @staticmethod
+    def build_payload(
+        instruction: str,
+        input_text: str,
+        model_version: str = "final",
+        max_new_tokens: int = 256,
+        temperature: float = 0.3,
+        stream: bool = False,
+    ) -> dict:
+        payload = {
+            "instruction": instruction,
+            "input": input_text,
+            "model_version": model_version,
+            "max_new_tokens": max_new_tokens,
+            "temperature": temperature,
+            "stop": STOP_TOKENS,  # 중단 토큰
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def headers(self, url: Optional[str] = None) -> dict:
+        url = url or self.url or ""
+        headers = {"Content-Type": "application/json"}
+        # Proxy URL(8000번 포트 등)인 경우 보통 인증 헤더가 필요 없으므로 구분하여 처리
+        if self.api_key and "proxy.runpod.net" not in url:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _count(self, name: str) -> None:
+        with self._metrics_lock:
+            self._metrics[name] += 1
+
+    def _record(self, outcome: str, elapsed: float, is_async: bool = False) -> None:
+        with self._metrics_lock:
+            m = self._metrics
+            m["requests"] += 1
+            if is_async:
+                m["async_requests"] += 1
+            m[outcome] += 1
+            m["latency_total"] += elapsed
+            m["latency_max"] = max(m["latency_max"], elapsed)
+
+    # ===== 동기 호출 =====
+
+    def generate(self, payload: dict, timeout: Optional[Tuple[float, float]] = None) -> Tuple[str, bool]:
+        """(텍스트, 정상 응답 여부). 실패 시 텍스트는 사용자 안내 문구"""
+        if not self.url:
+            return MSG_NO_URL, False
+
+        if not self.breaker.allow():
+            return MSG_CIRCUIT_OPEN, False
+
+        timeout = timeout or self.timeout
+        start, ok = time.time(), False
+        try:
+            # 배치 엔드포인트가 없다고 확인되면 배처를 거치지 않고 바로 호출
+            if self.batcher is not None and self.batcher.supported:
+                text, ok = self.batcher.generate(payload, timeout)
+            else:
+                text, ok = self._generate_single(payload, timeout)
+            return text, ok
+        finally:
+            self.breaker.record(ok, time.time() - start)
+
+    def _generate_single(self, payload: dict, timeout: Tuple[float, float]) -> Tuple[str, bool]:
+        if self.backends.should_hedge():
+            return self._generate_hedged(payload, timeout)
+        return self._post_with_failover(self.backends.pick(), payload, timeout)
+
+    def _post_with_failover(self, backend: Backend, payload: dict, timeout: Tuple[float, float]) -> Tuple[str, bool]:
+        text, ok, retryable = self._post(backend, payload, timeout)
+        if not ok and retryable:
+            # 다른 정상 백엔드로 한 번만 넘김
+            other = self.backends.pick(exclude=[backend])
+            if other is not None:
+                self._count("failovers")
+                text, ok, _ = self._post(other, payload, timeout)
+        return text, ok
+
+    def _generate_hedged(self, payload: dict, timeout: Tuple[float, float]) -> Tuple[str, bool]:
+        """헤징: primary 가 실제로 시작한 뒤 hedge_delay 안에 응답이 없으면 다른 백엔드로 한 번 더.
+        헤징용 스레드에 빈 워커가 없으면 헤징하지 않음 (포화 상태에서 백엔드 부하를 두 배로 만들지 않음).
+        동기 호출은 중간에 끊을 수 없어 진 쪽 요청은 끝날 때까지 돌고 결과는 버림"""
+        results: "queue.Queue" = queue.Queue()
+        primary = self.backends.pick()
+        if not self._hedge_slots.acquire(blocking=False):
+            self._count("hedge_skipped")
+            return self._post_with_failover(primary, payload, timeout)
+
+        started = queue.Queue(maxsize=1)
+
+        def run(backend: Backend, started_q: Optional["queue.Queue"] = None) -> None:
+            try:
+                if started_q is not None:
+                    started_q.put(time.monotonic())
+                results.put((backend, self._post(backend, payload, timeout)))
+            finally:
+                self._hedge_slots.release()
+
+        self._hedge_executor.submit(run, primary, started)
+        # 지연 기준은 primary 가 워커에서 실제로 시작한 시점부터
+        started_at = started.get()
+        wait = max(0.0, self.backends.hedge_delay() - (time.monotonic() - started_at))
+        try:
+            backend, (text, ok, retryable) = results.get(timeout=wait)
+        except queue.Empty:
+            backend = None
+
+        if backend is not None:
+            # p95 안에 응답 → 헤징 없음 (빨리 실패했으면 다른 백엔드로 한 번 넘김)
+            if not ok and retryable:
+                other = self.backends.pick(exclude=[primary])
+                if other is not None:
+                    self._count("failovers")
+                    text, ok, _ = self._post(other, payload, timeout)
+            return text, ok
+
+        secondary = self.backends.pick(exclude=[primary])
+        if secondary is None or not self._hedge_slots.acquire(blocking=False):
+            if secondary is not None:
+                self._count("hedge_skipped")
+            backend, (text, ok, _) = results.get()
+            return text, ok
+
+        self._count("hedged")
+        self._hedge_executor.submit(run, secondary)
+        # 먼저 성공한 응답 사용 (첫 응답이 실패면 나머지 하나를 기다림)
+        backend, (text, ok, _) = results.get()
+        if not ok:
+            backend, (text, ok, _) = results.get()
+        winner = backend if ok else None
+        self.backends.record_hedge(secondary, winner)
+        if winner is secondary:
+            self._count("hedge_wins")
+        return text, ok
+
+    def _post(self, backend: Backend, payload: dict, timeout: Tuple[float, float]) -> Tuple[str, bool, bool]:
+        """(텍스트, 정상 여부, 다른 백엔드로 다시 보낼 만한 실패인지). 끝나면 backend 반환"""
+        start = time.time()
+        ok, retryable = False, True
+        print(f">>> [LLM Request] Starting request to {backend.url} (timeout={timeout})")
+        try:
+            response = self.session.post(backend.url, json=payload, headers=self.headers(backend.url), timeout=timeout)
+            elapsed = time.time() - start
+            print(f">>> [LLM Response] Received response with status {response.status_code}")
+
+            if not (200 <= response.status_code < 300):
+                print(f"[LLM ERROR] status={response.status_code}, body={response.text[:300]}")
+                self._record("errors", elapsed)
+                # 4xx(429 제외)는 요청 자체의 문제 → 백엔드 탓 아님
+                retryable = response.status_code >= 500 or response.status_code == 429
+                return _status_message(response.status_code), False, retryable
+
+            print(f"--- AI 추론 완료 (소요시간: {elapsed:.2f}초) ---")
+            self._record("ok", elapsed)
+            ok = True
+            return (response.json().get("text", "") or "").strip(), True, False
+
+        except requests.exceptions.Timeout:
+            print("[LLM TIMEOUT] AI 서버 응답 지연")
+            self._record("timeouts", time.time() - start)
+            return MSG_TIMEOUT, False, True
+        except requests.exceptions.RequestException as e:
+            print(f"[LLM REQUEST ERROR] {e}")
+            self._record("errors", time.time() - start)
+            return MSG_REQUEST_ERROR, False, True
+        except Exception as e:
+            print(f"[LLM UNKNOWN ERROR] {e}")
+            self._record("errors", time.time() - start)
+            retryable = False
+            return MSG_UNKNOWN_ERROR, False, False
+        finally:
+            self.backends.release(backend, ok, time.time() - start, retryable_failure=retryable)
+
+    def open_stream(self, payload: dict, timeout: Optional[Tuple[float, float]] = None) -> requests.Response:
+        """스트리밍 응답 열기 (호출한 쪽에서 iter_lines 후 반드시 close). 브레이커가 열려 있으면 CircuitOpenError"""
+        if not self.breaker.allow():
+            raise CircuitOpenError(MSG_CIRCUIT_OPEN)
+
+        if self.stream_url != self.url or len(self.backends) < 2:
+            url, backend = self.stream_url, None
+        else:
+            backend = self.backends.pick()
+            url = backend.url
+
+        start = time.time()
+        try:
+            response = self.session.post(
+                url,
+                json=payload,
+                headers=self.headers(url),
+                timeout=timeout or self.timeout,
+                stream=True,
+            )
+        except BaseException:
+            self.breaker.record(False, time.time() - start)
+            if backend is not None:
+                self.backends.release(backend, False, time.time() - start)
+            raise
+        # 스트림은 첫 응답(헤더)까지만 백엔드/브레이커 상태에 반영
+        self.breaker.record(response.status_code < 500, time.time() - start)
+        if backend is not None:
+            self.backends.release(backend, response.status_code < 500, time.time() - start)
+        return response
+
+    def switch_model(self, data: dict, timeout: float = 60.0) -> requests.Response:
+        """모든 백엔드의 모델 전환. 하나라도 실패하면 그 응답을 반환"""
+        result = None
+        for backend in self.backends.backends:
+            url = backend.url.replace("/generate", "/switch_model")
+            response = self.session.post(url, json=data, headers=self.headers(url), timeout=timeout)
+            if result is None or not (200 <= response.status_code < 300):
+                result = response
+        return result
+
+    # ===== 비동기 호출 (그래프/에이전트) =====
+
+    def _async_client(self):
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.pool_maxsize, max_keepalive_connections=self.pool_maxsize),
+            )
+            self._async_clients[loop] = client
+            with self._metrics_lock:
+                self._metrics["async_clients"] += 1
+        return client
+
+    async def agenerate(self, payload: dict, timeout: Optional[Tuple[float, float]] = None) -> Tuple[str, bool]:
+        """generate() 의 asyncio 버전 (재시도/백엔드 선택/헤징 정책 동일, 헤징에서 진 요청은 취소)"""
+        if not self.url:
+            return MSG_NO_URL, False
+
+        if not self.breaker.allow():
+            return MSG_CIRCUIT_OPEN, False
+
+        timeout = timeout or self.timeout
+        start = time.time()
+        try:
+            if self.batcher is not None and self.batcher.supported:
+                text, ok = await asyncio.wrap_future(self.batcher.submit(payload, timeout))
+            else:
+                text, ok = await self._agenerate_routed(payload, timeout)
+        except asyncio.CancelledError:
+            self.breaker.cancel()  # 호출한 쪽에서 취소 → 업스트림 상태와 무관
+            raise
+        self.breaker.record(ok, time.time() - start)
+        return text, ok
+
+    async def _agenerate_routed(self, payload: dict, timeout: Tuple[float, float]) -> Tuple[str, bool]:
+        primary = self.backends.pick()
+        if not self.backends.should_hedge():
+            text, ok, retryable = await self._apost(primary, payload, timeout)
+        else:
+            first = asyncio.create_task(self._apost(primary, payload, timeout))
+            done, _ = await asyncio.wait({first}, timeout=self.backends.hedge_delay())
+            secondary = None if done else self.backends.pick(exclude=[primary])
+            if secondary is None:
+                text, ok, retryable = await first
+            else:
+                return await self._ahedge(first, primary, secondary, payload, timeout)
+
+        if not ok and retryable:
+            other = self.backends.pick(exclude=[primary])
+            if other is not None:
+                self._count("failovers")
+                text, ok, _ = await self._apost(other, payload, timeout)
+        return text, ok
+
+    async def _ahedge(self, first, primary: Backend, secondary: Backend, payload: dict, timeout) -> Tuple[str, bool]:
+        self._count("hedged")
+        second = asyncio.create_task(self._apost(secondary, payload, timeout))
+        owners = {first: primary, second: secondary}
+        pending = {first, second}
+        winner, result = None, None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    text, ok, _ = task.result()
+                    if ok:
+                        winner, result = owners[task], (text, ok)
+                        break
+                    result = (text, ok)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        self.backends.record_hedge(secondary, winner)
+        if winner is secondary:
+            self._count("hedge_wins")
+        return result
+
+    async def _apost(self, backend: Backend, payload: dict, timeout: Tuple[float, float]) -> Tuple[str, bool, bool]:
+        """_post() 의 asyncio 버전 (같은 백엔드 재시도 포함). 취소되면 백엔드 상태에 반영하지 않음"""
+        import httpx
+
+        connect, read = timeout
+        client = self._async_client()
+        start = time.time()
+        ok, retryable = False, True
+
+        try:
+            for attempt in range(self.retries + 1):
+                last = attempt == self.retries
+                try:
+                    response = await client.post(
+                        backend.url,
+                        json=payload,
+                        headers=self.headers(backend.url),
+                        timeout=httpx.Timeout(read, connect=connect),
+                    )
+                    if response.status_code in RETRY_STATUS and not last:
+                        raise _Retryable()
+                    elapsed = time.time() - start
+                    if not (200 <= response.status_code < 300):
+                        print(f"[LLM ERROR] status={response.status_code}, body={response.text[:300]}")
+                        self._record("errors", elapsed, is_async=True)
+                        retryable = response.status_code >= 500 or response.status_code == 429
+                        return _status_message(response.status_code), False, retryable
+                    self._record("ok", elapsed, is_async=True)
+                    ok = True
+                    return (response.json().get("text", "") or "").strip(), True, False
+
+                except (_Retryable, httpx.ConnectError, httpx.RemoteProtocolError) as e:
+                    if last:
+                        print(f"[LLM REQUEST ERROR] {e}")
+                        self._record("errors", time.time() - start, is_async=True)
+                        return MSG_REQUEST_ERROR, False, True
+                    self._count("async_retries")
+                    await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                except httpx.TimeoutException:
+                    print("[LLM TIMEOUT] AI 서버 응답 지연")
+                    self._record("timeouts", time.time() - start, is_async=True)
+                    return MSG_TIMEOUT, False, True
+                except Exception as e:
+                    print(f"[LLM UNKNOWN ERROR] {e}")
+                    self._record("errors", time.time() - start, is_async=True)
+                    retryable = False
+                    return MSG_UNKNOWN_ERROR, False, False
+
+            return MSG_REQUEST_ERROR, False, True
+        except asyncio.CancelledError:
+            self.backends.cancel(backend)
+            backend = None
+            raise
+        finally:
+            if backend is not None:
+                self.backends.release(backend, ok, time.time() - start, retryable_failure=retryable)
+
+    # ===== 지표 =====
+
+    def stats(self) -> dict:
+        # urllib3 풀별 새 연결 수 / 요청 수 → 연결 재사용률
+        opened, pooled_requests = 0, 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                pooled_requests += pool.num_requests
+
+        with self._metrics_lock:
+            m = dict(self._metrics)
+        requests_ = m.pop("requests")
+        latency_total = m.pop("latency_total")
+        latency_max = m.pop("latency_max")
+        return {
+            "url": self.url,
+            "requests": requests_,
+            **m,
+            "latency_ms_avg": round(latency_total / requests_ * 1000, 1) if requests_ else None,
+            "latency_ms_max": round(latency_max * 1000, 1),
+            "batcher": self.batcher.stats() if self.batcher is not None else None,
+            "backends": self.backends.stats(),
+            "breaker": self.breaker.stats(),
+            "connections_opened": opened,
+            "connection_reuse_ratio": round(1 - opened / pooled_requests, 4) if pooled_requests else None,
+        }
+
+
+class _Retryable(Exception):
+    pass
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """프로세스 공용 클라이언트 (환경변수로 구성)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient(
+                    url=os.getenv("RUNPOD_API_URL"),
+                    # 예: http://pod-a/generate,http://pod-b/generate (비우면 RUNPOD_API_URL 하나)
+                    urls=[u.strip() for u in os.getenv("RUNPOD_API_URLS", "").split(",") if u.strip()],
+                    api_key=os.getenv("RUNPOD_API_KEY"),
+                    stream_url=os.getenv("RUNPOD_STREAM_URL"),
+                    pool_maxsize=int(os.getenv("LLM_POOL_MAXSIZE", "20")),
+                    retries=int(os.getenv("LLM_RETRIES", "3")),
+                    backoff_factor=float(os.getenv("LLM_RETRY_BACKOFF", "0.6")),
+                    timeout=(
+                        float(os.getenv("LLM_CONNECT_TIMEOUT", "10")),
+                        float(os.getenv("LLM_READ_TIMEOUT", "180")),
+                    ),
+                    # 예: http://.../generate_batch (비우면 배칭 안 함)
+                    batch_url=os.getenv("LLM_BATCH_URL") or None,
+                    batch_window_ms=float(os.getenv("LLM_BATCH_WINDOW_MS", "20")),
+                    batch_max_size=int(os.getenv("LLM_BATCH_MAX_SIZE", "8")),
+                    hedge_enabled=os.getenv("LLM_HEDGE_ENABLED", "0") == "1",
+                    hedge_delay=float(os.getenv("LLM_HEDGE_DELAY", "3.0")),
+                    hedge_min_delay=float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5")),
+                    eject_after=int(os.getenv("LLM_EJECT_AFTER", "3")),
+                    eject_seconds=float(os.getenv("LLM_EJECT_SECONDS", "30")),
+                    breaker=get_breaker(
+                        "llm",
+                        failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+                        reset_timeout=float(os.getenv("LLM_BREAKER_RESET", "30")),
+                        # 이보다 느린 호출이 최근 호출의 절반 이상이면 open (0 이면 지연 기준 끔)
+                        slow_call_seconds=float(os.getenv("LLM_BREAKER_SLOW_SECONDS", "60")) or None,
+                    ),
+                )
+    return _client
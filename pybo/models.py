@@ -109,4 +109,47 @@ class GenAIChatLog(db.Model):
     user = db.relationship(
         'Users',
         backref=db.backref('genai_chat_logs', lazy='dynamic')
-    )
\ No newline at end of file
+    )
+
+class GenAIJob(db.Model):
+    __tablename__ = 'genai_job'
+
+    # uuid hex (요청 즉시 클라이언트에 돌려주는 작업 ID)
+    id = db.Column(db.String(32), primary_key=True)
+
+    task_type = db.Column(db.String(30), nullable=False)    # report / policy / qa / summarize
+    params = db.Column(db.Text(), nullable=False)           # 요청 파라미터 JSON
+    status = db.Column(db.String(20), nullable=False, index=True)  # queued / running / done / failed / cancelled
+
+    result = db.Column(db.Text(), nullable=True)
+    error = db.Column(db.Text(), nullable=True)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+
+    created_at = db.Column(db.DateTime(), nullable=False)
+    started_at = db.Column(db.DateTime(), nullable=True)
+    finished_at = db.Column(db.DateTime(), nullable=True)
+
+
+class GenAIPregenerated(db.Model):
+    """배치로 미리 생성한 보고서/정책 (예측 데이터 버전 + 모델 버전별)"""
+    __tablename__ = 'genai_pregenerated'
+    __table_args__ = (
+        db.UniqueConstraint(
+            'task_type', 'district', 'start_year', 'end_year', 'model_version', 'data_version',
+            name='uq_genai_pregenerated_key',
+        ),
+    )
+
+    id = db.Column(db.Integer, db.Sequence('genai_pregenerated_seq', start=1, increment=1), primary_key=True)
+
+    task_type = db.Column(db.String(30), nullable=False)   # report / policy
+    district = db.Column(db.String(50), nullable=False)
+    start_year = db.Column(db.Integer, nullable=False)
+    end_year = db.Column(db.Integer, nullable=False)
+    model_version = db.Column(db.String(20), nullable=False)
+    data_version = db.Column(db.String(40), nullable=False)
+
+    content = db.Column(db.Text(), nullable=False)
+    elapsed = db.Column(db.Float)                          # 생성에 걸린 시간(초)
+    created_at = db.Column(db.DateTime(), nullable=False, server_default=db.func.now())
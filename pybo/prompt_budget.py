@@ -0,0 +1,264 @@
+# 프롬프트 토큰 예산 (작업 종류별 상한 안에서 컨텍스트를 우선순위대로 채움)
+# - 토큰 수: PROMPT_TOKENIZER(tokenizer.json 경로 또는 HF 이름)가 있으면 그 토크나이저, 없으면 한국어 기준 근사치
+# - 예산 = PROMPT_BUDGET_<TASK> (지시문 포함 입력 토큰 상한). 우선순위 낮은 조각부터 잘라내거나 뺌
+# - 요청마다 프롬프트 토큰 수와 LLM 지연을 같이 기록 → /genai-api/prompt-stats 에서 토큰 구간별 평균 지연 확인
+import os
+import re
+import threading
+from typing import Optional
+
+DEFAULT_BUDGETS = {
+    "qa": 2048,
+    "report": 1536,
+    "policy": 1536,
+    "summarize": 3072,
+    "summarize_map": 2048,  # 긴 문서를 나눠 요약할 때 청크 하나의 예산
+    "agent": 3072,
+}
+TRUNCATED_MARK = "\n…(이하 생략)"
+MIN_PIECE_TOKENS = 32  # 남은 예산이 이보다 적으면 자르지 않고 뺌
+
+_HANGUL = re.compile(r"[가-힣ㄱ-ㆎ]")
+_CJK = re.compile(r"[一-鿿]")
+_WORD = re.compile(r"[A-Za-z]+")
+_NUMBER = re.compile(r"\d+")
+_SYMBOL = re.compile(r"[^\sA-Za-z\d가-힣ㄱ-ㆎ一-鿿]")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"(?<=[.!?。…])\s+|\n")
+
+_tokenizer = None
+_tokenizer_loaded = False
+_tokenizer_lock = threading.Lock()
+
+
+def _load_tokenizer():
+    global _tokenizer, _tokenizer_loaded
+    if _tokenizer_loaded:
+        return _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer_loaded:
+            return _tokenizer
+        name = os.getenv("PROMPT_TOKENIZER")
+        if name:
+            try:
+                from tokenizers import Tokenizer
+
+                _tokenizer = Tokenizer.from_file(name) if os.path.exists(name) else Tokenizer.from_pretrained(name)
+            except Exception as e:
+                print(f"[Prompt] tokenizer load failed ({name}), 근사치 사용: {e}")
+        _tokenizer_loaded = True
+        return _tokenizer
+
+
+def estimate_tokens(text: str) -> int:
+    """BPE(Llama 계열) 기준 근사치: 한글 음절 1개≈1토큰, 영단어 4글자≈1토큰, 숫자 3자리≈1토큰, 기호 1개≈1토큰"""
+    if not text:
+        return 0
+    hangul = len(_HANGUL.findall(text))
+    cjk = len(_CJK.findall(text))
+    words = sum((len(w) + 3) // 4 for w in _WORD.findall(text))
+    numbers = sum((len(n) + 2) // 3 for n in _NUMBER.findall(text))
+    symbols = len(_SYMBOL.findall(text))
+    return hangul + cjk + words + numbers + symbols
+
+
+def count_tokens(text: str) -> int:
+    tokenizer = _load_tokenizer()
+    if tokenizer is not None and text:
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+    return estimate_tokens(text)
+
+
+def get_budget(task_type: str) -> int:
+    default = DEFAULT_BUDGETS.get(task_type, DEFAULT_BUDGETS["agent"])
+    return int(os.getenv(f"PROMPT_BUDGET_{task_type.upper()}", str(default)))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """앞에서부터 max_tokens 안에 들어가는 만큼 (가능하면 줄 단위로) 자름"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    budget = max_tokens - count_tokens(TRUNCATED_MARK)
+    if budget <= 0:
+        return ""
+
+    cut = text[:_prefix_within(text, budget)]
+    newline = cut.rfind("\n")
+    if newline > len(cut) // 2:
+        cut = cut[:newline]
+    return cut.rstrip() + TRUNCATED_MARK
+
+
+def _prefix_within(text: str, max_tokens: int) -> int:
+    """max_tokens 안에 들어가는 가장 긴 앞부분의 글자 수 (이분 탐색)"""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def split_to_budget(text: str, max_tokens: int) -> list[str]:
+    """문단 → 문장 경계로 나눈 뒤 max_tokens 안에서 이어 붙인 청크 목록 (한 문장이 넘치면 글자 단위로 자름)"""
+    units = []
+    for para in _PARAGRAPH.split(text or ""):
+        para = para.strip()
+        if not para:
+            continue
+        if count_tokens(para) <= max_tokens:
+            units.append(para)
+            continue
+        for sentence in _SENTENCE.split(para):
+            sentence = sentence.strip()
+            while sentence and count_tokens(sentence) > max_tokens:
+                cut = max(1, _prefix_within(sentence, max_tokens))
+                units.append(sentence[:cut])
+                sentence = sentence[cut:].strip()
+            if sentence:
+                units.append(sentence)
+
+    chunks, current, current_tokens = [], [], 0
+    for unit in units:
+        tokens = count_tokens(unit) + 1  # 구분 줄바꿈
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(unit)
+        current_tokens += tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class PromptPiece:
+    """프롬프트에 넣을 컨텍스트 한 조각. priority 가 작을수록 먼저 자리를 받음"""
+
+    __slots__ = ("name", "text", "priority", "required")
+
+    def __init__(self, name: str, text: str, priority: int = 0, required: bool = False):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.required = required  # 예산이 모자라도 자르거나 빼지 않음 (질문/대상 지역 등)
+
+
+def fit_pieces(task_type: str, instruction: str, pieces: list[PromptPiece], overhead: str = "") -> list[str]:
+    """예산 안에 들어가도록 선택 조각을 자르거나 뺌. 입력 순서대로 반환 (뺀 조각은 "").
+    required 조각은 항상 그대로 넣음 — 지시문 + required 만으로 예산을 넘으면 경고만 남기고 넘긴 채로 보냄.
+    overhead: 조각을 감싸는 고정 문구(머리말/구분자 등)"""
+    budget = get_budget(task_type)
+    remaining = budget - count_tokens(instruction) - count_tokens(overhead)
+    fitted = [""] * len(pieces)
+    truncated, dropped = [], []
+
+    for i, piece in enumerate(pieces):
+        if piece.required:
+            fitted[i] = piece.text
+            remaining -= count_tokens(piece.text)
+    if remaining < 0:
+        print(
+            f"[Prompt] 경고: task={task_type} 지시문 + 필수 조각만으로 예산 초과 "
+            f"(budget={budget}, over={-remaining}) → PROMPT_BUDGET_{task_type.upper()} 를 늘려야 함"
+        )
+        prompt_stats.record_over_budget(task_type)
+
+    order = sorted((i for i, p in enumerate(pieces) if not p.required), key=lambda i: pieces[i].priority)
+    for i in order:
+        piece = pieces[i]
+        tokens = count_tokens(piece.text)
+        if tokens <= remaining:
+            fitted[i] = piece.text
+            remaining -= tokens
+        elif remaining >= MIN_PIECE_TOKENS:
+            fitted[i] = truncate_to_tokens(piece.text, remaining)
+            remaining -= count_tokens(fitted[i])
+            truncated.append(piece.name)
+        else:
+            dropped.append(piece.name)
+
+    if truncated or dropped:
+        print(
+            f"[Prompt] task={task_type} budget={budget} "
+            f"truncated={','.join(truncated) or '-'} dropped={','.join(dropped) or '-'}"
+        )
+        prompt_stats.record_trim(task_type)
+    return fitted
+
+
+class PromptStats:
+    """작업별 프롬프트 토큰 수 + 토큰 구간별 LLM 지연"""
+
+    BUCKETS = (512, 1024, 2048, 4096)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_task: dict[str, dict] = {}
+
+    def _entry(self, task_type: str) -> dict:
+        entry = self._by_task.get(task_type)
+        if entry is None:
+            entry = self._by_task[task_type] = {
+                "requests": 0, "tokens_total": 0, "tokens_max": 0, "trimmed": 0, "over_budget": 0, "buckets": {},
+            }
+        return entry
+
+    def _bucket(self, tokens: int) -> str:
+        for limit in self.BUCKETS:
+            if tokens < limit:
+                return f"<{limit}"
+        return f">={self.BUCKETS[-1]}"
+
+    def _labels(self) -> list[str]:
+        return [f"<{limit}" for limit in self.BUCKETS] + [f">={self.BUCKETS[-1]}"]
+
+    def record(self, task_type: str, tokens: int, elapsed: Optional[float] = None) -> None:
+        print(
+            f"[Prompt] task={task_type} prompt_tokens={tokens}"
+            + (f" llm_ms={elapsed * 1000:.0f}" if elapsed is not None else "")
+        )
+        with self._lock:
+            entry = self._entry(task_type)
+            entry["requests"] += 1
+            entry["tokens_total"] += tokens
+            entry["tokens_max"] = max(entry["tokens_max"], tokens)
+            if elapsed is not None:
+                bucket = entry["buckets"].setdefault(self._bucket(tokens), [0, 0.0])
+                bucket[0] += 1
+                bucket[1] += elapsed
+
+    def record_trim(self, task_type: str) -> None:
+        with self._lock:
+            self._entry(task_type)["trimmed"] += 1
+
+    def record_over_budget(self, task_type: str) -> None:
+        with self._lock:
+            self._entry(task_type)["over_budget"] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                task: {
+                    "budget": get_budget(task),
+                    "requests": e["requests"],
+                    "trimmed": e["trimmed"],
+                    "over_budget": e["over_budget"],
+                    "tokens_avg": round(e["tokens_total"] / e["requests"], 1) if e["requests"] else None,
+                    "tokens_max": e["tokens_max"],
+                    "latency_ms_by_tokens": {
+                        label: {"n": e["buckets"][label][0],
+                                "avg_ms": round(e["buckets"][label][1] / e["buckets"][label][0] * 1000, 1)}
+                        for label in self._labels() if label in e["buckets"]
+                    },
+                }
+                for task, e in self._by_task.items()
+            }
+
+
+prompt_stats = PromptStats()
+
+
+def count_prompt_tokens(instruction: str, input_text: str) -> int:
+    return count_tokens(instruction) + count_tokens(input_text)
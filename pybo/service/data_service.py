@@ -1,5 +1,35 @@
+import hashlib
+import json
+import math
+
+import numpy as np
+
 from pybo.service.region_repository import RegionRepository
 
+# 예측 번들에 담는 피처 컬럼 (population은 실측에만 존재)
+BUNDLE_FEATURE_KEYS = (
+    "single_parent",
+    "basic_beneficiaries",
+    "multicultural_hh",
+    "academy_cnt",
+    "grdp",
+    "population",
+)
+
+# 자치구 비교 API 에서 쓸 수 있는 지표: 이름 -> (실측 컬럼, 예측 컬럼)
+COMPARE_METRICS = {
+    "child_user": ("child_user", "predicted_child_user"),
+    "child_facility": ("child_facility", None),
+    "single_parent": ("single_parent", "single_parent"),
+    "basic_beneficiaries": ("basic_beneficiaries", "basic_beneficiaries"),
+    "multicultural_hh": ("multicultural_hh", "multicultural_hh"),
+    "academy_cnt": ("academy_cnt", "academy_cnt"),
+    "grdp": ("grdp", "grdp"),
+    "population": ("population", None),
+    "divorce": ("divorce", None),
+    "birth_cnt": ("birth_cnt", None),
+}
+
 # 대시보드, 머신러닝 예측 관련 데이터를 DB에서 조회하고 가공하는 서비스 클래스
 class DataService:
 
@@ -25,23 +55,27 @@ class DataService:
     def get_dashboard_data(self, district: str | None, start_year: int | None, end_year: int | None) -> dict:
         rows = self.region_repo.get_dashboard_rows(district, start_year, end_year)
 
-        items = [
-            {
-                "year": r.year,
-                "child_user": int(r.child_user) if r.child_user is not None else 0,
-                "child_facility": int(r.child_facility) if r.child_facility is not None else 0
-            }
-            for r in rows
-        ]
+        # 컬럼형 (행마다 dict를 만드는 대신 연도/값 병렬 배열)
+        series = {
+            "year": [int(r.year) for r in rows],
+            "child_user": [int(r.child_user) if r.child_user is not None else 0 for r in rows],
+            "child_facility": [int(r.child_facility) if r.child_facility is not None else 0 for r in rows],
+        }
 
         return {
             "success": True,
             "district": district,
             "start_year": start_year,
             "end_year": end_year,
-            "items": items,
+            "series": series,
         }
 
+    # 예측 데이터 버전 (ETL 로 예측값이 바뀌면 달라짐, LLM 캐시 무효화 등에 사용)
+    def get_forecast_data_version(self) -> str:
+        row = self.region_repo.get_forecast_version_row()
+        raw = f"{row.row_count}|{row.last_created}|{row.total}" if row else "empty"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
     # 자치구 목록
     def get_districts(self) -> dict:
 
@@ -158,53 +192,215 @@ class DataService:
     # 예측 그래프 데이터
     def get_predict_series(self, district: str) -> dict:
 
-        items: list[dict] = []
-
+        # UNION ALL 한 번으로 (year, value, is_pred) 정렬된 튜플만 조회
         if district and district != "전체":
-
-            actual_row = self.region_repo.get_region_series_actual(district)
-            for r in actual_row:
-                if r.child_user is None:
-                    continue
-                items.append({
-                    "year": int(r.year),
-                    "child_user": int(r.child_user),
-                    "is_pred": False,
-                })
-
-            pred_rows = self.region_repo.get_region_series_forecast(district)
-            for r in pred_rows:
-                if r.predicted_child_user is None:
-                    continue
-                items.append({
-                    "year": int(r.year),
-                    "child_user": int(r.predicted_child_user),
-                    "is_pred": True,
-                })
+            rows = [(r.year, r.value, r.is_pred) for r in self.region_repo.get_series_union([district])]
         else:
-            actual_rows = self.region_repo.get_total_series_actual()
-            for r in actual_rows:
-                if r.child_user is None:
-                    continue
-                items.append({
-                    "year": int(r.year),
-                    "child_user": int(r.child_user),
-                    "is_pred": False,
-                })
-
-            pred_rows = self.region_repo.get_total_series_forecast()
-            for r in pred_rows:
-                if r.child_user is None:
-                    continue
-                items.append({
-                    "year": int(r.year),
-                    "child_user": int(r.child_user),
-                    "is_pred": True,
-                })
-        items.sort(key=lambda x: x["year"]) # 마지막으로 순서 점검 year기준으로 정렬
+            rows = self.region_repo.get_series_union()
 
         return {
             "success": True,
             "district": district,
-            "items": items,
-        }
\ No newline at end of file
+            "series": self._to_series(rows),
+        }
+
+    # 여러 자치구 예측 그래프 데이터 (구별로 묶어서 반환)
+    def get_predict_series_multi(self, districts: list[str]) -> dict:
+        grouped: dict[str, list] = {d: [] for d in districts}
+        for r in self.region_repo.get_series_union(districts):
+            grouped[r.district].append((r.year, r.value, r.is_pred))
+
+        return {
+            "success": True,
+            "districts": districts,
+            "series": {d: self._to_series(rows) for d, rows in grouped.items()},
+        }
+
+    # 보고서 참조용 예측 통계 텍스트 (자치구별, MCP check_stats 도구와 같은 형식 → LLM 캐시 키도 같음)
+    def get_report_stats(self, districts: list[str], start_year: int, end_year: int) -> dict[str, str]:
+        rows = self.region_repo.get_report_forecast_rows(
+            [d for d in districts if d != "전체"], start_year, end_year, include_total="전체" in districts,
+        )
+        grouped: dict[str, list] = {d: [] for d in districts}
+        for r in rows:
+            grouped.setdefault(r.district, []).append(r)
+        return {d: self._format_report_stats(d, start_year, end_year, grouped[d]) for d in districts}
+
+    @staticmethod
+    def _format_report_stats(district: str, start_year: int, end_year: int, rows) -> str:
+        if district == "전체":
+            if not rows:
+                return f"{start_year}~{end_year} 기간의 전체 데이터가 없습니다."
+            return "\n".join([f"{r.year}년 서울시 전체 합계: {r.value}명" for r in rows])
+
+        if not rows:
+            return f"{district}의 {start_year}~{end_year} 기간 데이터가 없습니다."
+        result = [f"{district} 예측 데이터:"]
+        result.extend([f"- {r.year}년: {r.value}명" for r in rows])
+        return "\n".join(result)
+
+    # (year, value, is_pred) 튜플 -> 컬럼형 (연도/값/예측여부 병렬 배열)
+    @staticmethod
+    def _to_series(rows) -> dict:
+        return {
+            "year": [int(y) for y, _, _ in rows],
+            "child_user": [int(v) for _, v, _ in rows],
+            "is_pred": [bool(p) for _, _, p in rows],
+        }
+
+    # 예측 페이지 번들 (전체 연도 x 전체 자치구, 컬럼형)
+    def get_predict_bundle(self) -> dict:
+        actual_rows = self.region_repo.get_bundle_actual_rows()
+        forecast_rows = self.region_repo.get_bundle_forecast_rows()
+
+        # (district, year) -> 값 묶음
+        cells: dict[tuple[str, int], dict] = {}
+        for r in actual_rows:
+            cells[(r.district, int(r.year))] = {
+                "child_user": r.child_user,
+                "child_facility": r.child_facility,
+                "single_parent": r.single_parent,
+                "basic_beneficiaries": r.basic_beneficiaries,
+                "multicultural_hh": r.multicultural_hh,
+                "academy_cnt": r.academy_cnt,
+                "grdp": r.grdp,
+                "population": r.population,
+            }
+        for r in forecast_rows:
+            cells[(r.district, int(r.year))] = {
+                "child_user": r.predicted_child_user,
+                "child_facility": None,
+                "single_parent": r.single_parent,
+                "basic_beneficiaries": r.basic_beneficiaries,
+                "multicultural_hh": r.multicultural_hh,
+                "academy_cnt": r.academy_cnt,
+                "grdp": r.grdp,
+                "population": None,
+            }
+
+        districts = sorted({d for d, _ in cells if d not in (None, "", " ")})
+        years = sorted({y for _, y in cells})
+        metric_keys = ("child_user", "child_facility") + BUNDLE_FEATURE_KEYS
+
+        # 지표별 district x year 행렬 (없는 값은 None)
+        values = {
+            key: [
+                [cells.get((d, y), {}).get(key) for y in years]
+                for d in districts
+            ]
+            for key in metric_keys
+        }
+
+        # 연도별 서울시 전체 합계 (SQL SUM과 동일하게 None은 제외, 전부 None이면 None)
+        total_child_user = []
+        total_child_facility = []
+        district_count = []
+        for yi, y in enumerate(years):
+            users = [row[yi] for row in values["child_user"] if row[yi] is not None]
+            facilities = [row[yi] for row in values["child_facility"] if row[yi] is not None]
+            total_child_user.append(sum(users) if users else None)
+            total_child_facility.append(sum(facilities) if facilities else None)
+            district_count.append(sum(1 for d in districts if (d, y) in cells))
+
+        bundle = {
+            "districts": districts,
+            "years": years,
+            "is_pred": [y > 2022 for y in years],
+            "values": values,
+            "totals": {
+                "child_user": total_child_user,
+                "child_facility": total_child_facility,
+                "district_count": district_count,
+            },
+        }
+
+        # 내용 기반 데이터 버전 (ETL로 값이 바뀌면 버전도 바뀜)
+        raw = json.dumps(bundle, ensure_ascii=False, sort_keys=True, default=float)
+        version = hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+        return {
+            "success": True,
+            "version": version,
+            **bundle,
+        }
+
+    # 자치구 비교 (district x year 행렬 + 순위/서울 전체 대비 비중)
+    def get_compare_data(
+        self,
+        districts: list[str] | None,
+        start_year: int,
+        end_year: int,
+        metrics: list[str],
+    ) -> dict:
+        unknown = [m for m in metrics if m not in COMPARE_METRICS]
+        if unknown:
+            raise ValueError(f"지원하지 않는 지표입니다: {', '.join(unknown)}")
+        if start_year > end_year:
+            raise ValueError("start_year 는 end_year 보다 클 수 없습니다.")
+
+        # 순위/비중은 서울 전체 기준이므로 항상 전체 구를 조회한 뒤 요청한 구만 잘라냄
+        rows = self.region_repo.get_compare_rows(
+            {m: COMPARE_METRICS[m] for m in metrics}, start_year, end_year
+        )
+
+        all_districts = sorted({r.district for r in rows if r.district not in (None, "", " ")})
+        years = list(range(start_year, end_year + 1))
+        d_index = {d: i for i, d in enumerate(all_districts)}
+        y_index = {y: i for i, y in enumerate(years)}
+
+        cube = np.full((len(metrics), len(all_districts), len(years)), np.nan)
+        for r in rows:
+            di = d_index.get(r.district)
+            if di is None:
+                continue
+            yi = y_index[int(r.year)]
+            for mi, m in enumerate(metrics):
+                v = getattr(r, m)
+                if v is not None:
+                    cube[mi, di, yi] = float(v)
+
+        if districts is None:
+            selected = all_districts
+        else:
+            selected = [d for d in districts if d in d_index]
+        sel = [d_index[d] for d in selected]
+
+        result = {}
+        for mi, m in enumerate(metrics):
+            mat = cube[mi]
+            present = ~np.isnan(mat)
+
+            totals = np.where(present.any(axis=0), np.nansum(mat, axis=0), np.nan)
+            # 합계가 0 / 없음인 연도는 비중을 계산하지 않음 (inf/nan → null)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                share = np.where(totals > 0, mat / totals, np.nan)
+
+            # 연도별 내림차순 순위 (1위 = 가장 큰 값, 값이 없는 구는 순위 없음)
+            order = np.argsort(np.where(present, -mat, np.inf), axis=0, kind="stable")
+            rank = np.empty_like(mat)
+            np.put_along_axis(rank, order, np.arange(1, len(all_districts) + 1, dtype=float)[:, None], axis=0)
+            rank[~present] = np.nan
+
+            result[m] = {
+                "values": self._matrix_to_list(mat[sel]),
+                "rank": self._matrix_to_list(rank[sel], as_int=True),
+                "share": self._matrix_to_list(np.round(share[sel], 6)),
+                "total": self._matrix_to_list(totals[None, :])[0],
+            }
+
+        return {
+            "success": True,
+            "districts": selected,
+            "years": years,
+            "district_count": len(all_districts),
+            "metrics": result,
+        }
+
+    # NaN / inf 는 None(null)으로 바꿔서 JSON 직렬화 가능한 중첩 리스트로
+    @staticmethod
+    def _matrix_to_list(mat, as_int: bool = False) -> list[list]:
+        cast = int if as_int else float
+        return [
+            [cast(v) if math.isfinite(v) else None for v in row]
+            for row in mat.tolist()
+        ]
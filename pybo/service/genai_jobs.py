@@ -0,0 +1,255 @@
+# GenAI 비동기 작업 큐
+# - submit() 은 genai_job 테이블에 queued 로 저장하고 작업 ID 를 바로 반환
+# - 고정 개수(GENAI_JOB_WORKERS)의 워커 스레드가 GenAIService 를 호출 → RunPod 동시 호출 수 제한
+# - 상태/결과는 DB 에 남으므로 재시작 후에도 조회 가능, 남아 있던 queued 작업은 다시 실행
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pybo import db
+from pybo.models import GenAIJob
+
+TASK_TYPES = ("report", "policy", "qa", "summarize")
+FINISHED = ("done", "failed", "cancelled")
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+def _run_task(task_type: str, params: dict) -> str:
+    from pybo.service.genai_service import get_genai_service
+
+    service = get_genai_service()
+    model_version = params.get("model_version", "final")
+
+    if task_type == "report":
+        return service.generate_report_with_data(
+            user_prompt="report",
+            district=params["district"],
+            start_year=int(params.get("start_year", 2023)),
+            end_year=int(params["end_year"]),
+            model_version=model_version,
+        )
+    if task_type == "policy":
+        return service.generate_policy(
+            params["prompt"],
+            district=params.get("district", "전체"),
+            model_version=model_version,
+        )
+    if task_type == "qa":
+        return service.answer_qa_with_log(params["question"], model_version=model_version)
+    if task_type == "summarize":
+        return service.summarize_text(params["text"], model_version=model_version)
+    raise ValueError(f"알 수 없는 작업 종류: {task_type}")
+
+
+def _ms(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    return round((end - start).total_seconds() * 1000, 1)
+
+
+def job_to_dict(job: GenAIJob) -> dict:
+    now = datetime.now()
+    return {
+        "job_id": job.id,
+        "task_type": job.task_type,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat(sep=" ", timespec="seconds"),
+        "started_at": job.started_at.isoformat(sep=" ", timespec="seconds") if job.started_at else None,
+        "finished_at": job.finished_at.isoformat(sep=" ", timespec="seconds") if job.finished_at else None,
+        # 대기 시간 / 실행 시간 (진행 중이면 지금까지)
+        "wait_ms": _ms(job.created_at, job.started_at or (None if job.status in FINISHED else now)),
+        "run_ms": _ms(job.started_at, job.finished_at or (None if job.status in FINISHED else now)),
+    }
+
+
+class GenAIJobQueue:
+    def __init__(self, app, workers: int = 2, max_queued: int = 100, stale_after: int = 900):
+        self.app = app
+        self.workers = workers
+        self.max_queued = max_queued
+        self.stale_after = stale_after
+
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._running = 0
+        self._counts = {"submitted": 0, "done": 0, "failed": 0, "cancelled": 0}
+        self._wait_times: deque = deque(maxlen=500)
+        self._run_times: deque = deque(maxlen=500)
+
+    # ===== 워커 =====
+
+    def _ensure_started(self) -> None:
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            self._recover()
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"genai-job-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _recover(self) -> None:
+        """재시작 전 남은 작업을 다시 큐에 넣음 (오래된 running 은 중단된 것으로 보고 queued 로 되돌림)"""
+        with self.app.app_context():
+            stale = datetime.now() - timedelta(seconds=self.stale_after)
+            GenAIJob.query.filter(
+                GenAIJob.status == "running", GenAIJob.started_at < stale
+            ).update({"status": "queued", "started_at": None}, synchronize_session=False)
+            db.session.commit()
+
+            pending = (
+                GenAIJob.query.with_entities(GenAIJob.id)
+                .filter(GenAIJob.status == "queued")
+                .order_by(GenAIJob.created_at)
+                .all()
+            )
+        for (job_id,) in pending:
+            self._queue.put(job_id)
+        if pending:
+            print(f"[GenAI Jobs] 재시작 후 대기 작업 {len(pending)}건 다시 실행")
+
+    def _claim(self, job_id: str) -> Optional[GenAIJob]:
+        """queued → running 원자적 전환 (여러 프로세스가 같은 작업을 잡지 않도록)"""
+        claimed = GenAIJob.query.filter(
+            GenAIJob.id == job_id, GenAIJob.status == "queued"
+        ).update({"status": "running", "started_at": datetime.now()}, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            return None
+        return db.session.get(GenAIJob, job_id)
+
+    def _worker(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            try:
+                with self.app.app_context():
+                    self._execute(job_id)
+            except Exception as e:
+                print(f"[GenAI Jobs] worker error ({job_id}): {e}")
+            finally:
+                self._queue.task_done()
+
+    def _execute(self, job_id: str) -> None:
+        job = self._claim(job_id)
+        if job is None:
+            return  # 취소됐거나 다른 프로세스가 가져감
+
+        params = json.loads(job.params)
+        with self._stats_lock:
+            self._running += 1
+            self._wait_times.append((job.started_at - job.created_at).total_seconds())
+
+        start = time.perf_counter()
+        result, error = None, None
+        try:
+            result = _run_task(job.task_type, params)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self._running -= 1
+                self._run_times.append(elapsed)
+
+        # 실행 중 취소된 작업은 결과를 버림 (RunPod 호출 자체는 중간에 끊을 수 없음)
+        status = "done" if error is None else "failed"
+        updated = GenAIJob.query.filter(
+            GenAIJob.id == job_id, GenAIJob.status == "running"
+        ).update(
+            {"status": status, "result": result, "error": error, "finished_at": datetime.now()},
+            synchronize_session=False,
+        )
+        db.session.commit()
+        if updated:
+            with self._stats_lock:
+                self._counts[status] += 1
+
+    # ===== API =====
+
+    def submit(self, task_type: str, params: dict, user_id: Optional[int] = None) -> str:
+        if task_type not in TASK_TYPES:
+            raise ValueError(f"알 수 없는 작업 종류: {task_type}")
+        self._ensure_started()
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFull("대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+
+        job = GenAIJob(
+            id=uuid.uuid4().hex,
+            task_type=task_type,
+            params=json.dumps(params, ensure_ascii=False),
+            status="queued",
+            user_id=user_id,
+            created_at=datetime.now(),
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        self._queue.put(job.id)
+        with self._stats_lock:
+            self._counts["submitted"] += 1
+        return job.id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        self._ensure_started()  # 재시작 직후 조회만 들어와도 남은 작업 처리 시작
+        job = db.session.get(GenAIJob, job_id)
+        return job_to_dict(job) if job is not None else None
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """대기/실행 중 작업을 취소. 이미 끝난 작업은 그대로 반환"""
+        updated = GenAIJob.query.filter(
+            GenAIJob.id == job_id, GenAIJob.status.in_(("queued", "running"))
+        ).update({"status": "cancelled", "finished_at": datetime.now()}, synchronize_session=False)
+        db.session.commit()
+        if updated:
+            with self._stats_lock:
+                self._counts["cancelled"] += 1
+        return self.get(job_id)
+
+    @staticmethod
+    def _avg_ms(values) -> Optional[float]:
+        return round(sum(values) / len(values) * 1000, 1) if values else None
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "workers": self.workers,
+                "started": bool(self._threads),
+                "queue_depth": self._queue.qsize(),
+                "running": self._running,
+                "max_queued": self.max_queued,
+                **self._counts,
+                "avg_wait_ms": self._avg_ms(self._wait_times),
+                "max_wait_ms": round(max(self._wait_times) * 1000, 1) if self._wait_times else None,
+                "avg_run_ms": self._avg_ms(self._run_times),
+            }
+
+
+def get_job_queue(app=None) -> GenAIJobQueue:
+    from flask import current_app
+
+    return (app or current_app).extensions["genai_jobs"]
+
+
+def init_app(app) -> None:
+    # 워커 스레드는 첫 submit 때 시작 (MCP 서버처럼 create_app 만 쓰는 프로세스에서는 안 뜸)
+    app.extensions["genai_jobs"] = GenAIJobQueue(
+        app,
+        workers=app.config.get("GENAI_JOB_WORKERS", 2),
+        max_queued=app.config.get("GENAI_JOB_QUEUE_MAX", 100),
+        stale_after=app.config.get("GENAI_JOB_STALE_AFTER", 900),
+    )
@@ -1,50 +1,141 @@
 import os
 import json
+import threading
 import time
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from dotenv import load_dotenv
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from pybo.agent.tool_agent import ToolAgent
-from pybo.agent.qa_graph import run_qa
+from pybo.service.data_service import DataService
+from pybo.service import pregenerated
+from pybo.service.llm_cache import LLMResponseCache
+from pybo.circuit_breaker import CircuitOpenError
+from pybo.llm_client import MSG_CIRCUIT_OPEN, MSG_TIMEOUT, LLMClient, get_llm_client
+from pybo.prompt_budget import (
+    PromptPiece, count_prompt_tokens, count_tokens, fit_pieces, get_budget, prompt_stats, split_to_budget,
+)
+from pybo.single_flight import SingleFlight, SingleFlightTimeout
+from pybo.agent.qa_graph import build_answer_prompt, run_qa
 from pybo.agent.prompts import (
     QA_SYSTEM_PROMPT, REPORT_SYSTEM_PROMPT, POLICY_SYSTEM_PROMPT
 )
 
 load_dotenv()
 
+# 정책 제안은 항상 예측 구간 전체를 참조
+POLICY_YEAR_RANGE = (2023, 2030)
+
+
+class LLMStreamError(Exception):
+    """스트리밍 중 LLM 서버 오류 (사용자에게 보여줄 메시지)"""
+
+
+class StreamStats:
+    """스트리밍 엔드포인트별 첫 토큰 시간(TTFT)/전체 시간/취소 집계"""
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self._window = window
+        self._by_name: dict[str, dict] = {}
+
+    def _entry(self, name: str) -> dict:
+        return self._by_name.setdefault(name, {
+            "started": 0, "completed": 0, "cancelled": 0, "errors": 0,
+            "ttft": deque(maxlen=self._window), "elapsed": deque(maxlen=self._window),
+        })
+
+    def record(self, name: str, outcome: str, ttft: Optional[float], elapsed: float) -> None:
+        with self._lock:
+            e = self._entry(name)
+            e["started"] += 1
+            e[outcome] += 1
+            if ttft is not None:
+                e["ttft"].append(ttft)
+            if outcome == "completed":
+                e["elapsed"].append(elapsed)
+
+    @staticmethod
+    def _pct(values, p: float) -> Optional[float]:
+        if not values:
+            return None
+        values = sorted(values)
+        return round(values[min(len(values) - 1, int(p / 100 * len(values)))] * 1000, 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "started": e["started"],
+                    "completed": e["completed"],
+                    "cancelled": e["cancelled"],
+                    "errors": e["errors"],
+                    "ttft_ms_p50": self._pct(e["ttft"], 50),
+                    "ttft_ms_p95": self._pct(e["ttft"], 95),
+                    "elapsed_ms_p50": self._pct(e["elapsed"], 50),
+                    "elapsed_ms_p95": self._pct(e["elapsed"], 95),
+                }
+                for name, e in self._by_name.items()
+            }
+
 
 class GenAIService:
     def __init__(self) -> None:
-        self.api_url = os.getenv("RUNPOD_API_URL")
-        self.api_key = os.getenv("RUNPOD_API_KEY")
-
-        self.session = requests.Session()
-        retry = Retry(
-            total=3,  # 리트라이 횟수 약간 증가
-            backoff_factor=0.6,
-            status_forcelist=(429, 500, 502, 503, 504, 524),  # 524(Proxy Timeout) 추가
-            allowed_methods=frozenset(["POST"]),
-            raise_on_status=False,
-        )
-        adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # RunPod 호출은 프로세스 공용 클라이언트(커넥션 풀/재시도/지표) 사용
+        self.llm = get_llm_client()
+        self.api_url = self.llm.url
+        self.stream_url = self.llm.stream_url
 
         self.default_settings = {"temperature": 0.3, "max_new_tokens": 256}
 
         self._agent_instance = None
 
+        # 결정적 요청(보고서/정책/요약) 응답 캐시
+        self.cache = None
+        if os.getenv("LLM_CACHE_ENABLED", "1") == "1":
+            self.cache = LLMResponseCache(
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+                ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+                disk_path=os.getenv("LLM_CACHE_PATH") or None,  # 비우면 메모리만 사용
+            )
+        self.data_version_ttl = float(os.getenv("LLM_CACHE_DATA_VERSION_TTL", "60"))
+        self._data_version_cache: Optional[Tuple[Optional[str], float]] = None
+
+        self.stream_stats = StreamStats()
+
+        # 동시에 들어온 같은 LLM 요청은 한 번만 RunPod 로 보냄
+        self.inflight = SingleFlight("llm")
+
+        # 긴 문서 요약(map-reduce)의 청크 요약 동시 호출 상한 (프로세스 전체 공유)
+        self.summary_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("SUMMARIZE_MAP_WORKERS", "4")), thread_name_prefix="summarize-map"
+        )
+
+        # 여러 자치구 보고서의 LLM 동시 호출 상한 (프로세스 전체 공유)
+        self.report_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("GENAI_MULTI_REPORT_CONCURRENCY", "4")), thread_name_prefix="report-multi"
+        )
+
     @property
     def agent(self) -> ToolAgent:
         if self._agent_instance is None:
             self._agent_instance = ToolAgent(llm_callback=self._call_llama3)
         return self._agent_instance
 
-    def _call_llama3(
+    def inflight_stats(self) -> dict:
+        """동시 요청 합치기 / LLM 클라이언트 지표 (에이전트는 만들어진 경우에만 — 여기서 새로 만들지 않음)"""
+        stats = {"llm": self.inflight.stats(), "llm_client": self.llm.stats()}
+        if self._agent_instance is not None:
+            stats["tool_client"] = self._agent_instance.tool_client.inflight_stats()
+        return stats
+
+    def _call_llama3(self, instruction: str, input_text: str, **kwargs) -> str:
+        return self._generate(instruction, input_text, **kwargs)[0]
+
+    def _generate(
         self,
         instruction: str,
         input_text: str,
@@ -52,125 +143,570 @@ class GenAIService:
         model_version: str = "final",
         temperature: Optional[float] = None,
         timeout: Tuple[float, float] = (10.0, 180.0), # 300s -> 180s (3분)으로 조정
-    ) -> str:
+        cache: bool = False,
+        data_version: Optional[str] = None,
+        task_type: str = "agent",
+    ) -> Tuple[str, bool]:
+        """LLM 호출. (텍스트, 정상 응답 여부) 반환 — 실패 시 텍스트는 사용자 안내 문구"""
         if not self.api_url:
-            return "RUNPOD_API_URL이 설정되지 않았습니다."
-
-        payload = {
-            "instruction": instruction,
-            "input": input_text,
-            "model_version": model_version,
-            "max_new_tokens": max_new_tokens or self.default_settings["max_new_tokens"],
-            "temperature": temperature if temperature is not None else self.default_settings["temperature"],
-            "stop": ["Observation:", "Observation", "###"],  # 중단 토큰 추가
-        }
+            return "RUNPOD_API_URL이 설정되지 않았습니다.", False
 
-        headers = {"Content-Type": "application/json"}
-        # Proxy URL(8000번 포트 등)인 경우 보통 인증 헤더가 필요 없으므로 구분하여 처리
-        if self.api_key and "proxy.runpod.net" not in self.api_url:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-            print(f">>> [LLM Request] Using API Key for {self.api_url}")
-        else:
-            print(f">>> [LLM Request] Standard Proxy Request (No Auth Header) to {self.api_url}")
+        max_new_tokens = max_new_tokens or self.default_settings["max_new_tokens"]
+        temperature = temperature if temperature is not None else self.default_settings["temperature"]
 
-        start = time.time()
-        print(f">>> [LLM Request] Starting request to {self.api_url} (timeout={timeout})")
-        try:
-            response = self.session.post(
-                self.api_url,
-                json=payload,
-                headers=headers,
-                timeout=timeout,
-            )
-            print(f">>> [LLM Response] Received response with status {response.status_code}")
-
-            if not (200 <= response.status_code < 300):
-                print(f"[LLM ERROR] status={response.status_code}, body={response.text[:300]}")
-                return f"AI 서버 오류(status={response.status_code})로 답변 생성에 실패했습니다. 잠시 후 다시 시도해주세요."
+        request_key = LLMResponseCache.make_key(
+            instruction, input_text, model_version, temperature, max_new_tokens
+        )
 
-            elapsed = time.time() - start
-            print(f"--- AI 추론 완료 (소요시간: {elapsed:.2f}초) ---")
+        # 같은 요청(지시문/입력/모델/파라미터)이면 캐시된 응답 재사용
+        cache_key = None
+        if cache and self.cache is not None:
+            cache_key = request_key
+            cached = self.cache.get(cache_key, data_version=data_version)
+            if cached is not None:
+                print(">>> [LLM Cache] hit")
+                return cached, True
+
+        payload = LLMClient.build_payload(
+            instruction, input_text, model_version, max_new_tokens, temperature
+        )
 
-            return (response.json().get("text", "") or "").strip()
+        def fetch() -> Tuple[str, bool]:
+            start = time.time()
+            text, ok = self._request_llama3(payload, timeout)
+            prompt_stats.record(task_type, count_prompt_tokens(instruction, input_text), time.time() - start)
+
+            # 정상 응답만 캐시 (오류 안내 문구는 저장하지 않음)
+            if ok and text and cache_key is not None:
+                self.cache.put(
+                    cache_key, text,
+                    model_version=model_version,
+                    data_version=data_version,
+                    latency=time.time() - start,
+                )
+            return text, ok
+
+        # 같은 요청이 이미 진행 중이면 그 응답을 같이 받음 (대기 상한 = 요청 타임아웃 + 여유)
+        try:
+            text, ok = self.inflight.do(request_key, fetch, timeout=sum(timeout) + 5.0)
+        except SingleFlightTimeout:
+            return "AI 서버 응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요.", False
+
+        if not ok and cache_key is not None:
+            stale = self._stale_cached(cache_key)
+            if stale is not None:
+                return stale, False  # 보여주기만 하고 저장(사전 생성 등)은 하지 않음
+        return text, ok
+
+    def _stale_cached(self, cache_key: str) -> Optional[str]:
+        """LLM 브레이커가 열려 있으면 만료/데이터 버전이 지난 캐시 응답이라도 반환"""
+        if self.cache is None or not self.llm.breaker.is_open():
+            return None
+        stale = self.cache.get_stale(cache_key)
+        if stale is not None:
+            print(">>> [LLM Cache] stale hit (circuit open)")
+        return stale
+
+    def _stale_pregenerated(
+        self, task_type: str, district: str, start_year: int, end_year: int, model_version: str
+    ) -> Optional[str]:
+        """LLM 브레이커가 열려 있으면 이전 데이터 버전으로 사전 생성된 결과라도 반환"""
+        if not self.llm.breaker.is_open():
+            return None
+        return pregenerated.lookup_latest(task_type, district, start_year, end_year, model_version)
+
+    def _request_llama3(self, payload: dict, timeout: Tuple[float, float]) -> Tuple[str, bool]:
+        """RunPod 호출. (텍스트, 정상 응답 여부) 반환"""
+        return self.llm.generate(payload, timeout)
+
+    def _stream_llama3(
+        self,
+        instruction: str,
+        input_text: str,
+        max_new_tokens: Optional[int] = None,
+        model_version: str = "final",
+        temperature: Optional[float] = None,
+        timeout: Tuple[float, float] = (10.0, 180.0),
+        cache: bool = False,
+        data_version: Optional[str] = None,
+        task_type: str = "agent",
+    ) -> Iterator[str]:
+        """LLM 토큰을 받는 대로 yield. 오류는 LLMStreamError.
+        제너레이터가 닫히면(클라이언트 연결 종료) 업스트림 연결도 닫아서 생성을 취소함"""
+        if not self.stream_url:
+            raise LLMStreamError("RUNPOD_API_URL이 설정되지 않았습니다.")
+
+        max_new_tokens = max_new_tokens or self.default_settings["max_new_tokens"]
+        temperature = temperature if temperature is not None else self.default_settings["temperature"]
+
+        cache_key = None
+        if cache and self.cache is not None:
+            cache_key = LLMResponseCache.make_key(
+                instruction, input_text, model_version, temperature, max_new_tokens
+            )
+            cached = self.cache.get(cache_key, data_version=data_version)
+            if cached is not None:
+                print(">>> [LLM Cache] hit (stream)")
+                yield cached
+                return
+
+        payload = LLMClient.build_payload(
+            instruction, input_text, model_version, max_new_tokens, temperature, stream=True
+        )
 
+        start = time.time()
+        try:
+            response = self.llm.open_stream(payload, timeout)
+        except CircuitOpenError:
+            stale = self._stale_cached(cache_key) if cache_key is not None else None
+            if stale is None:
+                raise LLMStreamError(MSG_CIRCUIT_OPEN)
+            yield stale
+            return
         except requests.exceptions.Timeout:
-            print("[LLM TIMEOUT] AI 서버 응답 지연")
-            return "AI 서버 응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요."
+            raise LLMStreamError("AI 서버 응답이 지연되고 있습니다. 잠시 후 다시 시도해주세요.")
         except requests.exceptions.RequestException as e:
-            print(f"[LLM REQUEST ERROR] {e}")
-            return "AI 서버 통신 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
-        except Exception as e:
-            print(f"[LLM UNKNOWN ERROR] {e}")
-            return "AI 서버 처리 중 알 수 없는 오류가 발생했습니다."
+            print(f"[LLM STREAM ERROR] {e}")
+            raise LLMStreamError("AI 서버 통신 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
 
-    def generate_report_with_data(self, user_prompt: str, **kwargs) -> str:
-        district = kwargs.get("district", "전체")
-        start_year = int(kwargs.get("start_year", 2023))
-        end_year = int(kwargs.get("end_year", 2030))
-        model_version = kwargs.get("model_version", "final")
+        chunks: list[str] = []
+        complete = False  # 종료 표시([DONE] / done)를 받았거나 한 번에 받은 응답 → 이때만 캐시
+        try:
+            if not (200 <= response.status_code < 300):
+                print(f"[LLM ERROR] status={response.status_code}, body={response.text[:300]}")
+                raise LLMStreamError(
+                    f"AI 서버 오류(status={response.status_code})로 답변 생성에 실패했습니다. 잠시 후 다시 시도해주세요."
+                )
+
+            content_type = response.headers.get("Content-Type", "")
+            if "text/event-stream" in content_type or "ndjson" in content_type:
+                for line in response.iter_lines(decode_unicode=True):
+                    token = self._parse_stream_line(line)
+                    if token is None:
+                        continue
+                    if token is StopIteration:
+                        complete = True
+                        break
+                    chunks.append(token)
+                    yield token
+            else:
+                # 스트리밍을 지원하지 않는 백엔드: 전체 응답을 한 번에 전달
+                text = (response.json().get("text", "") or "").strip()
+                chunks.append(text)
+                complete = True
+                yield text
+        except requests.exceptions.RequestException as e:
+            print(f"[LLM STREAM ERROR] {e}")
+            raise LLMStreamError("AI 서버 통신 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+        finally:
+            response.close()
+
+        text = "".join(chunks).strip()
+        print(f"--- AI 스트리밍 완료 (소요시간: {time.time() - start:.2f}초) ---")
+        prompt_stats.record(task_type, count_prompt_tokens(instruction, input_text), time.time() - start)
+        if not complete:
+            print("[LLM STREAM] 종료 표시 없이 스트림이 끝남 → 캐시하지 않음")
+        if text and complete and cache_key is not None:
+            self.cache.put(
+                cache_key, text,
+                model_version=model_version,
+                data_version=data_version,
+                latency=time.time() - start,
+            )
 
+    @staticmethod
+    def _parse_stream_line(line: str):
+        """SSE(`data: {...}`) 또는 NDJSON 한 줄 → 토큰 문자열 / None(무시) / StopIteration(종료)"""
+        if not line:
+            return None
+        if line.startswith(":") or line.startswith("event:"):
+            return None
+        if line.startswith("data:"):
+            line = line[5:].strip()
+        if line == "[DONE]":
+            return StopIteration
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            return line
+        if not isinstance(data, dict):  # data: 123 / "문자열" 등 → 텍스트로 취급
+            return line
+        if data.get("done"):
+            return StopIteration
+        return data.get("token") or data.get("text") or None
+
+    @staticmethod
+    def _is_tool_error(text: str) -> bool:
+        return (text or "").startswith(("MCP 도구 호출", "도구 호출 오류", "DB 조회 중 오류"))
+
+    def _data_version(self) -> Optional[str]:
+        """예측 데이터 버전 (캐시 무효화용, 짧게 메모)"""
+        now = time.time()
+        if self._data_version_cache and self._data_version_cache[1] > now:
+            return self._data_version_cache[0]
+        try:
+            version = DataService().get_forecast_data_version()
+        except Exception as e:  # 앱 컨텍스트 밖 등
+            print(f"[LLM Cache] data version unavailable: {e}")
+            return None
+        self._data_version_cache = (version, now + self.data_version_ttl)
+        return version
+
+    def _report_input(self, district: str, start_year: int, end_year: int) -> Tuple[str, str]:
         # 서비스단에서 데이터 선조회 (도구 호출 오버헤드 최소화)
         stats_data = self.agent.tool_client.call_tool(
             "check_stats",
             {"district": district, "start_year": start_year, "end_year": end_year}
         )
+        return stats_data, self._report_prompt(district, stats_data)
+
+    @staticmethod
+    def _report_prompt(district: str, stats_data: str) -> str:
+        stats_text, district_text = fit_pieces("report", REPORT_SYSTEM_PROMPT, [
+            PromptPiece("stats", stats_data, priority=1),
+            PromptPiece("district", f"대상 지역: {district}", required=True),
+        ], overhead="[참조 데이터: ]\n")
+        return f"[참조 데이터: {stats_text}]\n{district_text}"
+
+    def _policy_input(self, district: str) -> Tuple[str, str]:
+        stats_data = self.agent.tool_client.call_tool(
+            "check_stats",
+            {"district": district, "start_year": POLICY_YEAR_RANGE[0], "end_year": POLICY_YEAR_RANGE[1]}
+        )
+        stats_text, district_text = fit_pieces("policy", POLICY_SYSTEM_PROMPT, [
+            PromptPiece("stats", stats_data, priority=1),
+            PromptPiece("district", f"지역: {district}", required=True),
+        ], overhead="[참조 데이터: ]\n")
+        return stats_data, f"[참조 데이터: {stats_text}]\n{district_text}"
+
+    @staticmethod
+    def _report_meta(district: str) -> dict:
+        return {
+            "title": f"{district} 아동복지 데이터 분석 보고서",
+            "summary": "AI 데이터 분석 결과",
+        }
 
-        input_text = f"[참조 데이터: {stats_data}]\n대상 지역: {district}"
+    def generate_report_content(
+        self, district: str, start_year: int, end_year: int, model_version: str = "final"
+    ) -> Tuple[str, bool]:
+        """보고서 본문 실시간 생성. (텍스트, 저장해도 되는 정상 결과인지)"""
+        stats_data, input_text = self._report_input(district, start_year, end_year)
+        tool_ok = not self._is_tool_error(stats_data)
 
         # 에이전트 루프 우회: 직접 LLM 호출 (속도 극대화)
-        raw_response = self._call_llama3(
+        text, ok = self._generate(
             instruction=REPORT_SYSTEM_PROMPT,
             input_text=input_text,
             model_version=model_version,
             max_new_tokens=256,
-            temperature=0.3
+            temperature=0.3,
+            cache=tool_ok,  # 통계 조회 실패 시 만들어진 답변은 캐시하지 않음
+            data_version=self._data_version(),
+            task_type="report",
+        )
+        return text, ok and tool_ok
+
+    def generate_policy_content(self, district: str, model_version: str = "final") -> Tuple[str, bool]:
+        stats_data, input_text = self._policy_input(district)
+        tool_ok = not self._is_tool_error(stats_data)
+
+        text, ok = self._generate(
+            instruction=POLICY_SYSTEM_PROMPT,
+            input_text=input_text,
+            model_version=model_version,
+            max_new_tokens=256,
+            temperature=0.3,
+            cache=tool_ok,
+            data_version=self._data_version(),
+            task_type="policy",
         )
+        return text, ok and tool_ok
+
+    def generate_report_with_data(self, user_prompt: str, **kwargs) -> str:
+        district = kwargs.get("district", "전체")
+        start_year = int(kwargs.get("start_year", 2023))
+        end_year = int(kwargs.get("end_year", 2030))
+        model_version = kwargs.get("model_version", "final")
+
+        # 배치로 미리 만든 보고서가 있으면 그대로 사용, 없으면 실시간 생성
+        raw_response = pregenerated.lookup(
+            "report", district, start_year, end_year, model_version, self._data_version()
+        )
+        if raw_response is None:
+            raw_response = self._stale_pregenerated("report", district, start_year, end_year, model_version)
+        if raw_response is None:
+            raw_response, _ = self.generate_report_content(district, start_year, end_year, model_version)
 
         report_data = {
-            "title": f"{district} 아동복지 데이터 분석 보고서",
-            "summary": "AI 데이터 분석 결과",
+            **self._report_meta(district),
             "content": raw_response,
         }
         return json.dumps(report_data, ensure_ascii=False)
 
+    def generate_reports_multi(
+        self, districts: list[str], start_year: int, end_year: int, model_version: str = "final"
+    ) -> Iterator[dict]:
+        """여러 자치구 보고서를 끝나는 순서대로 yield.
+        통계는 check_stats_batch 도구 한 번으로 먼저 조회하고, LLM 호출은 report_pool 상한 안에서 동시에 실행.
+        각 항목: district, title, content, source(pregenerated/llm), ok, elapsed_ms"""
+        start = time.time()
+        data_version = self._data_version()
+
+        def item(district: str, content: str, source: str, ok: bool, elapsed: float) -> dict:
+            return {
+                "district": district,
+                **self._report_meta(district),
+                "content": content,
+                "source": source,
+                "ok": ok,
+                "elapsed_ms": round(elapsed * 1000, 1),
+            }
+
+        stored = pregenerated.lookup_many("report", districts, start_year, end_year, model_version, data_version)
+        for district in districts:
+            if district in stored:
+                yield item(district, stored[district], "pregenerated", True, time.time() - start)
+
+        pending = [d for d in districts if d not in stored]
+        if not pending:
+            return
+
+        # 통계는 배치 도구 한 번으로 (MCP 왕복 한 번, SQL 한 번)
+        results, error = self.agent.tool_client.call_tool_batch(
+            "check_stats_batch", {"districts": pending, "start_year": start_year, "end_year": end_year}
+        )
+        if results is None:
+            # 배치 도구가 없는 (이전 버전) 도구 서버 등 → 자치구별 check_stats
+            print(f"[Report Multi] check_stats_batch 실패 → 자치구별 조회: {error[:100]}")
+            stats = {
+                d: self.agent.tool_client.call_tool(
+                    "check_stats", {"district": d, "start_year": start_year, "end_year": end_year}
+                )
+                for d in pending
+            }
+        else:
+            found = {r["district"]: r["text"] for r in results}
+            stats = {d: found.get(d, "DB 조회 중 오류 발생: 결과 없음") for d in pending}
+
+        def run(district: str) -> dict:
+            started = time.time()
+            stats_data = stats[district]
+            tool_ok = not self._is_tool_error(stats_data)
+            text, ok = self._generate(
+                instruction=REPORT_SYSTEM_PROMPT,
+                input_text=self._report_prompt(district, stats_data),
+                model_version=model_version,
+                max_new_tokens=256,
+                temperature=0.3,
+                cache=tool_ok,
+                data_version=data_version,
+                task_type="report",
+            )
+            return item(district, text, "llm", ok and tool_ok, time.time() - started)
+
+        futures = {self.report_pool.submit(run, d): d for d in pending}
+        try:
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[Report Multi] {futures[future]} error: {e}")
+                    result = item(futures[future], "보고서 생성 중 오류가 발생했습니다.", "llm", False, time.time() - start)
+                if not result["ok"]:
+                    # 브레이커가 열려 있으면 이전 데이터 버전의 사전 생성 결과라도 (조회는 앱 컨텍스트가 있는 이 스레드에서)
+                    stale = self._stale_pregenerated("report", result["district"], start_year, end_year, model_version)
+                    if stale is not None:
+                        result.update(content=stale, source="pregenerated")
+                yield result
+        finally:
+            # 클라이언트가 끊었으면 아직 시작하지 않은 호출은 취소
+            for future in futures:
+                future.cancel()
+        print(f"--- 보고서 {len(districts)}개 완료 (소요시간: {time.time() - start:.2f}초) ---")
+
     def generate_policy(self, user_prompt: str, **kwargs) -> str:
         district = kwargs.get("district", "전체")
         model_version = kwargs.get("model_version", "final")
 
-        stats_data = self.agent.tool_client.call_tool(
-            "check_stats",
-            {"district": district, "start_year": 2023, "end_year": 2030}
-        )
-
-        input_text = f"[참조 데이터: {stats_data}]\n지역: {district}"
-
-        return self._call_llama3(
-            instruction=POLICY_SYSTEM_PROMPT,
-            input_text=input_text,
-            model_version=model_version,
-            max_new_tokens=256,
-            temperature=0.3
+        text = pregenerated.lookup(
+            "policy", district, *POLICY_YEAR_RANGE, model_version, self._data_version()
         )
+        if text is None:
+            text = self._stale_pregenerated("policy", district, *POLICY_YEAR_RANGE, model_version)
+        if text is None:
+            text, _ = self.generate_policy_content(district, model_version)
+        return text
 
     def answer_qa_with_log(self, question: str, **kwargs) -> str:
         model_version = kwargs.get("model_version", "final")
         return run_qa(question, model_version=model_version)
 
-    def summarize_text(self, text: str, model_version: str = "final") -> str:
-        instruction = (
-            "너는 한국어 문서 요약기다. 반드시 한국어로만 답해라.\n"
-            "아래 본문을 핵심만 5줄 이내로 요약해라.\n"
-            "없는 내용은 만들지 말고, 너무 길면 더 압축해라."
-        )
+    SUMMARIZE_INSTRUCTION = (
+        "너는 한국어 문서 요약기다. 반드시 한국어로만 답해라.\n"
+        "아래 본문을 핵심만 5줄 이내로 요약해라.\n"
+        "없는 내용은 만들지 말고, 너무 길면 더 압축해라."
+    )
+
+    CHUNK_SUMMARIZE_INSTRUCTION = (
+        "너는 한국어 문서 요약기다. 반드시 한국어로만 답해라.\n"
+        "아래는 긴 문서의 일부다. 이 부분의 핵심(대상, 기준, 수치, 조건)을 3~5줄로 요약해라.\n"
+        "없는 내용은 만들지 마라."
+    )
+    MERGE_SUMMARIZE_INSTRUCTION = (
+        "너는 한국어 문서 요약기다. 반드시 한국어로만 답해라.\n"
+        "아래는 한 문서를 부분별로 요약한 것이다. 겹치는 내용은 합치고 문서 전체의 핵심만 5줄 이내로 요약해라.\n"
+        "없는 내용은 만들지 마라."
+    )
+    SUMMARIZE_MAX_ROUNDS = 3
+    # 첫 라운드 청크 수 상한 (넘으면 LLM 을 부르지 않고 거절) / 한 라운드 청크 요약 전체 제한 시간
+    SUMMARIZE_MAX_CHUNKS = int(os.getenv("SUMMARIZE_MAX_CHUNKS", "40"))
+    SUMMARIZE_MAP_TIMEOUT = float(os.getenv("SUMMARIZE_MAP_TIMEOUT", "240"))
+    MSG_SUMMARIZE_TOO_LONG = "본문이 너무 길어 요약할 수 없습니다. 나눠서 요청해 주세요."
+
+    def _summary_plan(self, text: str, model_version: str = "final") -> Tuple[str, str, Optional[str]]:
+        """마지막 요약 호출의 (instruction, input_text, 오류 메시지).
+        예산 안에 들어가면 그대로, 길면 청크별 요약(map)을 병렬로 끝낸 뒤 그 요약들을 합칠 입력을 만듦"""
+        if count_tokens(text) <= get_budget("summarize") - count_tokens(self.SUMMARIZE_INSTRUCTION):
+            return self.SUMMARIZE_INSTRUCTION, text, None
+
+        merged = text
+        chunk_budget = get_budget("summarize_map") - count_tokens(self.CHUNK_SUMMARIZE_INSTRUCTION)
+        merge_budget = get_budget("summarize") - count_tokens(self.MERGE_SUMMARIZE_INSTRUCTION)
+        for round_no in range(self.SUMMARIZE_MAX_ROUNDS):
+            chunks = split_to_budget(merged, chunk_budget)
+            if round_no == 0 and len(chunks) > self.SUMMARIZE_MAX_CHUNKS:
+                return self.MERGE_SUMMARIZE_INSTRUCTION, "", self.MSG_SUMMARIZE_TOO_LONG
+            summaries, error = self._summarize_chunks(chunks, model_version)
+            if error is not None:
+                return self.MERGE_SUMMARIZE_INSTRUCTION, "", error
+            merged = "\n\n".join(f"[부분 {i + 1}]\n{s}" for i, s in enumerate(summaries))
+            if count_tokens(merged) <= merge_budget:
+                break  # 부분 요약을 합친 것도 넘치면 한 번 더 나눠서 요약
+        else:
+            # 마지막 라운드 뒤에도 넘치면 잘라서 합치지 않음 (뒤쪽 부분이 빠진 요약이 됨)
+            return self.MERGE_SUMMARIZE_INSTRUCTION, "", self.MSG_SUMMARIZE_TOO_LONG
+        return self.MERGE_SUMMARIZE_INSTRUCTION, merged, None
+
+    def _summarize_chunks(self, chunks: list[str], model_version: str) -> Tuple[list[str], Optional[str]]:
+        """청크들을 summary_pool 로 동시에 요약 → 전체 시간 ≈ 가장 느린 청크.
+        요약은 (지시문 + 청크 내용) 해시로 캐시되므로 같은 문서를 다시 요약하면 바뀐 청크만 호출"""
+        start = time.time()
+        futures = [
+            self.summary_pool.submit(
+                self._generate,
+                self.CHUNK_SUMMARIZE_INSTRUCTION,
+                chunk,
+                model_version=model_version,
+                temperature=0.1,
+                max_new_tokens=200,
+                cache=True,
+                task_type="summarize_map",
+            )
+            for chunk in chunks
+        ]
+        _, not_done = wait(futures, timeout=self.SUMMARIZE_MAP_TIMEOUT)
+        if not_done:
+            for f in not_done:
+                f.cancel()  # 아직 시작 안 한 청크는 취소 (실행 중인 호출은 LLM 타임아웃으로 끝남)
+            print(f"--- 청크 요약 시간 초과 ({len(not_done)}/{len(chunks)}개 미완료) ---")
+            return [], MSG_TIMEOUT
+        results = [f.result() for f in futures]
+        print(f"--- 청크 요약 {len(chunks)}개 완료 (소요시간: {time.time() - start:.2f}초) ---")
+
+        for text, ok in results:
+            if not ok:
+                return [], text  # 일부만 요약하면 빠진 부분을 모른 채 합치게 되므로 실패로 처리
+        return [text for text, _ in results], None
 
+    def summarize_text(self, text: str, model_version: str = "final") -> str:
+        instruction, input_text, error = self._summary_plan(text, model_version)
+        if error is not None:
+            return error
         return self._call_llama3(
             instruction=instruction,
-            input_text=text,
+            input_text=input_text,
             model_version=model_version,
             temperature=0.1,
             max_new_tokens=256,
+            cache=True,
+            task_type="summarize",
         )
 
+    # ===== 스트리밍 버전: ("meta", dict) 한 번 뒤에 ("token", str) 을 순서대로 yield =====
+
+    def stream_report(self, district: str, start_year: int, end_year: int, model_version: str = "final"):
+        yield "meta", self._report_meta(district)
+        stored = pregenerated.lookup(
+            "report", district, start_year, end_year, model_version, self._data_version()
+        ) or self._stale_pregenerated("report", district, start_year, end_year, model_version)
+        if stored is not None:
+            yield "token", stored
+            return
+        stats_data, input_text = self._report_input(district, start_year, end_year)
+        for token in self._stream_llama3(
+            instruction=REPORT_SYSTEM_PROMPT,
+            input_text=input_text,
+            model_version=model_version,
+            max_new_tokens=256,
+            temperature=0.3,
+            cache=not self._is_tool_error(stats_data),
+            data_version=self._data_version(),
+            task_type="report",
+        ):
+            yield "token", token
+
+    def stream_policy(self, district: str, model_version: str = "final"):
+        yield "meta", {"district": district}
+        stored = pregenerated.lookup(
+            "policy", district, *POLICY_YEAR_RANGE, model_version, self._data_version()
+        ) or self._stale_pregenerated("policy", district, *POLICY_YEAR_RANGE, model_version)
+        if stored is not None:
+            yield "token", stored
+            return
+        stats_data, input_text = self._policy_input(district)
+        for token in self._stream_llama3(
+            instruction=POLICY_SYSTEM_PROMPT,
+            input_text=input_text,
+            model_version=model_version,
+            max_new_tokens=256,
+            temperature=0.3,
+            cache=not self._is_tool_error(stats_data),
+            data_version=self._data_version(),
+            task_type="policy",
+        ):
+            yield "token", token
+
+    def stream_qa(self, question: str, model_version: str = "final"):
+        yield "meta", {"question": question}
+        pdf_context = self.agent.tool_client.call_tool("rag_search", {"question": question})
+        instruction, input_text = build_answer_prompt(question, pdf_context)
+        for token in self._stream_llama3(
+            instruction=instruction,
+            input_text=input_text,
+            model_version=model_version,
+            max_new_tokens=256,
+            temperature=0.3,
+            task_type="qa",
+        ):
+            yield "token", token
+
+    def stream_summary(self, text: str, model_version: str = "final"):
+        yield "meta", {}
+        # 긴 문서는 청크 요약(map)까지 끝낸 뒤 합치는 단계만 스트리밍
+        instruction, input_text, error = self._summary_plan(text, model_version)
+        if error is not None:
+            raise LLMStreamError(error)
+        for token in self._stream_llama3(
+            instruction=instruction,
+            input_text=input_text,
+            model_version=model_version,
+            temperature=0.1,
+            max_new_tokens=256,
+            cache=True,
+            task_type="summarize",
+        ):
+            yield "token", token
+
 
 _genai_service_instance = None
 
@@ -0,0 +1,187 @@
+# LLM 응답 캐시 (메모리 LRU + SQLite 디스크 2단)
+# - 키: instruction / 입력 / model_version / temperature / max_new_tokens 의 해시
+# - 항목마다 TTL 과 예측 데이터 버전을 저장해서, 데이터가 바뀌면 자동으로 무효
+# - 오류 문자열은 호출하는 쪽(GenAIService)에서 저장하지 않음
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class LLMResponseCache:
+    def __init__(self, max_entries: int = 512, ttl: float = 86400.0, disk_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stale_hits = 0  # LLM 장애 시 만료/데이터 버전 무시하고 꺼낸 응답
+        self.stores = 0
+        self.saved_latency = 0.0  # 캐시 적중으로 아낀 원래 LLM 호출 시간 합계(초)
+
+        if self.disk_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.disk_path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL,"
+                    " model_version TEXT,"
+                    " data_version TEXT,"
+                    " latency REAL,"
+                    " expires_at REAL NOT NULL)"
+                )
+
+    def _connect(self):
+        return sqlite3.connect(self.disk_path, timeout=5.0)
+
+    @staticmethod
+    def make_key(
+        instruction: str,
+        input_text: str,
+        model_version: str,
+        temperature: float,
+        max_new_tokens: int,
+    ) -> str:
+        raw = json.dumps(
+            [instruction, input_text, model_version, float(temperature), int(max_new_tokens)],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, data_version: Optional[str] = None) -> Optional[str]:
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at, entry_data_version, _, latency = entry
+                if expires_at > now and entry_data_version == data_version:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    self.saved_latency += latency or 0.0
+                    return value
+                # 만료/버전 불일치 항목은 지우지 않고 LRU 로 밀려날 때까지 둠 (LLM 장애 시 get_stale 용)
+
+        if self.disk_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT value, model_version, data_version, latency, expires_at"
+                        " FROM llm_cache WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[LLM Cache] disk read error: {e}")
+                row = None
+
+            if row is not None:
+                value, model_version, entry_data_version, latency, expires_at = row
+                if expires_at > now and entry_data_version == data_version:
+                    with self._lock:
+                        self._remember(key, (value, expires_at, entry_data_version, model_version, latency))
+                        self.disk_hits += 1
+                        self.saved_latency += latency or 0.0
+                    return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def get_stale(self, key: str) -> Optional[str]:
+        """TTL / 데이터 버전과 상관없이 남아 있는 응답 (LLM 장애 시 대체 응답용)"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self.stale_hits += 1
+                return entry[0]
+
+        if self.disk_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                print(f"[LLM Cache] disk read error: {e}")
+                row = None
+            if row is not None:
+                with self._lock:
+                    self.stale_hits += 1
+                return row[0]
+        return None
+
+    def put(
+        self,
+        key: str,
+        value: str,
+        model_version: str,
+        data_version: Optional[str] = None,
+        latency: float = 0.0,
+    ) -> None:
+        expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._remember(key, (value, expires_at, data_version, model_version, latency))
+            self.stores += 1
+
+        if self.disk_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO llm_cache"
+                        " (key, value, model_version, data_version, latency, expires_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, value, model_version, data_version, latency, expires_at),
+                    )
+                    conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+            except sqlite3.Error as e:
+                print(f"[LLM Cache] disk write error: {e}")
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def invalidate(self, model_version: Optional[str] = None) -> None:
+        """model_version 을 주면 해당 모델의 항목만, 아니면 전부 삭제"""
+        with self._lock:
+            if model_version is None:
+                self._memory.clear()
+            else:
+                for k in [k for k, e in self._memory.items() if e[3] == model_version]:
+                    del self._memory[k]
+
+        if self.disk_path:
+            try:
+                with self._connect() as conn:
+                    if model_version is None:
+                        conn.execute("DELETE FROM llm_cache")
+                    else:
+                        conn.execute("DELETE FROM llm_cache WHERE model_version = ?", (model_version,))
+            except sqlite3.Error as e:
+                print(f"[LLM Cache] disk invalidate error: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "stores": self.stores,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "saved_latency_s": round(self.saved_latency, 3),
+                "disk_path": self.disk_path,
+            }
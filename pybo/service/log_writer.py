@@ -0,0 +1,226 @@
+# 감사 로그(GenAIChatLog / PredictionLog) 비동기 배치 저장
+# - 요청 처리 중에는 큐에 넣기만 함 → DB 커밋이 응답 지연에 들어가지 않음
+# - 백그라운드 스레드가 batch_size 개가 모이거나 flush_interval 초가 지나면 테이블별로 한 번에 INSERT
+# - 큐가 가득 차면 put_timeout 만큼만 기다리고 버림(dropped 로 집계) → 요청이 로그 때문에 막히지 않음
+# - 프로세스 종료 시(atexit) 남은 로그를 마저 저장
+# - 배치 INSERT 가 재시도 후에도 실패하면 한 건씩 다시 저장 → 잘못된 행 하나 때문에 배치 전체를 잃지 않음
+import atexit
+import queue
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from pybo import db
+from pybo.models import GenAIChatLog, PredictionLog
+
+_STOP = object()
+
+
+class LogWriter:
+    def __init__(
+        self,
+        app,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        put_timeout: float = 0.05,
+        retries: int = 2,
+    ):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.retries = retries
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"enqueued": 0, "written": 0, "dropped": 0, "batches": 0, "failed_batches": 0, "lost": 0}
+        self._flush_total = 0.0
+
+    # ===== 요청 경로 =====
+
+    def write(self, model, **values) -> bool:
+        """model 행 하나를 저장 예약. 큐가 가득 차서 버렸으면 False"""
+        if self._closed:
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put((model, values), timeout=self.put_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats["dropped"] += 1
+            return False
+        with self._stats_lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    def log_chat(self, task_type: str, question: str, answer: str,
+                 user_id: Optional[int] = None, page: Optional[str] = None) -> bool:
+        # page 는 클라이언트가 보낸 값 → 컬럼 길이를 넘으면 INSERT 가 실패(ORA-12899)하므로 큐에 넣기 전에 자름
+        return self.write(
+            GenAIChatLog,
+            user_id=user_id, page=_fit(page, GenAIChatLog.page), task_type=_fit(task_type, GenAIChatLog.task_type) or "",
+            question=question or "", answer=answer or "",
+        )
+
+    def log_prediction(self, region: str, year: int, predicted_value: float) -> bool:
+        return self.write(PredictionLog, region=region, year=year, predicted_value=predicted_value)
+
+    # ===== 백그라운드 저장 =====
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self._queue.get()  # 첫 항목은 무기한 대기
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if stopping:
+                # 종료 신호 뒤에 남은 것까지 전부
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+            if batch:
+                try:
+                    self._flush(batch)
+                except Exception as e:  # 저장 스레드는 죽지 않게
+                    print(f"[Log Writer] flush error: {e}")
+
+    def _flush(self, batch: list) -> None:
+        by_model: dict = {}
+        for model, values in batch:
+            by_model.setdefault(model, []).append(values)
+
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            try:
+                with self.app.app_context():
+                    for model, rows in by_model.items():
+                        db.session.execute(insert(model), rows)  # executemany (시퀀스 PK 는 INSERT 안에서 채번)
+                    db.session.commit()
+                break
+            except SQLAlchemyError as e:
+                with self.app.app_context():
+                    db.session.rollback()
+                print(f"[Log Writer] 저장 실패 ({len(batch)}건, 시도 {attempt + 1}): {e}")
+                if attempt == self.retries:
+                    with self._stats_lock:
+                        self._stats["failed_batches"] += 1
+                    self._flush_rows(by_model)
+                    return
+                time.sleep(0.5 * (2 ** attempt))
+
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["written"] += len(batch)
+            self._flush_total += time.perf_counter() - start
+
+    def _flush_rows(self, by_model: dict) -> None:
+        """배치 실패 시 한 건씩 저장 (실패한 행만 lost 로 집계)"""
+        written = lost = 0
+        with self.app.app_context():
+            for model, rows in by_model.items():
+                for values in rows:
+                    try:
+                        db.session.execute(insert(model), [values])
+                        db.session.commit()
+                        written += 1
+                    except SQLAlchemyError as e:
+                        db.session.rollback()
+                        lost += 1
+                        print(f"[Log Writer] {model.__tablename__} 1건 저장 실패: {e}")
+        with self._stats_lock:
+            self._stats["written"] += written
+            self._stats["lost"] += lost
+
+    def close(self, timeout: float = 10.0) -> None:
+        """남은 로그 저장 후 종료 (atexit)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("[Log Writer] 종료 시 큐가 가득 차 있어 일부 로그가 저장되지 않을 수 있습니다.")
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            s = dict(self._stats)
+            return {
+                **s,
+                "queue_depth": self._queue.qsize(),
+                "queue_max": self._queue.maxsize,
+                "batch_size": self.batch_size,
+                "flush_interval": self.flush_interval,
+                "avg_batch_size": round(s["written"] / s["batches"], 2) if s["batches"] else None,
+                "avg_flush_ms": round(self._flush_total / s["batches"] * 1000, 2) if s["batches"] else None,
+            }
+
+
+def _fit(value, column) -> Optional[str]:
+    """문자열 컬럼 길이(바이트 기준, Oracle VARCHAR2 기본)에 맞게 자름"""
+    if value is None:
+        return None
+    value = str(value)
+    length = column.type.length
+    if length is None or len(value.encode("utf-8")) <= length:
+        return value
+    return value.encode("utf-8")[:length].decode("utf-8", errors="ignore")
+
+
+def get_log_writer(app=None) -> Optional[LogWriter]:
+    """LOG_WRITER_ENABLED 가 꺼져 있으면 None"""
+    from flask import current_app
+
+    return (app or current_app).extensions.get("log_writer")
+
+
+def init_app(app) -> None:
+    if not app.config.get("LOG_WRITER_ENABLED", True):
+        return
+    writer = LogWriter(
+        app,
+        max_queue=app.config.get("LOG_WRITER_QUEUE_MAX", 10000),
+        batch_size=app.config.get("LOG_WRITER_BATCH_SIZE", 200),
+        flush_interval=app.config.get("LOG_WRITER_FLUSH_INTERVAL", 1.0),
+        put_timeout=app.config.get("LOG_WRITER_PUT_TIMEOUT", 0.05),
+    )
+    app.extensions["log_writer"] = writer
+    atexit.register(writer.close)
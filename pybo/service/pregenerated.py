@@ -0,0 +1,234 @@
+# 보고서/정책 사전 생성 (오프라인 배치) + 조회
+# - 조합: 자치구(25개 + 전체) x 연도 구간 x 모델 버전 → 결과를 genai_pregenerated 에 저장
+# - 키에 예측 데이터 버전이 들어가므로 ETL 후에는 자동으로 미스 → 실시간 생성 (배치를 다시 돌리면 채워짐)
+# - 배치는 이미 저장된 조합을 건너뛰므로 중간에 멈춰도 다시 실행하면 이어서 진행
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from pybo import db
+from pybo.models import GenAIPregenerated
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stale_hits": 0}
+
+
+def lookup(
+    task_type: str,
+    district: str,
+    start_year: int,
+    end_year: int,
+    model_version: str,
+    data_version: Optional[str],
+) -> Optional[str]:
+    """저장된 결과가 있으면 본문, 없거나 사용할 수 없으면 None"""
+    if data_version is None or not has_app_context():
+        return None
+    if not current_app.config.get("GENAI_PREGEN_ENABLED", True):
+        return None
+
+    try:
+        row = (
+            db.session.query(GenAIPregenerated.content)
+            .filter_by(
+                task_type=task_type,
+                district=district,
+                start_year=start_year,
+                end_year=end_year,
+                model_version=model_version,
+                data_version=data_version,
+            )
+            .first()
+        )
+    except SQLAlchemyError as e:  # 테이블 미생성 등
+        db.session.rollback()
+        print(f"[Pregen] lookup error: {e}")
+        return None
+
+    with _stats_lock:
+        _stats["hits" if row else "misses"] += 1
+    return row[0] if row else None
+
+
+def lookup_many(
+    task_type: str,
+    districts: list[str],
+    start_year: int,
+    end_year: int,
+    model_version: str,
+    data_version: Optional[str],
+) -> dict[str, str]:
+    """여러 자치구를 한 번에 조회 → {자치구: 본문} (저장된 것만)"""
+    if data_version is None or not districts or not has_app_context():
+        return {}
+    if not current_app.config.get("GENAI_PREGEN_ENABLED", True):
+        return {}
+
+    try:
+        rows = (
+            db.session.query(GenAIPregenerated.district, GenAIPregenerated.content)
+            .filter(GenAIPregenerated.district.in_(districts))
+            .filter_by(
+                task_type=task_type,
+                start_year=start_year,
+                end_year=end_year,
+                model_version=model_version,
+                data_version=data_version,
+            )
+            .all()
+        )
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"[Pregen] lookup error: {e}")
+        return {}
+
+    found = {district: content for district, content in rows}
+    with _stats_lock:
+        _stats["hits"] += len(found)
+        _stats["misses"] += len(set(districts)) - len(found)
+    return found
+
+
+def lookup_latest(
+    task_type: str,
+    district: str,
+    start_year: int,
+    end_year: int,
+    model_version: str,
+) -> Optional[str]:
+    """데이터 버전과 상관없이 가장 최근 결과 (LLM 장애 시 대체 응답용)"""
+    if not has_app_context() or not current_app.config.get("GENAI_PREGEN_ENABLED", True):
+        return None
+
+    try:
+        row = (
+            db.session.query(GenAIPregenerated.content)
+            .filter_by(
+                task_type=task_type,
+                district=district,
+                start_year=start_year,
+                end_year=end_year,
+                model_version=model_version,
+            )
+            .order_by(GenAIPregenerated.created_at.desc())
+            .first()
+        )
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"[Pregen] lookup error: {e}")
+        return None
+
+    if row:
+        with _stats_lock:
+            _stats["stale_hits"] += 1
+    return row[0] if row else None
+
+
+def save(
+    task_type: str,
+    district: str,
+    start_year: int,
+    end_year: int,
+    model_version: str,
+    data_version: str,
+    content: str,
+    elapsed: Optional[float] = None,
+) -> bool:
+    db.session.add(GenAIPregenerated(
+        task_type=task_type,
+        district=district,
+        start_year=start_year,
+        end_year=end_year,
+        model_version=model_version,
+        data_version=data_version,
+        content=content,
+        elapsed=elapsed,
+    ))
+    try:
+        db.session.commit()
+        return True
+    except IntegrityError:  # 다른 배치가 먼저 저장
+        db.session.rollback()
+        return False
+
+
+def get_stats() -> dict:
+    with _stats_lock:
+        lookups = _stats["hits"] + _stats["misses"]  # stale_hits 는 misses 이후 대체 조회
+        return {
+            **_stats,
+            "hit_ratio": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+def stored_keys(data_version: str) -> set[tuple]:
+    rows = (
+        db.session.query(
+            GenAIPregenerated.task_type,
+            GenAIPregenerated.district,
+            GenAIPregenerated.start_year,
+            GenAIPregenerated.end_year,
+            GenAIPregenerated.model_version,
+        )
+        .filter(GenAIPregenerated.data_version == data_version)
+        .all()
+    )
+    return {tuple(r) for r in rows}
+
+
+def enumerate_combinations(
+    districts: Iterable[str],
+    year_ranges: Iterable[tuple[int, int]],
+    model_versions: Iterable[str],
+    policy_year_range: tuple[int, int],
+    task_types: Iterable[str] = ("report", "policy"),
+) -> list[tuple]:
+    """(task_type, district, start_year, end_year, model_version) 목록"""
+    combos = []
+    for model_version in model_versions:
+        for district in districts:
+            if "report" in task_types:
+                for start_year, end_year in year_ranges:
+                    combos.append(("report", district, start_year, end_year, model_version))
+            if "policy" in task_types:
+                combos.append(("policy", district, *policy_year_range, model_version))
+    return combos
+
+
+def run_batch(app, service, combos: list[tuple], data_version: str, workers: int = 2) -> dict:
+    """조합들을 최대 workers 개씩 병렬 생성. 이미 저장된 조합은 건너뜀"""
+    with app.app_context():
+        done_keys = stored_keys(data_version)
+    todo = [c for c in combos if c not in done_keys]
+    print(f"[Pregen] data_version={data_version} 전체 {len(combos)}건, 완료 {len(combos) - len(todo)}건, 남은 {len(todo)}건")
+
+    def generate(combo):
+        task_type, district, start_year, end_year, model_version = combo
+        with app.app_context():
+            start = time.time()
+            if task_type == "report":
+                text, ok = service.generate_report_content(district, start_year, end_year, model_version)
+            else:
+                text, ok = service.generate_policy_content(district, model_version)
+            elapsed = time.time() - start
+            if ok and text:
+                save(task_type, district, start_year, end_year, model_version, data_version, text, elapsed)
+            return combo, ok, elapsed
+
+    result = {"total": len(combos), "skipped": len(combos) - len(todo), "generated": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(generate, c) for c in todo]
+        for i, future in enumerate(as_completed(futures), 1):
+            try:
+                combo, ok, elapsed = future.result()
+            except Exception as e:
+                print(f"[Pregen] error: {e}")
+                result["failed"] += 1
+                continue
+            result["generated" if ok else "failed"] += 1
+            print(f"[Pregen] {i}/{len(todo)} {'OK ' if ok else 'FAIL'} {combo} ({elapsed:.1f}s)")
+    return result
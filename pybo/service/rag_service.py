@@ -1,6 +1,6 @@
 import os
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
@@ -105,7 +105,27 @@ class RagService:
         )
 
         docs = retriever.invoke(question)
+        return self._format_docs(docs)
 
+    def get_relevant_contexts(self, questions: List[str]) -> List[str]:
+        """여러 질문을 한 번에 검색 (질문 임베딩은 한 번의 배치로 계산). 결과는 질문 순서대로"""
+        if not self.vector_db:
+            return ["참조할 수 있는 운영 지침 데이터가 없습니다."] * len(questions)
+        if not questions:
+            return []
+
+        vectors = self.embeddings.embed_documents(list(questions))
+        contexts = []
+        for question, vector in zip(questions, vectors):
+            doc_type = self._route_doc_type(question)
+            docs = self.vector_db.similarity_search_by_vector(
+                vector, k=3, filter={"doc_type": doc_type} if doc_type else None
+            )
+            contexts.append(self._format_docs(docs))
+        return contexts
+
+    @staticmethod
+    def _format_docs(docs) -> str:
         if not docs:
             return "관련 법령/지침 근거를 찾지 못했습니다."
 
@@ -1,13 +1,18 @@
 # RegionData / RegionForecast 테이블에 직접적으로 가는 계층
-from sqlalchemy import func, distinct
+from sqlalchemy import func, distinct, literal_column, null, select, union_all
+from pybo.analytics_mirror import read_session
 from pybo.models import RegionData, RegionForecast
 
 class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데이트 조회하기 위한 클래스 (서비스 계층에서 사용)
 
+    # 읽기 전용 조회는 로컬 미러(설정 시) 또는 기본 DB 세션으로
+    def _query(self, model):
+        return read_session().query(model)
+
     # 대시보드용 집계 데이터
     def get_dashboard_rows(self, district: str | None, start_year: int | None, end_year: int | None):
 
-        query = RegionData.query
+        query = self._query(RegionData)
 
         if district and district != "전체":
             query = query.filter(RegionData.district == district)
@@ -32,7 +37,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 자치구 목록
     def get_district_rows(self):
         rows = (
-            RegionData.query
+            self._query(RegionData)
             .with_entities(distinct(RegionData.district))
             .order_by(RegionData.district)
             .all()
@@ -42,7 +47,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 특정 구 1건 실측
     def get_region_row(self, year: int, district: str):
         return(
-            RegionData.query
+            self._query(RegionData)
             .filter(RegionData.year == year,
                     RegionData.district == district)
             .first()
@@ -51,7 +56,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 특정 구 1건 예측
     def get_forecast_row(self, year: int, district: str):
         return(
-            RegionForecast.query
+            self._query(RegionForecast)
             .filter(RegionForecast.year == year,
                     RegionForecast.district == district)
             .first()
@@ -60,7 +65,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 전체 합계 (실측: 이용자, 시설)
     def get_total_region_child_user_facility(self, year: int):
         return(
-            RegionData.query
+            self._query(RegionData)
             .filter(RegionData.year == year)
             .with_entities(
                 func.sum(RegionData.child_user).label("child_user"),
@@ -72,7 +77,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 전체 예측 합계
     def get_total_forecast_child_user(self, year: int):
         return (
-            RegionForecast.query
+            self._query(RegionForecast)
             .filter(RegionForecast.year == year)
             .with_entities(
                 func.sum(RegionForecast.predicted_child_user).label("child_user"),
@@ -83,7 +88,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 전년 전체 합계 (실측)
     def get_region_sum_child_user(self, year: int):
         return (
-            RegionData.query
+            self._query(RegionData)
             .filter(RegionData.year == year)
             .with_entities(
                 func.sum(RegionData.child_user).label("child_user"),
@@ -94,7 +99,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 전년 전체 합계 (예측)
     def get_forecast_sum_child_user(self, year:int):
         return (
-            RegionForecast.query
+            self._query(RegionForecast)
             .filter(RegionForecast.year == year)
             .with_entities(
                 func.sum(RegionForecast.predicted_child_user).label("child_user"),
@@ -105,7 +110,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 서울평균 (실측)
     def get_seoul_avg_region(self, year: int):
         return (
-            RegionData.query
+            self._query(RegionData)
             .filter(RegionData.year == year)
             .with_entities(
                 func.sum(RegionData.child_user).label("total_child_user"),
@@ -117,7 +122,7 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
     # 서울평균 (예측)
     def get_seoul_avg_forecast(self, year: int):
         return (
-            RegionForecast.query
+            self._query(RegionForecast)
             .filter(RegionForecast.year == year)
             .with_entities(
                 func.sum(RegionForecast.predicted_child_user).label("total_child_user"),
@@ -126,50 +131,181 @@ class RegionRepository: # 대시보드, 자치구 목록 등 지역 관련 데
             .first()
         )
 
-    # 특정 구 실측 시계열(2015~2022)
-    def get_region_series_actual(self, district: str):
-        return (
-            RegionData.query
-            .filter(RegionData.district == district)
-            .filter(RegionData.year.between(2015, 2022))
-            .order_by(RegionData.year.asc())
-            .all()
+    # 실측(2015~2022) + 예측(2023~) 시계열을 UNION ALL 한 번으로 조회
+    # districts=None 이면 서울시 전체 합계, 아니면 (district, year, value, is_pred) 튜플을 구/연도 순으로 반환
+    def get_series_union(self, districts: list[str] | None = None):
+        if districts is None:
+            actual = (
+                select(
+                    RegionData.year.label("year"),
+                    func.sum(RegionData.child_user).label("value"),
+                    literal_column("0").label("is_pred"),
+                )
+                .where(RegionData.year.between(2015, 2022))
+                .group_by(RegionData.year)
+                .having(func.sum(RegionData.child_user).isnot(None))
+            )
+            forecast = (
+                select(
+                    RegionForecast.year.label("year"),
+                    func.sum(RegionForecast.predicted_child_user).label("value"),
+                    literal_column("1").label("is_pred"),
+                )
+                .where(RegionForecast.year >= 2023)
+                .group_by(RegionForecast.year)
+                .having(func.sum(RegionForecast.predicted_child_user).isnot(None))
+            )
+            u = union_all(actual, forecast).subquery()
+            stmt = select(u.c.year, u.c.value, u.c.is_pred).order_by(u.c.year, u.c.is_pred)
+            return read_session().execute(stmt).all()
+
+        actual = (
+            select(
+                RegionData.district.label("district"),
+                RegionData.year.label("year"),
+                RegionData.child_user.label("value"),
+                literal_column("0").label("is_pred"),
+            )
+            .where(RegionData.district.in_(districts))
+            .where(RegionData.year.between(2015, 2022))
+            .where(RegionData.child_user.isnot(None))
         )
+        forecast = (
+            select(
+                RegionForecast.district.label("district"),
+                RegionForecast.year.label("year"),
+                RegionForecast.predicted_child_user.label("value"),
+                literal_column("1").label("is_pred"),
+            )
+            .where(RegionForecast.district.in_(districts))
+            .where(RegionForecast.year >= 2023)
+            .where(RegionForecast.predicted_child_user.isnot(None))
+        )
+        u = union_all(actual, forecast).subquery()
+        stmt = (
+            select(u.c.district, u.c.year, u.c.value, u.c.is_pred)
+            .order_by(u.c.district, u.c.year, u.c.is_pred)
+        )
+        return read_session().execute(stmt).all()
+
+    # 보고서 참조용 예측 이용자 수: 여러 구 + (include_total 이면) 서울시 전체 연도별 합계를 UNION ALL 한 번으로
+    # (district, year, value) 튜플을 구/연도 순으로 반환 (전체 합계의 district 는 "전체")
+    def get_report_forecast_rows(self, districts: list[str], start_year: int, end_year: int, include_total: bool = False):
+        parts = []
+        if districts:
+            parts.append(
+                select(
+                    RegionForecast.district.label("district"),
+                    RegionForecast.year.label("year"),
+                    RegionForecast.predicted_child_user.label("value"),
+                )
+                .where(RegionForecast.district.in_(districts))
+                .where(RegionForecast.year.between(start_year, end_year))
+            )
+        if include_total:
+            parts.append(
+                select(
+                    literal_column("'전체'").label("district"),
+                    RegionForecast.year.label("year"),
+                    func.sum(RegionForecast.predicted_child_user).label("value"),
+                )
+                .where(RegionForecast.year.between(start_year, end_year))
+                .group_by(RegionForecast.year)
+            )
+
+        if not parts:
+            return []
+
+        u = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+        stmt = select(u.c.district, u.c.year, u.c.value).order_by(u.c.district, u.c.year)
+        return read_session().execute(stmt).all()
 
-    # 특정 구 예측 시계열(2023~)
-    def get_region_series_forecast(self, district: str):
+    # 예측 데이터 버전 판별용 요약 (건수, 최종 생성 시각, 합계)
+    def get_forecast_version_row(self):
         return (
-            RegionForecast.query
-            .filter(RegionForecast.district == district)
-            .filter(RegionForecast.year >= 2023)
-            .order_by(RegionForecast.year.asc())
-            .all()
+            self._query(RegionForecast)
+            .with_entities(
+                func.count(RegionForecast.id).label("row_count"),
+                func.max(RegionForecast.created_at).label("last_created"),
+                func.sum(RegionForecast.predicted_child_user).label("total"),
+            )
+            .first()
         )
 
-    # 전체 실측 합계 시계열(2015~2022)
-    def get_total_series_actual(self):
+    # 예측 번들용 실측 전체 (2015~2022, ORM 객체 대신 튜플로 조회)
+    def get_bundle_actual_rows(self):
         return (
-            RegionData.query
+            self._query(RegionData)
             .with_entities(
-                RegionData.year.label("year"),
-                func.sum(RegionData.child_user).label("child_user"),
+                RegionData.district,
+                RegionData.year,
+                RegionData.child_user,
+                RegionData.child_facility,
+                RegionData.single_parent,
+                RegionData.basic_beneficiaries,
+                RegionData.multicultural_hh,
+                RegionData.academy_cnt,
+                RegionData.grdp,
+                RegionData.population,
             )
             .filter(RegionData.year.between(2015, 2022))
-            .group_by(RegionData.year)
-            .order_by(RegionData.year.asc())
+            .order_by(RegionData.district.asc(), RegionData.year.asc())
             .all()
         )
 
-    # 전체 예측 합계 시계열(2023~)
-    def get_total_series_forecast(self):
+    # 예측 번들용 예측 전체 (2023~)
+    def get_bundle_forecast_rows(self):
         return (
-            RegionForecast.query
+            self._query(RegionForecast)
             .with_entities(
-                RegionForecast.year.label("year"),
-                func.sum(RegionForecast.predicted_child_user).label("child_user"),
+                RegionForecast.district,
+                RegionForecast.year,
+                RegionForecast.predicted_child_user,
+                RegionForecast.single_parent,
+                RegionForecast.basic_beneficiaries,
+                RegionForecast.multicultural_hh,
+                RegionForecast.academy_cnt,
+                RegionForecast.grdp,
             )
             .filter(RegionForecast.year >= 2023)
-            .group_by(RegionForecast.year)
-            .order_by(RegionForecast.year.asc())
+            .order_by(RegionForecast.district.asc(), RegionForecast.year.asc())
             .all()
-        )
\ No newline at end of file
+        )
+
+    # 자치구 비교용 큐브: 전체 구 x 연도 범위의 지표를 한 번에 조회
+    # metrics: {지표명: (실측 컬럼명, 예측 컬럼명 또는 None)}
+    def get_compare_rows(self, metrics: dict, start_year: int, end_year: int):
+        parts = []
+
+        if start_year <= 2022:
+            parts.append(
+                select(
+                    RegionData.district.label("district"),
+                    RegionData.year.label("year"),
+                    *[
+                        getattr(RegionData, actual_col).label(name)
+                        for name, (actual_col, _) in metrics.items()
+                    ],
+                )
+                .where(RegionData.year.between(start_year, min(end_year, 2022)))
+            )
+
+        if end_year >= 2023:
+            parts.append(
+                select(
+                    RegionForecast.district.label("district"),
+                    RegionForecast.year.label("year"),
+                    *[
+                        (getattr(RegionForecast, forecast_col) if forecast_col else null()).label(name)
+                        for name, (_, forecast_col) in metrics.items()
+                    ],
+                )
+                .where(RegionForecast.year.between(max(start_year, 2023), end_year))
+            )
+
+        if not parts:
+            return []
+
+        u = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+        stmt = select(*u.c).order_by(u.c.district, u.c.year)
+        return read_session().execute(stmt).all()
@@ -0,0 +1,183 @@
+# 같은 키의 동시 호출 합치기 (single-flight)
+# - 먼저 들어온 호출(leader)만 실제로 실행하고, 실행 중에 들어온 같은 키 호출은 그 결과를 같이 받음
+# - leader 에서 난 예외(Exception)는 기다리던 호출마다 새 예외로 만들어 전달 (원래 예외를 __cause__ 로 연결)
+# - leader 가 취소/중단(CancelledError 등 BaseException)되면 그 예외는 전달하지 않고, 기다리던 호출 중 하나가 새 leader 가 됨
+# - 기다리는 쪽: 동기(do)는 threading.Event, 비동기(ado)는 자기 루프의 Future (executor 스레드를 붙잡지 않음)
+# - 결과를 보관하지는 않음 (끝나는 순간 키 삭제) → 캐시와는 별개
+import asyncio
+import copy
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlightTimeout(TimeoutError):
+    pass
+
+
+class SingleFlightError(RuntimeError):
+    """leader 예외를 복사할 수 없을 때 기다리던 호출에 대신 전달하는 예외"""
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "abandoned", "waiters", "async_waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[Exception] = None
+        self.abandoned = False  # leader 가 결과 없이 취소/중단됨 → 기다리던 호출이 다시 시도
+        self.waiters = 0
+        self.async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+        self.calls = 0
+        self.executed = 0      # 실제로 업스트림까지 간 호출
+        self.shared = 0        # 다른 호출 결과를 받아서 아낀 업스트림 호출
+        self.errors = 0
+        self.timeouts = 0
+        self.promoted = 0      # leader 가 취소돼서 기다리던 호출이 다시 실행한 횟수
+
+    def do(self, key: str, fn: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """key 로 fn() 을 실행. 같은 key 가 실행 중이면 최대 timeout 초 기다렸다가 그 결과를 반환"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self.calls += 1
+
+        while True:
+            call, leader, _ = self._join(key)
+            if leader:
+                try:
+                    call.result = fn()
+                    return call.result
+                except Exception as e:
+                    self._fail(call, e)
+                    raise
+                except BaseException:
+                    call.abandoned = True
+                    raise
+                finally:
+                    self._finish(key, call)
+
+            if not call.event.wait(self._remaining(deadline)):
+                self._timed_out(timeout)
+            if not call.abandoned:
+                return self._shared_result(call)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """do() 의 asyncio 버전. 스레드/이벤트 루프가 달라도 같은 키면 합쳐짐"""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self.calls += 1
+
+        while True:
+            call, leader, waiter = self._join(key, loop)
+            if leader:
+                try:
+                    call.result = await fn()
+                    return call.result
+                except Exception as e:
+                    self._fail(call, e)
+                    raise
+                except BaseException:
+                    call.abandoned = True
+                    raise
+                finally:
+                    self._finish(key, call)
+
+            # leader 가 끝나면 call_soon_threadsafe 로 깨워 줌 (기다리는 동안 스레드를 쓰지 않음)
+            try:
+                await asyncio.wait_for(waiter, self._remaining(deadline))
+            except asyncio.TimeoutError:
+                self._timed_out(timeout)
+            if not call.abandoned:
+                return self._shared_result(call)
+
+    # ===== 내부 =====
+
+    def _join(self, key: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """(call, leader 여부, 비동기 대기용 Future). 실행 중인 같은 키가 없으면 leader"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                return call, True, None
+            call.waiters += 1
+            waiter = None
+            if loop is not None:
+                waiter = loop.create_future()
+                call.async_waiters.append((loop, waiter))
+            return call, False, waiter
+
+    def _fail(self, call: _Call, error: Exception) -> None:
+        call.error = error
+        with self._lock:
+            self.errors += 1
+
+    def _finish(self, key: str, call: _Call) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            if call.abandoned and call.waiters:
+                self.promoted += 1
+            waiters, call.async_waiters = call.async_waiters, []
+        call.event.set()
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:  # 기다리던 루프가 이미 닫힘
+                pass
+
+    def _shared_result(self, call: _Call):
+        with self._lock:
+            self.shared += 1
+        if call.error is not None:
+            raise self._copy_error(call.error) from call.error
+        return call.result
+
+    def _copy_error(self, error: Exception) -> Exception:
+        """같은 예외 객체를 여러 스레드에서 다시 올리지 않도록 호출마다 새로 만듦"""
+        try:
+            fresh = copy.copy(error)
+        except Exception:
+            fresh = None
+        if not isinstance(fresh, Exception) or fresh is error:
+            fresh = SingleFlightError(f"{self.name}: 같은 요청 처리 중 오류 ({type(error).__name__}: {error})")
+        fresh.__traceback__ = None
+        return fresh
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def _timed_out(self, timeout: Optional[float]) -> None:
+        with self._lock:
+            self.timeouts += 1
+        raise SingleFlightTimeout(f"{self.name}: 같은 요청 대기 시간 초과 ({timeout}s)")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "saved": self.shared,
+                "errors": self.errors,
+                "waiter_timeouts": self.timeouts,
+                "promoted": self.promoted,
+                "in_flight": len(self._calls),
+            }
@@ -0,0 +1,167 @@
+# 요청 단위 SQL 계측 (쿼리 수, DB 시간, 느린 쿼리, N+1 의심 경고)
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST_RE = re.compile(r"\(\s*(?:[:?%][\w()]*\s*,\s*)+[:?%][\w()]*\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+_listeners_installed = False
+_history_lock = threading.Lock()
+_history: deque = deque(maxlen=200)
+_endpoint_totals: dict[str, dict] = {}
+
+
+def statement_shape(statement: str) -> str:
+    """리터럴/IN 목록/공백 차이를 지운 SQL 모양 (같은 모양 반복 = N+1 의심)"""
+    shape = _STRING_RE.sub("?", statement)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+class RequestSqlStats:
+    def __init__(self, slowest_n: int = 5):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_n = slowest_n
+        self.slowest: list[tuple[float, str]] = []
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+        self.slowest.append((elapsed, statement))
+        self.slowest.sort(key=lambda x: x[0], reverse=True)
+        del self.slowest[self.slowest_n:]
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def to_dict(self) -> dict:
+        return {
+            "query_count": self.count,
+            "db_time_ms": round(self.total_time * 1000, 3),
+            "slowest": [
+                {"time_ms": round(t * 1000, 3), "statement": _SPACE_RE.sub(" ", s).strip()}
+                for t, s in self.slowest
+            ],
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("sql_stats_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    if not has_request_context():
+        return
+    stats = g.get("sql_stats")
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(context):
+    # 실행 중 오류면 after_cursor_execute 가 불리지 않음 → 쌓인 시작 시각을 버림 (커넥션 재사용 시 어긋나지 않게)
+    if context.connection is None or context.statement is None:  # 연결 실패 등 문장 실행 전 오류
+        return
+    starts = context.connection.info.get("sql_stats_start")
+    if starts:
+        starts.pop()
+
+
+def _start_request():
+    g.sql_stats = RequestSqlStats(slowest_n=current_app.config.get("SQL_STATS_SLOWEST_N", 5))
+
+
+def _finish_request(response):
+    stats = g.get("sql_stats")
+    if stats is None:
+        return response
+
+    threshold = current_app.config.get("SQL_N_PLUS_ONE_THRESHOLD", 10)
+    repeated = stats.repeated(threshold)
+    for shape, n in repeated:
+        current_app.logger.warning(
+            "[SQL N+1?] %s %s: 같은 쿼리가 %d회 실행됨 -> %s",
+            request.method, request.path, n, shape[:300],
+        )
+
+    if current_app.config.get("SQL_STATS_HEADER", True):
+        response.headers["X-SQL-Stats"] = (
+            f"count={stats.count}; time_ms={stats.total_time * 1000:.1f}"
+        )
+
+    entry = {
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "status": response.status_code,
+        **stats.to_dict(),
+        "repeated": [{"shape": s, "count": n} for s, n in repeated],
+    }
+    key = request.endpoint or request.path
+    with _history_lock:
+        _history.append(entry)
+        totals = _endpoint_totals.setdefault(
+            key, {"requests": 0, "query_count": 0, "db_time_ms": 0.0, "max_query_count": 0}
+        )
+        totals["requests"] += 1
+        totals["query_count"] += stats.count
+        totals["db_time_ms"] += stats.total_time * 1000
+        totals["max_query_count"] = max(totals["max_query_count"], stats.count)
+    return response
+
+
+def get_stats(limit: int = 50) -> dict:
+    with _history_lock:
+        recent = list(_history)[-limit:]
+        endpoints = {
+            k: {
+                **v,
+                "db_time_ms": round(v["db_time_ms"], 3),
+                "avg_query_count": round(v["query_count"] / v["requests"], 2),
+            }
+            for k, v in _endpoint_totals.items()
+        }
+    return {"endpoints": endpoints, "recent": recent[::-1]}
+
+
+def reset_stats() -> None:
+    with _history_lock:
+        _history.clear()
+        _endpoint_totals.clear()
+
+
+def init_app(app):
+    global _listeners_installed, _history
+
+    if not app.config.get("SQL_STATS_ENABLED", False):
+        return
+
+    # Engine 클래스에 한 번만 등록하면 앱/MCP 등 모든 엔진에 적용됨
+    if not _listeners_installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _listeners_installed = True
+
+    with _history_lock:
+        _history = deque(_history, maxlen=app.config.get("SQL_STATS_HISTORY", 200))
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
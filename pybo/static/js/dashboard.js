@@ -32,10 +32,20 @@ $(function () {
         }
     }
 
-    function renderDashboardTable(items) {
+    // 컬럼형 응답({year: [...], child_user: [...], ...})을 행 배열로 변환
+    function seriesToRows(series) {
+        if (!series || !series.year) return [];
+        return series.year.map((y, i) => ({
+            year: y,
+            child_user: series.child_user[i],
+            child_facility: series.child_facility[i]
+        }));
+    }
+
+    function renderDashboardTable(series) {
         const $placeholder = $('#dashboard-table');
 
-        const filtered = (items || []).filter(row => {
+        const filtered = seriesToRows(series).filter(row => {
             const y = Number(row.year);
             return y >= 2015 && y <= 2022;
         });
@@ -131,7 +141,7 @@ $(function () {
                 $('#dashboard-summary').text(summary);
 
                 if (data.success) {
-                    renderDashboardTable(data.items);
+                    renderDashboardTable(data.series);
                 } else {
                     alert('데이터 로드 실패: ' + (data.error || '알 수 없는 오류'));
                 }
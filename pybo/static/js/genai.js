@@ -24,6 +24,56 @@ document.addEventListener("DOMContentLoaded", function () {
         return document.getElementById("regionSelect")?.value || "전체";
     }
 
+    // SSE 스트리밍 호출: 토큰이 올 때마다 onEvent(event, data) 호출
+    // 스트리밍 엔드포인트를 쓸 수 없으면(응답이 event-stream 이 아님) null 반환 → 기존 JSON API 로 대체
+    async function streamSSE(url, body, onEvent) {
+        let resp;
+        try {
+            resp = await fetch(url, {
+                method: "POST",
+                headers: { "Content-Type": "application/json", "Accept": "text/event-stream" },
+                body: JSON.stringify(body),
+            });
+        } catch (err) {
+            return null;
+        }
+        if (!resp.ok || !resp.body || !(resp.headers.get("Content-Type") || "").includes("text/event-stream")) {
+            return null;
+        }
+
+        const reader = resp.body.getReader();
+        const decoder = new TextDecoder("utf-8");
+        let buffer = "";
+        let text = "";
+        let error = null;
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let idx;
+            while ((idx = buffer.indexOf("\n\n")) >= 0) {
+                const raw = buffer.slice(0, idx);
+                buffer = buffer.slice(idx + 2);
+
+                let event = "message";
+                let dataLines = [];
+                raw.split("\n").forEach(line => {
+                    if (line.startsWith("event:")) event = line.slice(6).trim();
+                    else if (line.startsWith("data:")) dataLines.push(line.slice(5).trim());
+                });
+                let data = {};
+                try { data = JSON.parse(dataLines.join("\n") || "{}"); } catch (err) { continue; }
+
+                if (event === "token") text += data.text || "";
+                if (event === "error") error = data.error || "오류";
+                onEvent(event, data, text);
+            }
+        }
+        return { text: text, error: error };
+    }
+
     // 모델 교체 + UI 업데이트
     // ※ switch-model은 RunPod가 전역 모델 스위치를 지원할 때만 의미 있음.
     async function updateModelSettingsUI() {
@@ -183,15 +233,24 @@ document.addEventListener("DOMContentLoaded", function () {
                 resultArea.textContent = "생성 중...";
             }
 
+            const body = {
+                prompt: input.value,
+                district: getSelectedDistrict(),
+                model_version: getModelVer()
+            };
+
             try {
+                const streamed = await streamSSE("/genai-api/policy/stream", body, function (event, data, text) {
+                    if (!resultArea) return;
+                    if (event === "token") resultArea.textContent = text;
+                    if (event === "error") resultArea.textContent = data.error || "오류";
+                });
+                if (streamed) return;
+
                 const resp = await fetch("/genai-api/policy", {
                     method: "POST",
                     headers: { "Content-Type": "application/json" },
-                    body: JSON.stringify({
-                        prompt: input.value,
-                        district: getSelectedDistrict(),
-                        model_version: getModelVer()
-                    }),
+                    body: JSON.stringify(body),
                 });
 
                 const data = await resp.json();
@@ -234,14 +293,22 @@ document.addEventListener("DOMContentLoaded", function () {
                 chat.scrollTop = chat.scrollHeight;
             }
 
+            const body = { question: q, model_version: getModelVer() };
+
             try {
+                const streamed = await streamSSE("/genai-api/qa/stream", body, function (event, data, text) {
+                    const bubble = document.getElementById(tempLoadingId);
+                    if (!bubble) return;
+                    if (event === "token") bubble.textContent = text;
+                    if (event === "error") bubble.textContent = data.error || "답변 생성 오류";
+                    if (chat) chat.scrollTop = chat.scrollHeight;
+                });
+                if (streamed) return;
+
                 const resp = await fetch("/genai-api/qa", {
                     method: "POST",
                     headers: { "Content-Type": "application/json" },
-                    body: JSON.stringify({
-                        question: q,
-                        model_version: getModelVer()
-                    }),
+                    body: JSON.stringify(body),
                 });
 
                 const data = await resp.json();
@@ -279,6 +346,13 @@ document.addEventListener("DOMContentLoaded", function () {
             if (resultText) resultText.textContent = "문서를 분석하여 요약 중입니다. 잠시만 기다려 주세요...";
 
             try {
+                const streamed = await streamSSE("/genai-api/summarize/stream", { text: input.value }, function (event, data, text) {
+                    if (!resultText) return;
+                    if (event === "token") resultText.textContent = text;
+                    if (event === "error") resultText.textContent = "오류: " + (data.error || "");
+                });
+                if (streamed) return;
+
                 const resp = await fetch("/genai-api/summarize", {
                     method: "POST",
                     headers: { "Content-Type": "application/json" },
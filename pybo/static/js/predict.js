@@ -343,6 +343,135 @@ $(function () {
         });
     }
 
+    // ===== 예측 번들 (전체 연도/자치구를 한 번만 받아서 클라이언트에서 전환) =====
+    const BUNDLE_STORAGE_KEY = 'predictBundle';
+    let bundlePromise = null;
+
+    function loadPredictBundle() {
+        if (bundlePromise) return bundlePromise;
+
+        let cached = null;
+        try {
+            cached = JSON.parse(localStorage.getItem(BUNDLE_STORAGE_KEY));
+        } catch (e) {
+            cached = null;
+        }
+
+        const headers = {};
+        if (cached && cached.version) {
+            headers['If-None-Match'] = `"${cached.version}"`;
+        }
+
+        bundlePromise = fetch('/data/predict-bundle', { headers: headers })
+            .then(res => {
+                // 버전이 같으면 서버는 본문 없이 304만 보냄
+                if (res.status === 304 && cached) return cached;
+                if (!res.ok) throw new Error('HTTP ' + res.status);
+                return res.json().then(data => {
+                    if (!data.success) throw new Error(data.error || 'bundle error');
+                    try {
+                        localStorage.setItem(BUNDLE_STORAGE_KEY, JSON.stringify(data));
+                    } catch (e) {
+                        console.warn("predict bundle not cached:", e);
+                    }
+                    return data;
+                });
+            })
+            .catch(err => {
+                bundlePromise = null;
+                throw err;
+            });
+
+        return bundlePromise;
+    }
+
+    function toInt(v) {
+        return (v === null || v === undefined) ? null : Math.trunc(v);
+    }
+
+    function bundleValue(bundle, key, di, yi) {
+        if (di < 0 || yi < 0) return null;
+        const v = bundle.values[key][di][yi];
+        return (v === undefined) ? null : v;
+    }
+
+    // /data/predict-data 와 같은 모양의 결과를 번들에서 계산
+    function buildPredictData(bundle, year, district) {
+        const yi = bundle.years.indexOf(year);
+        const prevYi = bundle.years.indexOf(year - 1);
+        const isTotal = !district || district === '전체';
+        const di = isTotal ? -1 : bundle.districts.indexOf(district);
+
+        let childUser = 0;
+        let childFacility = 0;
+        let features = null;
+        let prevChildUser = null;
+
+        if (!isTotal) {
+            childUser = toInt(bundleValue(bundle, 'child_user', di, yi)) || 0;
+            if (year <= 2022) {
+                childFacility = toInt(bundleValue(bundle, 'child_facility', di, yi)) || 0;
+            }
+            if (di >= 0 && yi >= 0) {
+                features = {};
+                ['single_parent', 'basic_beneficiaries', 'multicultural_hh',
+                    'academy_cnt', 'grdp', 'population'].forEach(k => {
+                    features[k] = bundleValue(bundle, k, di, yi);
+                });
+            }
+            if (year - 1 >= 2015) {
+                prevChildUser = toInt(bundleValue(bundle, 'child_user', di, prevYi));
+            }
+        } else {
+            if (yi >= 0) {
+                childUser = toInt(bundle.totals.child_user[yi]) || 0;
+                if (year <= 2022) {
+                    childFacility = toInt(bundle.totals.child_facility[yi]) || 0;
+                }
+            }
+            if (year - 1 >= 2015 && prevYi >= 0) {
+                prevChildUser = toInt(bundle.totals.child_user[prevYi]);
+            }
+        }
+
+        let seoulAvg = null;
+        let seoulCnt = 0;
+        if (yi >= 0) {
+            seoulCnt = bundle.totals.district_count[yi] || 0;
+            if (seoulCnt > 0) {
+                seoulAvg = (bundle.totals.child_user[yi] || 0) / seoulCnt;
+            }
+        }
+
+        return {
+            success: true,
+            district: district,
+            year: year,
+            child_user: childUser,
+            child_facility: childFacility,
+            prev_child_user: prevChildUser,
+            seoul_avg_child_user: seoulAvg,
+            seoul_district_count: seoulCnt,
+            features: features
+        };
+    }
+
+    // /data/predict-series 를 행 배열로 바꾼 것과 같은 결과를 번들에서 계산
+    function buildPredictSeries(bundle, district) {
+        const isTotal = !district || district === '전체';
+        const di = isTotal ? -1 : bundle.districts.indexOf(district);
+        const items = [];
+
+        bundle.years.forEach((y, yi) => {
+            const v = isTotal
+                ? bundle.totals.child_user[yi]
+                : bundleValue(bundle, 'child_user', di, yi);
+            if (v === null || v === undefined) return;
+            items.push({ year: y, child_user: Math.trunc(v), is_pred: bundle.is_pred[yi] });
+        });
+        return items;
+    }
+
     function loadPredictData() {
         const year = $('#year-select').val();
         const gu = $('#gu-select').val() || '전체';
@@ -352,6 +481,19 @@ $(function () {
             return;
         }
 
+        loadPredictBundle()
+            .then(bundle => {
+                const data = buildPredictData(bundle, Number(year), gu);
+                renderSummaryCards(data);
+                renderPredictTable(data);
+            })
+            .catch(err => {
+                console.warn("predict bundle unavailable, falling back:", err);
+                fetchPredictData(year, gu);
+            });
+    }
+
+    function fetchPredictData(year, gu) {
         const params = new URLSearchParams({
             year: year,
             district: gu
@@ -379,7 +521,19 @@ $(function () {
 
     function loadPredictSeries() {
         const gu = $('#gu-select').val() || '전체';
+        const districtLabel = (gu === '전체') ? '서울시 전체' : gu;
+
+        loadPredictBundle()
+            .then(bundle => {
+                renderPredictChart(buildPredictSeries(bundle, gu), districtLabel);
+            })
+            .catch(err => {
+                console.warn("predict bundle unavailable, falling back:", err);
+                fetchPredictSeries(gu);
+            });
+    }
 
+    function fetchPredictSeries(gu) {
         const params = new URLSearchParams({
             district: gu
         });
@@ -394,7 +548,13 @@ $(function () {
                 if (data.success) {
                     const districtLabel =
                         (data.district === '전체') ? '서울시 전체' : data.district;
-                    renderPredictChart(data.items, districtLabel);
+                    const s = data.series;
+                    const items = s.year.map((y, i) => ({
+                        year: y,
+                        child_user: s.child_user[i],
+                        is_pred: s.is_pred[i]
+                    }));
+                    renderPredictChart(items, districtLabel);
                 }
             })
             .catch(err => {
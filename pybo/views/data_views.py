@@ -50,6 +50,49 @@ def predict_data():
 # 예측 그래프 API
 @bp.route("/predict-series")
 def predict_series():
+    # districts=강남구,서초구 처럼 여러 구를 주면 구별로 묶어서 한 번에 반환
+    districts_param = request.args.get("districts", default="", type=str)
+    districts = [d.strip() for d in districts_param.split(",") if d.strip()]
+    if districts:
+        data = data_service.get_predict_series_multi(districts=districts)
+        return jsonify(data)
+
     district = request.args.get("district", default="전체", type=str)
     data = data_service.get_predict_series(district=district)
     return jsonify(data)
+
+
+# 예측 페이지 번들 API (전체 연도/자치구를 한 번에, 버전 ETag로 재검증)
+@bp.route("/predict-bundle")
+def predict_bundle():
+    data = data_service.get_predict_bundle()
+
+    response = jsonify(data)
+    response.set_etag(data["version"])
+    response.cache_control.no_cache = True  # 매번 ETag로 재검증 (변경 없으면 304)
+    return response.make_conditional(request)
+
+
+# 자치구 비교 API (여러 구 x 연도 x 지표를 한 번에, 컬럼형 행렬)
+@bp.route("/compare")
+def compare():
+    districts_param = request.args.get("districts", default="all", type=str).strip()
+    start_year = request.args.get("start_year", default=2015, type=int)
+    end_year = request.args.get("end_year", default=2022, type=int)
+    metrics_param = request.args.get("metrics", default="child_user", type=str)
+
+    districts = None
+    if districts_param and districts_param.lower() != "all" and districts_param != "전체":
+        districts = [d.strip() for d in districts_param.split(",") if d.strip()]
+    metrics = [m.strip() for m in metrics_param.split(",") if m.strip()]
+
+    try:
+        data = data_service.get_compare_data(
+            districts=districts,
+            start_year=start_year,
+            end_year=end_year,
+            metrics=metrics,
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify(data)
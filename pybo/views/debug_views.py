@@ -0,0 +1,27 @@
+from flask import Blueprint, abort, current_app, jsonify, request
+
+from pybo import db_pool, sql_stats
+
+bp = Blueprint("debug", __name__, url_prefix="/debug")
+
+
+# 요청별 SQL 통계 API (SQL_STATS_ENABLED 일 때만 노출)
+@bp.route("/sql-stats", methods=["GET", "DELETE"])
+def get_sql_stats():
+    if not current_app.config.get("SQL_STATS_ENABLED", False):
+        abort(404)
+
+    if request.method == "DELETE":
+        sql_stats.reset_stats()
+        return jsonify({"success": True})
+
+    limit = request.args.get("limit", default=50, type=int)
+    return jsonify({"success": True, **sql_stats.get_stats(limit=limit)})
+
+
+# DB 커넥션 풀 지표 API (DB_POOL_METRICS_ENABLED 일 때만 노출)
+@bp.route("/db-pool")
+def get_db_pool_stats():
+    if not current_app.config.get("DB_POOL_METRICS_ENABLED", False):
+        abort(404)
+    return jsonify({"success": True, **db_pool.get_pool_stats(current_app)})
@@ -1,8 +1,16 @@
-from flask import Blueprint, request, jsonify, current_app, g
-import requests
-import os
+from flask import Blueprint, Response, request, jsonify, current_app, g, stream_with_context
+import json
+import time
 
-from pybo.service.genai_service import get_genai_service
+from pybo.agent import qa_graph
+from pybo.agent.mcp_pool import all_pools
+from pybo.async_bridge import get_bridge
+from pybo.circuit_breaker import all_breakers
+from pybo.prompt_budget import prompt_stats
+from pybo.service import pregenerated
+from pybo.service.genai_jobs import JobQueueFull, get_job_queue
+from pybo.service.genai_service import LLMStreamError, get_genai_service
+from pybo.service.log_writer import get_log_writer
 
 bp = Blueprint("genai_api", __name__, url_prefix="/genai-api")
 genai_service = get_genai_service()
@@ -12,22 +20,147 @@ genai_service = get_genai_service()
 def switch_model():
     data = request.get_json() or {}
     try:
-        runpod_generate = os.getenv("RUNPOD_API_URL") or ""
-        if not runpod_generate:
+        if not genai_service.llm.url:
             return jsonify({"success": False, "error": "RUNPOD_API_URL이 설정되지 않았습니다."}), 500
 
-        runpod_url = runpod_generate.replace("/generate", "/switch_model")
-        res = requests.post(runpod_url, json=data, timeout=60)
+        res = genai_service.llm.switch_model(data, timeout=60)
 
         if not (200 <= res.status_code < 300):
             return jsonify({"success": False, "error": f"모델 전환 실패 (status={res.status_code})"}), 500
 
+        # 같은 이름의 model_version 이라도 가중치가 바뀌었으므로 LLM 캐시 비움
+        if genai_service.cache is not None:
+            genai_service.cache.invalidate()
+
         return jsonify({"success": True, "result": res.json()})
     except Exception as e:
         current_app.logger.exception("switch-model error")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@bp.route("/cache-stats", methods=["GET"])
+def cache_stats():
+    if genai_service.cache is None:
+        return jsonify({"success": True, "enabled": False})
+    return jsonify({"success": True, "enabled": True, **genai_service.cache.stats()})
+
+
+@bp.route("/pregen-stats", methods=["GET"])
+def pregen_stats():
+    return jsonify({"success": True, **pregenerated.get_stats()})
+
+
+@bp.route("/inflight-stats", methods=["GET"])
+def inflight_stats():
+    """동시 요청 합치기로 아낀 업스트림 호출 수"""
+    return jsonify({"success": True, **genai_service.inflight_stats(), "qa_tool_client": qa_graph.inflight_stats()})
+
+
+@bp.route("/status", methods=["GET"])
+def status():
+    """LLM / MCP 서킷 브레이커 상태 (open 이면 바로 실패하거나 캐시/사전 생성 결과로 응답)"""
+    breakers = [b.stats() for b in all_breakers()]
+    degraded = any(b["state"] != "closed" for b in breakers)
+    return jsonify({
+        "success": True,
+        "status": "degraded" if degraded else "ok",
+        "breakers": breakers,
+        "llm_backends": genai_service.llm.backends.stats(),
+        "mcp_pools": [p.stats() for p in all_pools()],
+        "async_bridge": get_bridge().stats(),
+    })
+
+
+@bp.route("/log-stats", methods=["GET"])
+def log_stats():
+    writer = get_log_writer()
+    if writer is None:
+        return jsonify({"success": True, "enabled": False})
+    return jsonify({"success": True, "enabled": True, **writer.stats()})
+
+
+@bp.route("/prompt-stats", methods=["GET"])
+def prompt_stats_view():
+    """작업별 프롬프트 토큰 수 / 잘린 횟수 / 토큰 구간별 LLM 평균 지연"""
+    return jsonify({"success": True, "tasks": prompt_stats.snapshot()})
+
+
+@bp.route("/stream-stats", methods=["GET"])
+def stream_stats():
+    return jsonify({"success": True, "endpoints": genai_service.stream_stats.snapshot()})
+
+
+def _current_user_id():
+    user = getattr(g, "user", None)
+    return getattr(user, "id", None) if user else None
+
+
+def _chat_logger(task_type: str, question: str, page=None):
+    """감사 로그 저장 함수 (answer 만 넘기면 됨). 큐에 넣기만 하고 DB 저장은 백그라운드"""
+    writer = get_log_writer()
+    user_id = _current_user_id()
+
+    def log(answer: str) -> None:
+        if writer is not None:
+            writer.log_chat(task_type, question, answer, user_id=user_id, page=page)
+
+    return log
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _sse_response(name: str, events, on_complete=None):
+    """(event, data) 제너레이터 → text/event-stream 응답.
+    token 이벤트는 {"text": ...}, 끝나면 done(ttft/elapsed), 실패하면 error 이벤트 하나.
+    on_complete 가 있으면 끝까지 보낸 전체 텍스트로 호출 (감사 로그)"""
+    logger = current_app.logger
+
+    def generate():
+        start = time.perf_counter()
+        ttft = None
+        outcome = "cancelled"
+        chunks = []
+        try:
+            for event, data in events:
+                if event == "token":
+                    if not data:
+                        continue
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    chunks.append(data)
+                    yield _sse("token", {"text": data})
+                else:
+                    yield _sse(event, data)
+            outcome = "completed"
+            if on_complete is not None:
+                on_complete("".join(chunks))
+            yield _sse("done", {
+                "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            })
+        except LLMStreamError as e:
+            outcome = "errors"
+            yield _sse("error", {"error": str(e)})
+        except GeneratorExit:
+            # 클라이언트가 연결을 끊음 → 아래 finally 에서 업스트림 LLM 요청도 닫힘
+            raise
+        except Exception:
+            outcome = "errors"
+            logger.exception(f"{name} stream error")
+            yield _sse("error", {"error": "답변 생성 중 오류가 발생했습니다."})
+        finally:
+            events.close()
+            genai_service.stream_stats.record(name, outcome, ttft, time.perf_counter() - start)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @bp.route("/report", methods=["POST"])
 def generate_report():
     data = request.get_json() or {}
@@ -47,12 +180,77 @@ def generate_report():
             end_year=int(end_year),
             model_version=model_ver,
         )
+        _chat_logger("report", f"{district} {start_year}-{end_year}", data.get("page"))(result_text)
         return jsonify({"success": True, "result": result_text})
     except Exception as e:
         current_app.logger.exception("report error")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+MAX_MULTI_REPORT_DISTRICTS = 26  # 25개 자치구 + 전체
+
+
+def _multi_report_document(reports: list[dict]) -> str:
+    """자치구별 보고서를 요청 순서대로 이어 붙인 문서 하나"""
+    return "\n\n".join(f"## {r['title']}\n\n{r['content']}" for r in reports)
+
+
+@bp.route("/report/multi", methods=["POST"])
+def generate_report_multi():
+    """여러 자치구 보고서 한 번에 생성.
+    stream=true 면 끝나는 순서대로 report 이벤트, 아니면 요청 순서대로 모은 reports + 합친 document"""
+    data = request.get_json() or {}
+    districts = data.get("districts") or []
+    if isinstance(districts, str):
+        districts = districts.split(",")
+    districts = list(dict.fromkeys(d.strip() for d in districts if isinstance(d, str) and d.strip()))
+    model_ver = data.get("model_version", "final")
+
+    if not districts or data.get("end_year") is None:
+        return jsonify({"success": False, "error": "자치구와 연도를 모두 선택해주세요."}), 400
+    if len(districts) > MAX_MULTI_REPORT_DISTRICTS:
+        return jsonify({
+            "success": False, "error": f"자치구는 최대 {MAX_MULTI_REPORT_DISTRICTS}개까지 선택할 수 있습니다.",
+        }), 400
+    try:
+        start_year, end_year = int(data.get("start_year", 2023)), int(data["end_year"])
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "연도 값이 올바르지 않습니다."}), 400
+
+    log = _chat_logger("report", f"{','.join(districts)} {start_year}-{end_year}", data.get("page"))
+    reports = genai_service.generate_reports_multi(districts, start_year, end_year, model_version=model_ver)
+
+    if data.get("stream"):
+        def events():
+            done = {}
+            yield "meta", {"districts": districts, "start_year": start_year, "end_year": end_year}
+            try:
+                for report in reports:
+                    done[report["district"]] = report
+                    yield "report", report
+            finally:
+                reports.close()
+            log(_multi_report_document([done[d] for d in districts if d in done]))
+
+        return _sse_response("report_multi", events())
+
+    try:
+        start = time.perf_counter()
+        by_district = {r["district"]: r for r in reports}
+        ordered = [by_district[d] for d in districts]
+        document = _multi_report_document(ordered)
+        log(document)
+        return jsonify({
+            "success": True,
+            "reports": ordered,
+            "document": document,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        })
+    except Exception as e:
+        current_app.logger.exception("report multi error")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @bp.route("/policy", methods=["POST"])
 def generate_policy():
     data = request.get_json() or {}
@@ -69,6 +267,7 @@ def generate_policy():
             district=district,
             model_version=model_ver,
         )
+        _chat_logger("policy", f"[{district}] {prompt}", data.get("page"))(text)
         return jsonify({"success": True, "result": text})
     except Exception as e:
         current_app.logger.exception("policy error")
@@ -84,12 +283,11 @@ def qa():
     if not question:
         return jsonify({"success": False, "error": "질문을 입력해 주세요."}), 400
 
-    user_id = None
-    if hasattr(g, "user") and getattr(g, "user", None):
-        user_id = getattr(g.user, "id", None)
+    log = _chat_logger("qa", question, data.get("page"))
 
     try:
         answer = genai_service.answer_qa_with_log(question, model_version=model_ver)
+        log(answer)
         return jsonify({"success": True, "result": answer})
     except Exception:
         current_app.logger.exception("qa error")
@@ -107,12 +305,161 @@ def summarize():
 
     try:
         summary = genai_service.summarize_text(text, model_version=model_ver)
+        _chat_logger("summarize", text, data.get("page"))(summary)
         return jsonify({"success": True, "result": summary})
     except Exception:
         current_app.logger.exception("summarize error")
         return jsonify({"success": False, "error": "요약 생성 중 오류가 발생했습니다."}), 500
 
 
+@bp.route("/report/stream", methods=["POST"])
+def generate_report_stream():
+    data = request.get_json() or {}
+    district = (data.get("district") or "").strip()
+    start_year = data.get("start_year", 2023)
+    end_year = data.get("end_year")
+    model_ver = data.get("model_version", "final")
+
+    if not district or end_year is None:
+        return jsonify({"success": False, "error": "자치구와 연도를 모두 선택해주세요."}), 400
+    try:
+        start_year, end_year = int(start_year), int(end_year)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "연도 값이 올바르지 않습니다."}), 400
+
+    return _sse_response("report", genai_service.stream_report(
+        district, start_year, end_year, model_version=model_ver,
+    ), on_complete=_chat_logger("report", f"{district} {start_year}-{end_year}", data.get("page")))
+
+
+@bp.route("/policy/stream", methods=["POST"])
+def generate_policy_stream():
+    data = request.get_json() or {}
+    prompt = (data.get("prompt") or "").strip()
+    district = (data.get("district") or "전체").strip()
+    model_ver = data.get("model_version", "final")
+
+    if not prompt:
+        return jsonify({"success": False, "error": "정책 생성 프롬프트를 입력해주세요."}), 400
+
+    return _sse_response(
+        "policy", genai_service.stream_policy(district, model_version=model_ver),
+        on_complete=_chat_logger("policy", f"[{district}] {prompt}", data.get("page")),
+    )
+
+
+@bp.route("/qa/stream", methods=["POST"])
+def qa_stream():
+    data = request.get_json() or {}
+    question = (data.get("question") or "").strip()
+    model_ver = data.get("model_version", "final")
+
+    if not question:
+        return jsonify({"success": False, "error": "질문을 입력해 주세요."}), 400
+
+    return _sse_response(
+        "qa", genai_service.stream_qa(question, model_version=model_ver),
+        on_complete=_chat_logger("qa", question, data.get("page")),
+    )
+
+
+@bp.route("/summarize/stream", methods=["POST"])
+def summarize_stream():
+    data = request.get_json() or {}
+    text = (data.get("text") or "").strip()
+    model_ver = data.get("model_version", "final")
+
+    if not text:
+        return jsonify({"success": False, "error": "요약할 본문을 입력해 주세요."}), 400
+
+    return _sse_response(
+        "summarize", genai_service.stream_summary(text, model_version=model_ver),
+        on_complete=_chat_logger("summarize", text, data.get("page")),
+    )
+
+
+def _job_params(task_type: str, data: dict):
+    """작업 종류별 필수값 확인 → (params, 오류 메시지)"""
+    model_ver = data.get("model_version", "final")
+
+    if task_type == "report":
+        district = (data.get("district") or "").strip()
+        end_year = data.get("end_year")
+        if not district or end_year is None:
+            return None, "자치구와 연도를 모두 선택해주세요."
+        return {
+            "district": district,
+            "start_year": int(data.get("start_year", 2023)),
+            "end_year": int(end_year),
+            "model_version": model_ver,
+        }, None
+
+    if task_type == "policy":
+        prompt = (data.get("prompt") or "").strip()
+        if not prompt:
+            return None, "정책 생성 프롬프트를 입력해주세요."
+        return {
+            "prompt": prompt,
+            "district": (data.get("district") or "전체").strip(),
+            "model_version": model_ver,
+        }, None
+
+    if task_type == "qa":
+        question = (data.get("question") or "").strip()
+        if not question:
+            return None, "질문을 입력해 주세요."
+        return {"question": question, "model_version": model_ver}, None
+
+    if task_type == "summarize":
+        text = (data.get("text") or "").strip()
+        if not text:
+            return None, "요약할 본문을 입력해 주세요."
+        return {"text": text, "model_version": model_ver}, None
+
+    return None, "task_type 은 report, policy, qa, summarize 중 하나여야 합니다."
+
+
+@bp.route("/jobs", methods=["POST"])
+def submit_job():
+    data = request.get_json() or {}
+    task_type = (data.get("task_type") or "").strip()
+
+    try:
+        params, error = _job_params(task_type, data)
+    except (TypeError, ValueError):
+        params, error = None, "연도 값이 올바르지 않습니다."
+    if error:
+        return jsonify({"success": False, "error": error}), 400
+
+    try:
+        job_id = get_job_queue().submit(task_type, params, user_id=_current_user_id())
+    except JobQueueFull as e:
+        return jsonify({"success": False, "error": str(e)}), 503
+
+    return jsonify({"success": True, "job_id": job_id, "status": "queued"}), 202
+
+
+@bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "작업을 찾을 수 없습니다."}), 404
+    return jsonify({"success": True, **job})
+
+
+@bp.route("/jobs/<job_id>", methods=["DELETE"])
+def cancel_job(job_id):
+    job = get_job_queue().cancel(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "작업을 찾을 수 없습니다."}), 404
+    return jsonify({"success": True, **job})
+
+
+@bp.route("/jobs-stats", methods=["GET"])
+def job_stats():
+    return jsonify({"success": True, **get_job_queue().stats()})
+
+
 @bp.route("/qa_v2", methods=["POST"])
 def qa_v2():
     data = request.get_json() or {}
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from pybo.ml.predictor import predict_child_user
+from pybo.service.log_writer import get_log_writer
 
 # API 전용 prefix
 bp = Blueprint("predict_api", __name__, url_prefix="/api")
@@ -25,6 +26,12 @@ def predict_api():
 
     try:
         pred_value = predict_child_user(data)
+
+        # 예측 로그 (큐에 넣기만 하고 DB 저장은 백그라운드)
+        writer = get_log_writer()
+        if writer is not None:
+            writer.log_prediction(str(data["district"]), int(float(data["year"])), pred_value)
+
         return jsonify({
             "success": True,
             "prediction": pred_value
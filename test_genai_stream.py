@@ -0,0 +1,76 @@
+# GenAIService._stream_llama3 스트리밍 테스트 (fake_llm_server 사용, conftest.py 참고)
+#   python -m pytest -q test_genai_stream.py
+import pytest
+
+from fake_llm_server import _fake_answer, _tokens
+from pybo.circuit_breaker import CircuitBreaker
+from pybo.llm_client import LLMClient
+from pybo.service.genai_service import GenAIService, LLMStreamError
+from pybo.service.llm_cache import LLMResponseCache
+
+INSTRUCTION = "너는 보고서 작성기다."
+INPUT_TEXT = "대상 지역: 강남구"
+
+
+@pytest.fixture
+def service(fake_llm, fake_llm_base_url):
+    svc = GenAIService()
+    # 테스트마다 새 클라이언트 / 브레이커 / 캐시 (재시도 없이 바로 실패)
+    svc.llm = LLMClient(url=f"{fake_llm_base_url}/generate", retries=0, breaker=CircuitBreaker("llm-test"))
+    svc.api_url = svc.stream_url = svc.llm.url
+    svc.cache = LLMResponseCache(max_entries=16, ttl=60)
+    return svc
+
+
+def _stream(svc: GenAIService) -> list[str]:
+    return list(svc._stream_llama3(INSTRUCTION, INPUT_TEXT, cache=True, task_type="report"))
+
+
+def _cached(svc: GenAIService):
+    key = LLMResponseCache.make_key(INSTRUCTION, INPUT_TEXT, "final", 0.3, 256)
+    return svc.cache.get(key)
+
+
+def test_tokens_in_order_and_cached(service):
+    expected = _fake_answer({"input": INPUT_TEXT, "model_version": "final"})
+
+    tokens = _stream(service)
+
+    assert tokens == list(_tokens(expected))
+    assert _cached(service) == expected.strip()
+
+
+def test_cache_hit_skips_upstream(service):
+    first = "".join(_stream(service))
+    assert _stream(service) == [first.strip()]
+
+
+def test_upstream_error_raises(service, fake_llm):
+    fake_llm.config.update(ERROR_RATE=1.0, ERROR_STATUS=500)
+
+    with pytest.raises(LLMStreamError, match="status=500"):
+        _stream(service)
+    assert _cached(service) is None
+
+
+def test_truncated_stream_not_cached(service, fake_llm):
+    fake_llm.config.update(STREAM_TRUNCATE_AFTER=3)
+
+    tokens = _stream(service)
+
+    assert len(tokens) == 3
+    assert _cached(service) is None
+
+
+@pytest.mark.parametrize("line, expected", [
+    ('data: {"token": "안녕"}', "안녕"),
+    ("data: [DONE]", StopIteration),
+    ('{"done": true}', StopIteration),
+    ("data: 123", "123"),
+    ('data: ["a", "b"]', '["a", "b"]'),
+    ("data: plain text", "plain text"),
+    (": keep-alive", None),
+    ("", None),
+])
+def test_parse_stream_line(line, expected):
+    assert GenAIService._parse_stream_line(line) == expected
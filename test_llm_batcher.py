@@ -0,0 +1,86 @@
+# MicroBatcher 마이크로 배칭 테스트 (fake_llm_server 의 /generate_batch 사용, conftest.py 참고)
+#   python -m pytest -q test_llm_batcher.py
+import pytest
+
+import fake_llm_server
+from pybo.circuit_breaker import CircuitBreaker
+from pybo.llm_client import LLMClient
+
+
+@pytest.fixture
+def client(fake_llm, fake_llm_base_url):
+    # 창을 넉넉히 잡아 한 번에 submit 한 요청이 같은 수집 구간에 들어가게 함
+    c = LLMClient(
+        url=f"{fake_llm_base_url}/generate",
+        batch_url=f"{fake_llm_base_url}/generate_batch",
+        batch_window_ms=200,
+        batch_max_size=8,
+        retries=0,
+        breaker=CircuitBreaker("llm-batch-test"),
+    )
+    yield c
+    c.batcher._executor.shutdown(wait=False)
+
+
+def _payloads(*model_versions: str) -> list[dict]:
+    return [
+        LLMClient.build_payload("지시문", f"입력 {i}", model_version=mv)
+        for i, mv in enumerate(model_versions)
+    ]
+
+
+def _run(client: LLMClient, payloads: list[dict]) -> list[tuple]:
+    futures = [client.batcher.submit(p, (5.0, 30.0)) for p in payloads]
+    return [f.result(timeout=10) for f in futures]
+
+
+def _server_stats() -> dict:
+    with fake_llm_server._stats_lock:
+        return dict(fake_llm_server._stats)
+
+
+def test_groups_by_model_version(client):
+    payloads = _payloads("final", "base", "final", "base")
+
+    results = _run(client, payloads)
+
+    # 모델 버전별로 한 배치씩, 결과는 요청 순서대로 각자에게
+    assert [text for text, _ in results] == [fake_llm_server._fake_answer(p) for p in payloads]
+    assert all(ok for _, ok in results)
+    assert _server_stats()["batches"] == 2
+    assert _server_stats()["batched_items"] == 4
+    assert client.batcher.stats()["single_calls"] == 0
+
+
+@pytest.mark.parametrize("status", [404, 405, 501])
+def test_unsupported_endpoint_falls_back_to_single_calls(client, fake_llm, status):
+    fake_llm.config.update(NO_BATCH=True, NO_BATCH_STATUS=status)
+    payloads = _payloads("final", "final", "final")
+
+    results = _run(client, payloads)
+
+    assert [text for text, _ in results] == [fake_llm_server._fake_answer(p) for p in payloads]
+    assert client.batcher.supported is False
+    assert client.batcher.stats()["single_calls"] == 3
+
+    # 이후 호출은 배처를 거치지 않음
+    text, ok = client.generate(payloads[0])
+    assert ok and text == fake_llm_server._fake_answer(payloads[0])
+    assert client.batcher.stats()["submitted"] == 3
+
+
+@pytest.mark.parametrize("fault", ["error", "short"])
+def test_failed_batch_falls_back_to_single_calls(client, fake_llm, fault):
+    fake_llm.config.update(BATCH_FAULT=fault)
+    payloads = _payloads("final", "final", "final")
+
+    results = _run(client, payloads)
+
+    # 배치 실패 / 개수 불일치 → 같은 요청을 하나씩 다시 보냄 (배치 지원은 유지)
+    assert [text for text, _ in results] == [fake_llm_server._fake_answer(p) for p in payloads]
+    assert all(ok for _, ok in results)
+    stats = client.batcher.stats()
+    assert stats["batch_errors"] == 1
+    assert stats["single_calls"] == 3
+    assert stats["batches"] == 0
+    assert client.batcher.supported is True
@@ -0,0 +1,33 @@
+# fit_pieces 토큰 예산 테스트
+#   python -m pytest -q test_prompt_budget.py
+from pybo.prompt_budget import PromptPiece, count_tokens, fit_pieces, prompt_stats
+
+
+def test_optional_pieces_trimmed_before_required(monkeypatch):
+    monkeypatch.setenv("PROMPT_BUDGET_QA", "120")
+    question = "질문: 강남구 지역아동센터 인건비 기준은?"
+
+    fitted = fit_pieces("qa", "지시문", [
+        PromptPiece("question", question, required=True),
+        PromptPiece("rag1", "가" * 60, priority=1),
+        PromptPiece("rag2", "나" * 200, priority=2),
+    ])
+
+    assert fitted[0] == question
+    assert fitted[1] == "가" * 60
+    assert fitted[2].startswith("나") and len(fitted[2]) < 200
+    assert count_tokens("지시문") + sum(count_tokens(t) for t in fitted) <= 120
+
+
+def test_required_pieces_kept_when_over_budget(monkeypatch):
+    monkeypatch.setenv("PROMPT_BUDGET_QA", "10")
+    question = "질문: 강남구 지역아동센터 인건비 기준은?"
+    before = prompt_stats.snapshot().get("qa", {}).get("over_budget", 0)
+
+    fitted = fit_pieces("qa", "아주 긴 지시문입니다 " * 5, [
+        PromptPiece("question", question, required=True),
+        PromptPiece("rag1", "참조 자료", priority=1),
+    ])
+
+    assert fitted == [question, ""]
+    assert prompt_stats.snapshot()["qa"]["over_budget"] == before + 1
@@ -0,0 +1,123 @@
+# SingleFlight 동시 호출 합치기 테스트
+#   python -m pytest -q test_single_flight.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pybo.single_flight import SingleFlight, SingleFlightTimeout
+
+
+def test_do_shares_result():
+    sf = SingleFlight("test")
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.2)
+        return "ok"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: sf.do("k", fn, timeout=5), range(5)))
+
+    assert results == ["ok"] * 5
+    assert len(calls) == 1
+    assert sf.stats()["saved"] == 4
+
+
+def test_do_waiters_get_fresh_chained_error():
+    sf = SingleFlight("test")
+    errors = []
+
+    def fn():
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    def run():
+        try:
+            sf.do("k", fn, timeout=5)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 4
+    leader = [e for e in errors if e.__cause__ is None]
+    waiters = [e for e in errors if e.__cause__ is not None]
+    assert len(leader) == 1 and len(waiters) == 3
+    assert all(e.__cause__ is leader[0] and e is not leader[0] for e in waiters)
+    assert len({id(e) for e in errors}) == 4
+
+
+def test_ado_waiters_do_not_use_executor_threads():
+    """기다리는 호출이 기본 executor 를 차지하면 leader 의 to_thread 가 시작하지 못함"""
+    sf = SingleFlight("test")
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=1))
+
+        async def fetch():
+            return await asyncio.to_thread(lambda: "ok")
+
+        async def call():
+            return await sf.ado("k", fetch, timeout=2)
+
+        # leader 가 executor 를 쓰기 전에 기다리는 호출들이 먼저 줄을 섬
+        async def slow_fetch():
+            await asyncio.sleep(0.1)
+            return await fetch()
+
+        leader = asyncio.create_task(sf.ado("k", slow_fetch, timeout=2))
+        await asyncio.sleep(0)
+        return await asyncio.gather(leader, *[call() for _ in range(10)])
+
+    assert asyncio.run(main()) == ["ok"] * 11
+    assert sf.stats()["executed"] == 1
+
+
+def test_ado_cancelled_leader_promotes_waiter():
+    sf = SingleFlight("test")
+    runs = []
+
+    async def main():
+        async def fetch():
+            runs.append(1)
+            await asyncio.sleep(0.2)
+            return "ok"
+
+        leader = asyncio.create_task(sf.ado("k", fetch, timeout=2))
+        await asyncio.sleep(0.05)
+        waiters = [asyncio.create_task(sf.ado("k", fetch, timeout=2)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(main()) == ["ok"] * 3
+    assert len(runs) == 2
+    assert sf.stats()["promoted"] == 1
+
+
+def test_do_waiter_timeout():
+    sf = SingleFlight("test")
+    started = threading.Event()
+
+    def fn():
+        started.set()
+        time.sleep(0.5)
+        return "ok"
+
+    leader = threading.Thread(target=lambda: sf.do("k", fn))
+    leader.start()
+    started.wait()
+    with pytest.raises(SingleFlightTimeout):
+        sf.do("k", fn, timeout=0.1)
+    leader.join()